@@ -1,15 +1,17 @@
 # adapters/api_adapter.py
 import logging
 from datetime import date
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
+from pydantic import BaseModel, TypeAdapter
 
-from app.models.requests import PerformanceRequest
+from app.models.requests import PerformanceRequest, ValuationPointColumns
 from app.models.responses import (
     PerformanceBreakdown,
+    PerformanceBreakdownColumns,
     PerformanceResultItem,
-    PerformanceSummary,
 )
 from common.enums import Frequency, PeriodType
 from engine.config import EngineConfig, PrecisionMode
@@ -17,6 +19,13 @@ from engine.schema import PortfolioColumns
 
 logger = logging.getLogger(__name__)
 
+# Breakdown items validated, and daily timeseries rows boxed into records, at a time.
+_TIMESERIES_CHUNK_ROWS = 1024
+
+# One validator call per chunk of items costs about half as much as a model_validate call per item
+# (model_construct, being pure Python, costs more than either).
+_RESULT_ITEMS = TypeAdapter(List[PerformanceResultItem])
+
 
 def create_engine_config(
     request: PerformanceRequest, effective_start_date: date, effective_end_date: date
@@ -35,6 +44,7 @@ def create_engine_config(
         rounding_precision=request.rounding_precision,
         precision_mode=PrecisionMode(request.precision_mode),
         data_policy=request.data_policy,
+        emit_reset_events=request.reset_policy.emit,
         currency_mode=request.currency_mode,
         report_ccy=request.report_ccy,
         fx=request.fx,
@@ -42,9 +52,10 @@ def create_engine_config(
     )
 
 
-def create_engine_dataframe(valuation_points: List[Dict[str, Any]]) -> pd.DataFrame:
+def create_engine_dataframe(valuation_points: Union[List[Dict[str, Any]], Dict[str, Any]]) -> pd.DataFrame:
     """
-    Creates a Pandas DataFrame for the engine from the raw valuation points list.
+    Creates a Pandas DataFrame for the engine from the raw valuation points list, or from a
+    mapping of column names to arrays.
     No renaming is needed as the API contract now matches the engine's snake_case schema.
     """
     if not valuation_points:
@@ -59,6 +70,62 @@ def create_engine_dataframe(valuation_points: List[Dict[str, Any]]) -> pd.DataFr
         raise ValueError(f"Failed to process daily data: {e}")
 
 
+def create_valuation_dataframe(valuation_points: Union[Sequence[BaseModel], ValuationPointColumns]) -> pd.DataFrame:
+    """
+    Creates the engine DataFrame from a request's valuation points, sent either as one object per
+    day or as columns. Columns go to the engine as they are, without a dict per day.
+    """
+    if isinstance(valuation_points, ValuationPointColumns):
+        if not len(valuation_points):
+            return pd.DataFrame()
+        return create_engine_dataframe(valuation_points.to_engine_columns())
+    return create_engine_dataframe([item.model_dump() for item in valuation_points])
+
+
+def first_valuation_date(valuation_points: Union[Sequence[Any], ValuationPointColumns]) -> date:
+    """The date of the first valuation point, in either request shape."""
+    if isinstance(valuation_points, ValuationPointColumns):
+        return valuation_points.perf_date[0]
+    return valuation_points[0].perf_date
+
+
+def iter_breakdown_items(
+    breakdowns_data: Dict[Frequency, List[Dict]], daily_results_df: pd.DataFrame, include_timeseries: bool
+) -> Iterator[Tuple[Frequency, PerformanceResultItem]]:
+    """
+    Yields each breakdown item of the engine's breakdown dict as a response model, in order.
+    Items are validated, and daily timeseries rows boxed from the results frame, a chunk at a time.
+    """
+    for freq, results in breakdowns_data.items():
+        with_timeseries = include_timeseries and freq == Frequency.DAILY
+        for start in range(0, len(results), _TIMESERIES_CHUNK_ROWS):
+            chunk = results[start : start + _TIMESERIES_CHUNK_ROWS]
+            daily_records: List[Dict] = []
+            if with_timeseries:
+                daily_records = daily_results_df.iloc[start : start + len(chunk)].to_dict(orient="records")
+
+            items = []
+            for offset, result_item in enumerate(chunk):
+                summary_data = result_item["summary"]
+                items.append(
+                    {
+                        "period": result_item["period"],
+                        "summary": {
+                            "begin_mv": summary_data.get(PortfolioColumns.BEGIN_MV),
+                            "end_mv": summary_data.get(PortfolioColumns.END_MV),
+                            "net_cash_flow": summary_data.get("net_cash_flow"),
+                            "period_return_pct": summary_data.get("period_return_pct"),
+                            "cumulative_return_pct_to_date": summary_data.get("cumulative_return_pct_to_date"),
+                            "annualized_return_pct": summary_data.get("annualized_return_pct"),
+                        },
+                        "daily_data": [daily_records[offset]] if offset < len(daily_records) else None,
+                    }
+                )
+
+            for item in _RESULT_ITEMS.validate_python(items):
+                yield freq, item
+
+
 def format_breakdowns_for_response(
     breakdowns_data: Dict[Frequency, List[Dict]], daily_results_df: pd.DataFrame, include_timeseries: bool
 ) -> PerformanceBreakdown:
@@ -66,35 +133,42 @@ def format_breakdowns_for_response(
     Takes the pure breakdown dict from the engine and formats it into
     the Pydantic response models.
     """
-    response_breakdowns = {}
-    daily_records = daily_results_df.to_dict(orient="records")
-
-    for freq, results in breakdowns_data.items():
-        formatted_results = []
-        for i, result_item in enumerate(results):
-            summary_data = result_item["summary"]
-
-            pydantic_summary_data = {
-                "begin_mv": summary_data.get(PortfolioColumns.BEGIN_MV),
-                "end_mv": summary_data.get(PortfolioColumns.END_MV),
-                "net_cash_flow": summary_data.get("net_cash_flow"),
-                "period_return_pct": summary_data.get("period_return_pct"),
-                "cumulative_return_pct_to_date": summary_data.get("cumulative_return_pct_to_date"),
-                "annualized_return_pct": summary_data.get("annualized_return_pct"),
-            }
+    response_breakdowns: Dict[Frequency, List[PerformanceResultItem]] = {freq: [] for freq in breakdowns_data}
+    for freq, item in iter_breakdown_items(breakdowns_data, daily_results_df, include_timeseries):
+        response_breakdowns[freq].append(item)
+    return response_breakdowns
 
-            summary_model = PerformanceSummary.model_validate(pydantic_summary_data)
 
-            daily_data_for_period = None
-            if freq == Frequency.DAILY and i < len(daily_records) and include_timeseries:
-                daily_data_for_period = [daily_records[i]]
+def format_breakdown_columns(
+    breakdowns_data: Dict[Frequency, List[Dict]], daily_results_df: pd.DataFrame, include_timeseries: bool
+) -> PerformanceBreakdown:
+    """
+    Formats the engine's breakdown dict as one set of parallel arrays per frequency, for
+    `output.timeseries_format = "columnar"`. No per-item models are built, and the daily
+    timeseries is taken column by column from the results frame.
+    """
+    response_breakdowns: PerformanceBreakdown = {}
+    for freq, results in breakdowns_data.items():
+        summaries = [result_item["summary"] for result_item in results]
+        columns: Dict[str, Any] = {
+            "period": [result_item["period"] for result_item in results],
+            "begin_mv": [summary[PortfolioColumns.BEGIN_MV] for summary in summaries],
+            "end_mv": [summary[PortfolioColumns.END_MV] for summary in summaries],
+            "net_cash_flow": [summary["net_cash_flow"] for summary in summaries],
+            "period_return_pct": [summary["period_return_pct"] for summary in summaries],
+        }
+        for optional_field in ("cumulative_return_pct_to_date", "annualized_return_pct"):
+            if any(optional_field in summary for summary in summaries):
+                # NaN keeps a missing entry in place: it renders as null, where None would be dropped.
+                columns[optional_field] = [summary.get(optional_field, np.nan) for summary in summaries]
 
-            formatted_results.append(
-                PerformanceResultItem(
-                    period=result_item["period"],
-                    summary=summary_model,
-                    daily_data=daily_data_for_period,
-                )
-            )
-        response_breakdowns[freq] = formatted_results
+        if include_timeseries and freq == Frequency.DAILY:
+            daily_rows = daily_results_df.iloc[: len(results)]
+            columns["daily_data"] = {
+                name: [np.nan if value is None else value for value in values.tolist()]
+                if values.dtype == object
+                else values.tolist()
+                for name, values in daily_rows.items()
+            }
+        response_breakdowns[freq] = PerformanceBreakdownColumns(**columns)
     return response_breakdowns
@@ -1,7 +1,12 @@
 # app/api/endpoints/contribution.py
+from typing import List
+
 import pandas as pd
 from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from pydantic import TypeAdapter
 
+from adapters.api_adapter import first_valuation_date
+from app.api.routing import ORJSONRoute
 from app.core.config import get_settings
 from app.models.contribution_requests import ContributionRequest
 from app.models.contribution_responses import (
@@ -10,6 +15,7 @@ from app.models.contribution_responses import (
     SinglePeriodContributionResult,
 )
 from app.services.lineage_service import lineage_service
+from core.date_dimension import EpochDayIndex
 from core.envelope import Audit, Diagnostics, Meta
 from core.periods import resolve_periods
 from core.repro import generate_canonical_hash
@@ -20,8 +26,9 @@ from engine.contribution import (
 )
 from engine.schema import PortfolioColumns
 
-router = APIRouter()
+router = APIRouter(route_class=ORJSONRoute)
 settings = get_settings()
+_POSITION_CONTRIBUTIONS = TypeAdapter(List[PositionContribution])
 
 
 def _as_numeric(value: object, default=0):
@@ -41,7 +48,7 @@ async def calculate_contribution_endpoint(request: ContributionRequest, backgrou
 
     periods_to_resolve = [analysis.period for analysis in request.analyses]
     inception_date = (
-        request.portfolio_data.valuation_points[0].perf_date
+        first_valuation_date(request.portfolio_data.valuation_points)
         if request.portfolio_data.valuation_points
         else request.report_end_date
     )
@@ -65,15 +72,13 @@ async def calculate_contribution_endpoint(request: ContributionRequest, backgrou
             daily_contributions_df = _calculate_daily_instrument_contributions(
                 instruments_df, portfolio_results_df, request.weighting_scheme, request.smoothing
             )
-            daily_contributions_df[PortfolioColumns.PERF_DATE.value] = pd.to_datetime(
-                daily_contributions_df[PortfolioColumns.PERF_DATE.value]
-            ).dt.date
+            contribution_days = EpochDayIndex(daily_contributions_df[PortfolioColumns.PERF_DATE.value])
+            portfolio_days = EpochDayIndex(portfolio_results_df[PortfolioColumns.PERF_DATE.value])
 
             results_by_period = {}
             for period in resolved_periods:
-                period_slice_df = daily_contributions_df[
-                    (daily_contributions_df[PortfolioColumns.PERF_DATE.value] >= period.start_date)
-                    & (daily_contributions_df[PortfolioColumns.PERF_DATE.value] <= period.end_date)
+                period_slice_df = daily_contributions_df.iloc[
+                    contribution_days.window(period.start_date, period.end_date)
                 ].copy()
 
                 if period_slice_df.empty:
@@ -89,15 +94,8 @@ async def calculate_contribution_endpoint(request: ContributionRequest, backgrou
                     .reset_index()
                 )
 
-                portfolio_period_slice_df = portfolio_results_df[
-                    (
-                        pd.to_datetime(portfolio_results_df[PortfolioColumns.PERF_DATE.value]).dt.date
-                        >= period.start_date
-                    )
-                    & (
-                        pd.to_datetime(portfolio_results_df[PortfolioColumns.PERF_DATE.value]).dt.date
-                        <= period.end_date
-                    )
+                portfolio_period_slice_df = portfolio_results_df.iloc[
+                    portfolio_days.window(period.start_date, period.end_date)
                 ]
 
                 total_portfolio_return = (
@@ -112,17 +110,19 @@ async def calculate_contribution_endpoint(request: ContributionRequest, backgrou
 
                 totals["fx_contribution"] = totals["total_contribution"] - totals["local_contribution"]
 
-                position_contributions = [
-                    PositionContribution(
-                        position_id=row["position_id"],
-                        total_contribution=_as_numeric(row["total_contribution"]) * 100,
-                        average_weight=_as_numeric(row["average_weight"]) * 100,
-                        total_return=0,
-                        local_contribution=_as_numeric(row.get("local_contribution", 0)) * 100,
-                        fx_contribution=_as_numeric(row.get("fx_contribution", 0)) * 100,
-                    )
-                    for _, row in totals.iterrows()
-                ]
+                position_contributions = _POSITION_CONTRIBUTIONS.validate_python(
+                    [
+                        {
+                            "position_id": row["position_id"],
+                            "total_contribution": _as_numeric(row["total_contribution"]) * 100,
+                            "average_weight": _as_numeric(row["average_weight"]) * 100,
+                            "total_return": 0,
+                            "local_contribution": _as_numeric(row.get("local_contribution", 0)) * 100,
+                            "fx_contribution": _as_numeric(row.get("fx_contribution", 0)) * 100,
+                        }
+                        for row in totals.to_dict(orient="records")
+                    ]
+                )
 
                 results_by_period[period.name] = SinglePeriodContributionResult(
                     total_portfolio_return=total_portfolio_return * 100,
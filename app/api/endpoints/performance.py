@@ -1,12 +1,21 @@
 # app/api/endpoints/performance.py
+import logging
+from dataclasses import replace
+from typing import Annotated, Dict, Iterator, List, Tuple
+
 import pandas as pd
-from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from adapters.api_adapter import (
     create_engine_config,
-    create_engine_dataframe,
+    create_valuation_dataframe,
+    format_breakdown_columns,
     format_breakdowns_for_response,
+    iter_breakdown_items,
 )
+from app.api.routing import ORJSONRoute
+from app.api.serialization import NDJSON_MEDIA_TYPE, accepts_ndjson, iter_ndjson_chunks
 from app.core.config import get_settings
 from app.models.attribution_requests import AttributionRequest
 from app.models.attribution_responses import AttributionResponse
@@ -22,10 +31,13 @@ from app.models.responses import (
     PerformanceResponse,
     PortfolioReturnDecomposition,
     ResetEvent,
+    RollingReturnItem,
     SinglePeriodPerformanceResult,
 )
 from app.services.lineage_service import lineage_service
 from app.services.pas_input_service import PasInputService
+from common.enums import Frequency, PeriodType
+from core.date_dimension import EpochDayIndex
 from core.envelope import Audit, Diagnostics, Meta
 from core.periods import resolve_periods
 from core.repro import generate_canonical_hash
@@ -34,11 +46,21 @@ from engine.breakdown import generate_performance_breakdowns
 from engine.compute import run_calculations
 from engine.exceptions import EngineCalculationError, InvalidEngineInputError
 from engine.mwr import calculate_money_weighted_return
+from engine.rolling import generate_rolling_returns
 from engine.schema import PortfolioColumns
 
-router = APIRouter(tags=["Performance"])
+logger = logging.getLogger(__name__)
+router = APIRouter(tags=["Performance"], route_class=ORJSONRoute)
 settings = get_settings()
 
+# Results columns `generate_rolling_returns` reads.
+_ROLLING_COLUMNS = (
+    PortfolioColumns.PERF_DATE.value,
+    PortfolioColumns.DAILY_ROR.value,
+    PortfolioColumns.PERF_RESET.value,
+    PortfolioColumns.FINAL_CUM_ROR.value,
+)
+
 
 def _as_numeric(value: object, default=0):
     numeric = pd.to_numeric(value, errors="coerce")
@@ -56,13 +78,13 @@ def _get_total_cum_ror(row: pd.Series | None, prefix: str = "") -> float:
 
 
 def _calculate_total_return_from_reset_slice(
-    df_slice: pd.DataFrame, daily_results_df: pd.DataFrame
+    df_slice: pd.DataFrame, daily_results_df: pd.DataFrame, day_index: EpochDayIndex | None = None
 ) -> PortfolioReturnDecomposition:
     end_row = df_slice.iloc[-1]
-    full_perf_dates = pd.to_datetime(daily_results_df[PortfolioColumns.PERF_DATE.value]).dt.date
-    slice_min_date = pd.to_datetime(df_slice[PortfolioColumns.PERF_DATE.value].min()).date()
-    day_before_mask = full_perf_dates < slice_min_date
-    day_before_row = daily_results_df[day_before_mask].iloc[-1] if day_before_mask.any() else None
+    if day_index is None:
+        day_index = EpochDayIndex(daily_results_df[PortfolioColumns.PERF_DATE.value])
+    day_before = day_index.last_before(df_slice[PortfolioColumns.PERF_DATE.value].min())
+    day_before_row = daily_results_df.iloc[day_before] if day_before is not None else None
 
     start_cum_base = _as_numeric(
         day_before_row[PortfolioColumns.FINAL_CUM_ROR.value] if day_before_row is not None else 0
@@ -115,13 +137,13 @@ def _calculate_total_return_from_non_reset_slice(df_slice: pd.DataFrame) -> Port
 
 
 def _calculate_total_return_from_slice(
-    df_slice: pd.DataFrame, daily_results_df: pd.DataFrame
+    df_slice: pd.DataFrame, daily_results_df: pd.DataFrame, day_index: EpochDayIndex | None = None
 ) -> PortfolioReturnDecomposition:
     if df_slice.empty:
         return PortfolioReturnDecomposition(local=0.0, fx=0.0, base=0.0)
 
     if df_slice[PortfolioColumns.PERF_RESET.value].any():
-        return _calculate_total_return_from_reset_slice(df_slice, daily_results_df)
+        return _calculate_total_return_from_reset_slice(df_slice, daily_results_df, day_index)
 
     return _calculate_total_return_from_non_reset_slice(df_slice)
 
@@ -234,17 +256,105 @@ async def calculate_twr_from_pas_input(request: PasInputTwrRequest):
     )
 
 
-@router.post("/twr", response_model=PerformanceResponse, summary="Calculate Time-Weighted Return")
-async def calculate_twr_endpoint(request: PerformanceRequest, background_tasks: BackgroundTasks):
+def _stream_twr_response(
+    response_model: PerformanceResponse,
+    breakdowns_to_stream: List[Tuple[str, Dict[Frequency, List[Dict]], pd.DataFrame]],
+    include_timeseries: bool,
+) -> Iterator[bytes]:
+    """
+    The TWR response as NDJSON: a header record with the envelope, then for each period a period
+    record with its totals followed by one breakdown record per item, built as it is sent.
+    The status line is already sent when items are built, so a failure while streaming is logged
+    and ends the stream with an error record; a stream without one is complete.
+    """
+
+    def records() -> Iterator[Dict]:
+        yield {
+            "record": "header",
+            **response_model.model_dump(mode="json", exclude={"results_by_period"}),
+        }
+        try:
+            for period_name, breakdowns_data, period_slice_df in breakdowns_to_stream:
+                period_result = response_model.results_by_period[period_name]
+                yield {
+                    "record": "period",
+                    "period": period_name,
+                    **period_result.model_dump(mode="json", exclude={"breakdowns"}),
+                }
+                for frequency, item in iter_breakdown_items(breakdowns_data, period_slice_df, include_timeseries):
+                    yield {
+                        "record": "breakdown",
+                        "period": period_name,
+                        "frequency": frequency.value,
+                        "item": item.model_dump(mode="json"),
+                    }
+        except Exception as e:
+            logger.exception(
+                "TWR stream for calculation_id %s failed after the response started.", response_model.calculation_id
+            )
+            yield {"record": "error", "detail": f"An unexpected server error occurred: {str(e)}"}
+
+    return iter_ndjson_chunks(records())
+
+
+def _capture_streamed_twr_lineage(
+    request: PerformanceRequest,
+    response_model: PerformanceResponse,
+    breakdowns_to_stream: List[Tuple[str, Dict[Frequency, List[Dict]], pd.DataFrame]],
+    daily_results_df: pd.DataFrame,
+):
+    """
+    Captures lineage for a streamed response with the breakdowns it streamed, built again once the
+    stream has been sent, so response.json matches the non-streamed response.
+    """
+    results_by_period = dict(response_model.results_by_period)
+    try:
+        for period_name, breakdowns_data, period_slice_df in breakdowns_to_stream:
+            results_by_period[period_name] = results_by_period[period_name].model_copy(
+                update={
+                    "breakdowns": format_breakdowns_for_response(
+                        breakdowns_data, period_slice_df, request.output.include_timeseries
+                    )
+                }
+            )
+    except Exception:
+        # The stream itself ended with an error record; lineage keeps the period totals.
+        logger.exception(
+            "Could not rebuild streamed breakdowns for lineage of calculation_id %s.", request.calculation_id
+        )
+        results_by_period = response_model.results_by_period
+    lineage_service.capture(
+        calculation_id=request.calculation_id,
+        calculation_type="TWR",
+        request_model=request,
+        response_model=response_model.model_copy(update={"results_by_period": results_by_period}),
+        calculation_details={"twr_calculation_details.csv": daily_results_df},
+    )
+
+
+@router.post(
+    "/twr",
+    response_model=PerformanceResponse,
+    summary="Calculate Time-Weighted Return",
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def calculate_twr_endpoint(
+    request: PerformanceRequest,
+    background_tasks: BackgroundTasks,
+    stream_breakdowns: Annotated[bool, Depends(accepts_ndjson)] = False,
+):
     """
     Calculates time-weighted return (TWR) for one or more requested periods
     and provides performance breakdowns by requested frequencies.
+    With `Accept: application/x-ndjson`, the response is streamed as newline-delimited records.
     """
     input_fingerprint, calculation_hash = generate_canonical_hash(request, settings.APP_VERSION)
+    breakdowns_to_stream = []
 
     try:
         periods_to_resolve = [analysis.period for analysis in request.analyses]
         freqs_by_period = {analysis.period.value: analysis.frequencies for analysis in request.analyses}
+        rolling_by_period = {analysis.period.value: analysis.rolling for analysis in request.analyses}
 
         as_of_date = request.report_end_date
         resolved_periods = resolve_periods(periods_to_resolve, as_of_date, request.performance_start_date)
@@ -256,19 +366,28 @@ async def calculate_twr_endpoint(request: PerformanceRequest, background_tasks:
         master_end_date = max(p.end_date for p in resolved_periods)
 
         engine_config = create_engine_config(request, master_start_date, master_end_date)
-        engine_df = create_engine_dataframe([item.model_dump() for item in request.valuation_points])
+        engine_df = create_valuation_dataframe(request.valuation_points)
         daily_results_df, diagnostics_data = run_calculations(engine_df, engine_config)
 
+        rolling_results_df = None
+        if any(rolling_by_period.values()):
+            # Trailing windows reach back before their period and are measured on their own ITD run
+            # from inception, leaving the analyses' run, totals and diagnostics as they are.
+            rolling_config = replace(
+                create_engine_config(request, request.performance_start_date, master_end_date),
+                period_type=PeriodType.ITD,
+                emit_reset_events=False,
+                output_columns=_ROLLING_COLUMNS,
+            )
+            rolling_results_df, _ = run_calculations(
+                create_valuation_dataframe(request.valuation_points), rolling_config
+            )
+
         results_by_period = {}
-        daily_results_df[PortfolioColumns.PERF_DATE.value] = pd.to_datetime(
-            daily_results_df[PortfolioColumns.PERF_DATE.value]
-        ).dt.date
+        day_index = EpochDayIndex(daily_results_df[PortfolioColumns.PERF_DATE.value])
 
         for period in resolved_periods:
-            period_slice_df = daily_results_df[
-                (daily_results_df[PortfolioColumns.PERF_DATE.value] >= period.start_date)
-                & (daily_results_df[PortfolioColumns.PERF_DATE.value] <= period.end_date)
-            ].copy()
+            period_slice_df = daily_results_df.iloc[day_index.window(period.start_date, period.end_date)].copy()
 
             if period_slice_df.empty:
                 continue
@@ -281,15 +400,39 @@ async def calculate_twr_endpoint(request: PerformanceRequest, background_tasks:
                 request.output.include_cumulative,
                 request.rounding_precision,
             )
-            formatted_breakdowns = format_breakdowns_for_response(
-                breakdowns_data, period_slice_df, request.output.include_timeseries
-            )
-
-            period_return_summary = _calculate_total_return_from_slice(period_slice_df, daily_results_df)
+            if stream_breakdowns:
+                # Breakdown items are built while streaming, and again for lineage once it is sent.
+                formatted_breakdowns = {}
+                breakdowns_to_stream.append((period.name, breakdowns_data, period_slice_df))
+            elif request.output.timeseries_format == "columnar":
+                formatted_breakdowns = format_breakdown_columns(
+                    breakdowns_data, period_slice_df, request.output.include_timeseries
+                )
+            else:
+                formatted_breakdowns = format_breakdowns_for_response(
+                    breakdowns_data, period_slice_df, request.output.include_timeseries
+                )
+
+            period_return_summary = _calculate_total_return_from_slice(period_slice_df, daily_results_df, day_index)
             period_result = SinglePeriodPerformanceResult(
                 breakdowns=formatted_breakdowns, portfolio_return=period_return_summary
             )
 
+            rolling = rolling_by_period.get(period.name)
+            if rolling is not None:
+                rolling_returns = generate_rolling_returns(
+                    rolling_results_df,
+                    rolling.months,
+                    rolling.window_end_frequency,
+                    request.annualization,
+                    period.start_date,
+                    period.end_date,
+                    request.performance_start_date,
+                )
+                period_result.rolling_returns = {
+                    window: [RollingReturnItem(**item) for item in items] for window, items in rolling_returns.items()
+                }
+
             if request.reset_policy.emit and diagnostics_data.get("resets"):
                 period_result.reset_events = [
                     ResetEvent(**event)
@@ -345,6 +488,15 @@ async def calculate_twr_endpoint(request: PerformanceRequest, background_tasks:
         audit=audit,
     )
 
+    if stream_breakdowns:
+        background_tasks.add_task(
+            _capture_streamed_twr_lineage, request, response_model, breakdowns_to_stream, daily_results_df
+        )
+        return StreamingResponse(
+            _stream_twr_response(response_model, breakdowns_to_stream, request.output.include_timeseries),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
     background_tasks.add_task(
         lineage_service.capture,
         calculation_id=request.calculation_id,
@@ -353,7 +505,6 @@ async def calculate_twr_endpoint(request: PerformanceRequest, background_tasks:
         response_model=response_model,
         calculation_details={"twr_calculation_details.csv": daily_results_df},
     )
-
     return response_model
 
 
@@ -460,11 +611,9 @@ async def calculate_attribution_endpoint(request: AttributionRequest, background
         effects_df, lineage_data = run_attribution_calculations(master_request)
 
         results_by_period = {}
+        effect_days = EpochDayIndex(effects_df.index.get_level_values("date"))
         for period in resolved_periods:
-            period_slice_df = effects_df[
-                (effects_df.index.get_level_values("date") >= pd.to_datetime(period.start_date))
-                & (effects_df.index.get_level_values("date") <= pd.to_datetime(period.end_date))
-            ].copy()
+            period_slice_df = effects_df.iloc[effect_days.window(period.start_date, period.end_date)].copy()
 
             if period_slice_df.empty:
                 continue
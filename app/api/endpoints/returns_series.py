@@ -6,7 +6,9 @@ from typing import Iterable
 
 import pandas as pd
 from fastapi import APIRouter, HTTPException, status
+from pydantic import TypeAdapter
 
+from app.api.routing import ORJSONRoute
 from app.models.returns_series import (
     CalendarPolicy,
     FillMethod,
@@ -15,6 +17,7 @@ from app.models.returns_series import (
     ResolvedWindow,
     ReturnPoint,
     ReturnsDiagnostics,
+    ReturnSeriesColumns,
     ReturnsFrequency,
     ReturnsMetadata,
     ReturnsProvenance,
@@ -27,19 +30,25 @@ from app.models.returns_series import (
     UpstreamSourceRef,
 )
 from app.observability import correlation_id_var, request_id_var, trace_id_var
+from core.date_dimension import get_date_dimension
 from core.repro import generate_canonical_hash
 
-router = APIRouter(tags=["Integration"])
+router = APIRouter(tags=["Integration"], route_class=ORJSONRoute)
+
+_RETURN_VALUE_QUANTUM = Decimal("0.000000000001")
+_RETURN_POINTS = TypeAdapter(list[ReturnPoint])
+
+_CALENDAR_PERIOD_FREQS = {
+    ReturnsRelativePeriod.MTD: "M",
+    ReturnsRelativePeriod.QTD: "Q",
+    ReturnsRelativePeriod.YTD: "Y",
+}
 
 
 def _period_start(as_of_date: date, period: ReturnsRelativePeriod, year: int | None) -> date:
+    if period in _CALENDAR_PERIOD_FREQS:
+        return get_date_dimension().period_start(as_of_date, _CALENDAR_PERIOD_FREQS[period]).item()
     as_of = pd.Timestamp(as_of_date)
-    if period == ReturnsRelativePeriod.MTD:
-        return as_of.to_period("M").start_time.date()
-    if period == ReturnsRelativePeriod.QTD:
-        return as_of.to_period("Q").start_time.date()
-    if period == ReturnsRelativePeriod.YTD:
-        return as_of.to_period("Y").start_time.date()
     if period == ReturnsRelativePeriod.ONE_YEAR:
         return (as_of - pd.DateOffset(years=1) + pd.Timedelta(days=1)).date()
     if period == ReturnsRelativePeriod.THREE_YEAR:
@@ -119,15 +128,16 @@ def _resample_returns(df: pd.DataFrame, *, frequency: ReturnsFrequency) -> pd.Da
 def _date_range_count(
     resolved_window: ResolvedWindow, *, frequency: ReturnsFrequency, calendar_policy: CalendarPolicy
 ) -> int:
-    start = pd.Timestamp(resolved_window.start_date)
-    end = pd.Timestamp(resolved_window.end_date)
+    start = resolved_window.start_date
+    end = resolved_window.end_date
+    calendar = get_date_dimension()
     if frequency == ReturnsFrequency.DAILY:
         if calendar_policy == CalendarPolicy.CALENDAR:
-            return len(pd.date_range(start, end, freq="D"))
-        return len(pd.bdate_range(start, end))
+            return max((end - start).days + 1, 0)
+        return int(calendar.count_business_days(start, end))
     if frequency == ReturnsFrequency.WEEKLY:
-        return len(pd.date_range(start, end, freq="W-FRI"))
-    return len(pd.date_range(start, end, freq="ME"))
+        return int(calendar.count_week_endings(start, end))
+    return int(calendar.count_month_ends(start, end))
 
 
 def _detect_gaps(df: pd.DataFrame, *, frequency: ReturnsFrequency, series_type: str) -> list[SeriesGap]:
@@ -151,16 +161,25 @@ def _detect_gaps(df: pd.DataFrame, *, frequency: ReturnsFrequency, series_type:
 
 
 def _points_from_df(df: pd.DataFrame) -> list[ReturnPoint]:
-    out: list[ReturnPoint] = []
-    for _, row in df.iterrows():
-        value = Decimal(str(row["return_value"])).quantize(Decimal("0.000000000001"))
-        out.append(
-            ReturnPoint(
-                date=row["date"].date(),
-                return_value=value,
-            )
-        )
-    return out
+    return _RETURN_POINTS.validate_python(
+        [
+            {"date": point_date, "return_value": Decimal(str(value)).quantize(_RETURN_VALUE_QUANTUM)}
+            for point_date, value in zip(df["date"].dt.date.tolist(), df["return_value"].tolist())
+        ]
+    )
+
+
+def _columns_from_df(df: pd.DataFrame) -> ReturnSeriesColumns:
+    return ReturnSeriesColumns(
+        date=df["date"].dt.date.tolist(),
+        return_value=[Decimal(str(value)).quantize(_RETURN_VALUE_QUANTUM) for value in df["return_value"].tolist()],
+    )
+
+
+def _series_from_df(df: pd.DataFrame, *, timeseries_format: str) -> list[ReturnPoint] | ReturnSeriesColumns:
+    if timeseries_format == "columnar":
+        return _columns_from_df(df)
+    return _points_from_df(df)
 
 
 @router.post(
@@ -296,9 +315,17 @@ async def get_returns_series(request: ReturnsSeriesRequest) -> ReturnsSeriesResp
         metric_basis=request.metric_basis,
         resolved_window=resolved_window,
         series=ReturnsSeriesPayload(
-            portfolio_returns=_points_from_df(portfolio_df),
-            benchmark_returns=_points_from_df(benchmark_df) if benchmark_df is not None else None,
-            risk_free_returns=_points_from_df(risk_free_df) if risk_free_df is not None else None,
+            portfolio_returns=_series_from_df(portfolio_df, timeseries_format=request.timeseries_format),
+            benchmark_returns=(
+                _series_from_df(benchmark_df, timeseries_format=request.timeseries_format)
+                if benchmark_df is not None
+                else None
+            ),
+            risk_free_returns=(
+                _series_from_df(risk_free_df, timeseries_format=request.timeseries_format)
+                if risk_free_df is not None
+                else None
+            ),
         ),
         provenance=ReturnsProvenance(
             input_mode=request.source.input_mode,
@@ -0,0 +1,56 @@
+# app/api/serialization.py
+from typing import Any, Iterable, Iterator
+
+import orjson
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_JSON_SCALAR_TYPES = (str, int, float, bool)
+
+
+def encode_excluding_none(value: Any) -> Any:
+    """
+    Encodes content for orjson in one pass, dropping None values from dicts and lists at every
+    depth. Plain JSON values, which is all FastAPI hands over after serializing a response model,
+    are kept as they are; anything else goes through `jsonable_encoder` and is then cleaned the same way.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {
+            key if type(key) is str else jsonable_encoder(key): encode_excluding_none(item)
+            for key, item in value.items()
+            # jsonable_encoder drops "_sa"-prefixed keys (its SQLAlchemy-safe mode); so does this.
+            if item is not None and not (isinstance(key, str) and key.startswith("_sa"))
+        }
+    if value_type is list:
+        return [encode_excluding_none(item) for item in value if item is not None]
+    if value_type in _JSON_SCALAR_TYPES or value is None:
+        return value
+    encoded = jsonable_encoder(value)
+    return encode_excluding_none(encoded) if type(encoded) in (dict, list) else encoded
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """Whether the client asked for a newline-delimited JSON stream."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def iter_ndjson_chunks(records: Iterable[Any], chunk_bytes: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Encodes records as newline-delimited JSON without nulls, yielding them in chunks of about
+    `chunk_bytes` so a stream neither holds the whole body nor sends one message per line.
+    """
+    lines = []
+    size = 0
+    for record in records:
+        line = orjson.dumps(encode_excluding_none(record), option=orjson.OPT_APPEND_NEWLINE)
+        lines.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(lines)
+            lines = []
+            size = 0
+    if lines:
+        yield b"".join(lines)
@@ -1,11 +1,11 @@
 # app/models/attribution_requests.py
 from datetime import date
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from app.models.requests import Analysis, DailyInputData  # Import the shared Analysis model
+from app.models.requests import Analysis, DailyInputData, ValuationPointColumns  # Import the shared Analysis model
 from common.enums import (
     AttributionMode,
     AttributionModel,
@@ -26,7 +26,7 @@ class AttributionPortfolioData(BaseModel):
     """Contains the full time series and config for the total portfolio for attribution."""
 
     metric_basis: Literal["NET", "GROSS"]
-    valuation_points: List[DailyInputData]
+    valuation_points: Union[List[DailyInputData], ValuationPointColumns]
 
 
 class InstrumentData(BaseModel):
@@ -34,7 +34,7 @@ class InstrumentData(BaseModel):
 
     instrument_id: str
     meta: Dict[str, Any]
-    valuation_points: List[DailyInputData]
+    valuation_points: Union[List[DailyInputData], ValuationPointColumns]
 
 
 class BenchmarkObservation(BaseModel):
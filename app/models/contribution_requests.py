@@ -1,11 +1,11 @@
 # app/models/contribution_requests.py
 from datetime import date
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from app.models.requests import Analysis  # Import the new shared model
+from app.models.requests import Analysis, ValuationPointColumns  # Import the new shared model
 from common.enums import WeightingScheme
 from core.envelope import (
     Annualization,
@@ -35,14 +35,14 @@ class PositionData(BaseModel):
 
     position_id: str
     meta: Dict[str, Any] = Field(default_factory=dict)
-    valuation_points: List[PositionDailyData]
+    valuation_points: Union[List[PositionDailyData], ValuationPointColumns]
 
 
 class PortfolioData(BaseModel):
     """Contains the full time series and config for the total portfolio."""
 
     metric_basis: Literal["NET", "GROSS"]
-    valuation_points: List[PositionDailyData]
+    valuation_points: Union[List[PositionDailyData], ValuationPointColumns]
 
 
 class Smoothing(BaseModel):
@@ -1,9 +1,10 @@
 # app/models/requests.py
 from datetime import date
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from common.enums import Frequency, PeriodType
 from core.envelope import (
@@ -38,6 +39,55 @@ class DailyInputData(BaseModel):
     end_mv: float = Field(..., description="The market value of the portfolio at the end of the day.")
 
 
+class ValuationPointColumns(BaseModel):
+    """
+    Valuation points sent as parallel arrays, one entry per day, instead of one object per day.
+    Arrays are validated as wholes and passed to the engine as columns.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    day: Optional[List[int]] = Field(
+        None, description="Sequential day numbers for the records. Defaults to 1, 2, 3, ... when omitted."
+    )
+    perf_date: List[date] = Field(..., description="The date of each observation in YYYY-MM-DD format.")
+    begin_mv: List[float] = Field(..., description="The market value at the beginning of each day, before cash flows.")
+    bod_cf: Optional[List[float]] = Field(
+        None, description="Beginning-of-day cash flows. Defaults to zero for every day when omitted."
+    )
+    eod_cf: Optional[List[float]] = Field(
+        None, description="End-of-day cash flows. Defaults to zero for every day when omitted."
+    )
+    mgmt_fees: Optional[List[float]] = Field(
+        None, description="Management or other fees for each day. Defaults to zero for every day when omitted."
+    )
+    end_mv: List[float] = Field(..., description="The market value at the end of each day.")
+
+    @model_validator(mode="after")
+    def arrays_must_have_equal_lengths(self):
+        lengths = {name: len(values) for name in type(self).model_fields if (values := getattr(self, name)) is not None}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"valuation point arrays must all have the same length; got {lengths}")
+        return self
+
+    def __len__(self) -> int:
+        return len(self.perf_date)
+
+    def to_engine_columns(self) -> Dict[str, Any]:
+        """The arrays as engine input columns, in the order per-day valuation points produce them."""
+        count = len(self)
+        zeros = np.zeros(count)
+        return {
+            "day": np.asarray(self.day, dtype=np.int64) if self.day is not None else np.arange(1, count + 1),
+            "perf_date": self.perf_date,
+            "begin_mv": np.asarray(self.begin_mv, dtype=np.float64),
+            "bod_cf": np.asarray(self.bod_cf, dtype=np.float64) if self.bod_cf is not None else zeros,
+            "eod_cf": np.asarray(self.eod_cf, dtype=np.float64) if self.eod_cf is not None else zeros.copy(),
+            "mgmt_fees": np.asarray(self.mgmt_fees, dtype=np.float64) if self.mgmt_fees is not None else zeros.copy(),
+            "end_mv": np.asarray(self.end_mv, dtype=np.float64),
+        }
+
+
 class FeeEffect(BaseModel):
     enabled: bool = False
 
@@ -48,6 +98,27 @@ class ResetPolicy(BaseModel):
     )
 
 
+class RollingWindows(BaseModel):
+    """Trailing-window returns to report for every window end within an analysis period."""
+
+    months: List[int] = Field(
+        ..., description="Window lengths in months, e.g. [1, 3, 12, 36]. Each window ends on a window-end date."
+    )
+    window_end_frequency: Frequency = Field(
+        Frequency.MONTHLY,
+        description="Windows end on the last observation of each period of this frequency within the analysis period.",
+    )
+
+    @field_validator("months")
+    @classmethod
+    def months_must_be_positive(cls, v):
+        if not v:
+            raise ValueError("months list cannot be empty for rolling windows")
+        if any(months <= 0 for months in v):
+            raise ValueError("rolling window lengths must be positive numbers of months")
+        return v
+
+
 class Analysis(BaseModel):
     """Defines a single analysis with its period and desired frequencies."""
 
@@ -62,6 +133,15 @@ class Analysis(BaseModel):
         return v
 
 
+class TwrAnalysis(Analysis):
+    """A TWR analysis, which can also report trailing-window returns within its period."""
+
+    rolling: Optional[RollingWindows] = Field(
+        None,
+        description="Trailing-window returns for window ends within the period, computed from the same engine run.",
+    )
+
+
 class PerformanceRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -87,10 +167,10 @@ class PerformanceRequest(BaseModel):
     )
 
     # --- START REFACTOR: Decouple periods and frequencies ---
-    analyses: List[Analysis]
+    analyses: List[TwrAnalysis]
     # --- END REFACTOR ---
 
-    valuation_points: List[DailyInputData]
+    valuation_points: Union[List[DailyInputData], ValuationPointColumns]
     currency: str = Field("USD", description="The three-letter ISO currency code for the request (e.g., 'USD').")
     precision_mode: Literal["FLOAT64", "DECIMAL_STRICT"] = Field(
         "FLOAT64", description="The numerical precision mode for the calculation engine."
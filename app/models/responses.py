@@ -1,9 +1,9 @@
 # app/models/responses.py
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PlainSerializer
 
 from common.enums import Frequency
 from core.envelope import Audit, Diagnostics, Meta
@@ -28,7 +28,28 @@ class PerformanceResultItem(BaseModel):
     daily_data: Optional[List[Dict]] = None
 
 
-PerformanceBreakdown = Dict[Frequency, List[PerformanceResultItem]]
+# A daily column entry, serialized float-first so a NaN entry stays NaN in JSON mode and renders as
+# null in place; serialized as plain `Any`, it would become None, which the renderer drops from lists.
+DailyColumnValue = Annotated[Any, PlainSerializer(lambda value: value, return_type=Union[float, Any], when_used="json")]
+
+
+class PerformanceBreakdownColumns(BaseModel):
+    """
+    One frequency's breakdown as parallel arrays with one entry per period, returned for
+    `output.timeseries_format = "columnar"`. Entries without a value are null.
+    """
+
+    period: List[str]
+    begin_mv: List[float]
+    end_mv: List[float]
+    net_cash_flow: List[float]
+    period_return_pct: List[float]
+    cumulative_return_pct_to_date: Optional[List[float]] = None
+    annualized_return_pct: Optional[List[float]] = None
+    daily_data: Optional[Dict[str, List[DailyColumnValue]]] = None
+
+
+PerformanceBreakdown = Dict[Frequency, Union[List[PerformanceResultItem], PerformanceBreakdownColumns]]
 
 
 class ResetEvent(BaseModel):
@@ -43,12 +64,22 @@ class PortfolioReturnDecomposition(BaseModel):
     base: float
 
 
+class RollingReturnItem(BaseModel):
+    """The return of one trailing window, from `window_start` to `window_end` inclusive."""
+
+    window_start: date
+    window_end: date
+    return_pct: float
+    annualized_return_pct: Optional[float] = None
+
+
 class SinglePeriodPerformanceResult(BaseModel):
     """Contains the full set of TWR results for a single, resolved period."""
 
     breakdowns: PerformanceBreakdown
     reset_events: Optional[List[ResetEvent]] = None
     portfolio_return: Optional[PortfolioReturnDecomposition] = None
+    rolling_returns: Optional[Dict[str, List[RollingReturnItem]]] = None
 
 
 class PerformanceResponse(BaseModel):
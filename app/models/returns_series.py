@@ -147,6 +147,10 @@ class ReturnsSeriesRequest(BaseModel):
     risk_free: RiskFreeSpec | None = None
     data_policy: DataPolicy = Field(default_factory=DataPolicy)
     source: SeriesSource = Field(default_factory=SeriesSource)
+    timeseries_format: Literal["rows", "columnar"] = Field(
+        default="rows",
+        description="'rows' returns one object per observation; 'columnar' returns parallel date and value arrays.",
+    )
 
     @model_validator(mode="after")
     def validate_selection(self) -> "ReturnsSeriesRequest":
@@ -207,10 +211,15 @@ class ReturnsMetadata(BaseModel):
     trace_id: str | None = None
 
 
+class ReturnSeriesColumns(BaseModel):
+    date: list[dt_date] = Field(description="Business dates of the observations, in order.")
+    return_value: list[Decimal] = Field(description="Simple period return values in decimal form, one per date.")
+
+
 class ReturnsSeriesPayload(BaseModel):
-    portfolio_returns: list[ReturnPoint]
-    benchmark_returns: list[ReturnPoint] | None = None
-    risk_free_returns: list[ReturnPoint] | None = None
+    portfolio_returns: list[ReturnPoint] | ReturnSeriesColumns
+    benchmark_returns: list[ReturnPoint] | ReturnSeriesColumns | None = None
+    risk_free_returns: list[ReturnPoint] | ReturnSeriesColumns | None = None
 
 
 class ReturnsSeriesResponse(BaseModel):
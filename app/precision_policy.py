@@ -1,6 +1,8 @@
 from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
 from typing import Any
 
+import numpy as np
+
 ROUNDING_POLICY_VERSION = "1.1.0"
 ROUNDING_MODE = ROUND_HALF_EVEN
 PRICE_SCALE = Decimal("0.000001")
@@ -70,3 +72,60 @@ def quantize_performance(value: Any) -> Decimal:
 
 def quantize_risk(value: Any) -> Decimal:
     return to_decimal(value).quantize(RISK_SCALE, rounding=ROUNDING_MODE)
+
+
+def quantize_array(values: Any, scale: Decimal) -> np.ndarray:
+    """
+    Every value of an array rounded half-even to `scale`, exactly as `to_decimal(value).quantize`
+    rounds it, returned as a float64 array of the same shape. Float64 values are scaled and rounded half-even
+    in binary, which gives the same result whenever the scaled value is clear of a rounding
+    midpoint; the few within a few ulps of one, and non-float64 values such as Decimals, are
+    quantized one by one as above.
+    """
+    array = np.asarray(values)
+    result = np.empty(array.shape, dtype=np.float64)
+    if array.dtype == np.float64:
+        factor = 10.0 ** -_decimal_exponent(scale)  # Exact: policy scales are at most 22 places.
+        scaled = array * factor
+        with np.errstate(invalid="ignore"):
+            midpoint_distance = np.abs(scaled - np.floor(scaled) - 0.5)
+            # Decimal rounds the shortest repr of each float, within 1.5 ulps of `scaled`.
+            exact = (np.abs(scaled) < 2.0**52) & (midpoint_distance > 8 * np.spacing(np.abs(scaled)))
+        exact |= np.isnan(array)
+        result[exact] = np.rint(scaled[exact]) / factor
+        pending = ~exact
+    else:
+        pending = np.ones(array.shape, dtype=bool)
+    result[pending] = [float(to_decimal(value).quantize(scale, rounding=ROUNDING_MODE)) for value in array[pending]]
+    return result
+
+
+def _decimal_exponent(scale: Decimal) -> int:
+    exponent = scale.as_tuple().exponent
+    if not isinstance(exponent, int):
+        raise ValueError(f"Invalid quantization scale: {scale!r}")
+    return exponent
+
+
+def quantize_money_array(values: Any) -> np.ndarray:
+    return quantize_array(values, MONEY_SCALE)
+
+
+def quantize_quantity_array(values: Any) -> np.ndarray:
+    return quantize_array(values, QUANTITY_SCALE)
+
+
+def quantize_price_array(values: Any) -> np.ndarray:
+    return quantize_array(values, PRICE_SCALE)
+
+
+def quantize_fx_rate_array(values: Any) -> np.ndarray:
+    return quantize_array(values, FX_RATE_SCALE)
+
+
+def quantize_performance_array(values: Any) -> np.ndarray:
+    return quantize_array(values, PERFORMANCE_SCALE)
+
+
+def quantize_risk_array(values: Any) -> np.ndarray:
+    return quantize_array(values, RISK_SCALE)
@@ -0,0 +1,138 @@
+# core/date_dimension.py
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Whole years covering every day pandas can represent as a datetime64[ns] timestamp.
+FIRST_DAY = np.datetime64("1677-01-01", "D")
+LAST_DAY = np.datetime64("2262-04-11", "D")
+
+_PERIOD_FREQS = ("M", "Q", "Y")
+
+
+def to_epoch_days(dates) -> np.ndarray:
+    """
+    Days since 1970-01-01 as int32, from `date` objects, strings or datetime64 values (a scalar
+    for scalar input). Object columns are parsed once, after which period slicing is plain integer
+    comparison instead of comparing `date` objects row by row.
+    """
+    values = np.asarray(dates)
+    if values.dtype.kind != "M":
+        values = pd.to_datetime(dates).to_numpy()
+    return values.astype("datetime64[D]").astype(np.int32)
+
+
+class EpochDayIndex:
+    """
+    The epoch days of a date column, parsed once, for locating the rows of date windows. Engine
+    results are date-ordered, so windows are found by binary search and come back as a `slice`;
+    unordered columns fall back to a boolean mask. Either selects rows through `DataFrame.iloc`.
+    """
+
+    def __init__(self, dates):
+        self.days = to_epoch_days(dates)
+        self.is_sorted = bool((self.days[1:] >= self.days[:-1]).all())
+
+    def window(self, start, end) -> slice | np.ndarray:
+        """Rows dated from `start` to `end`, both inclusive."""
+        start_day, end_day = to_epoch_days(start), to_epoch_days(end)
+        if self.is_sorted:
+            return slice(
+                int(np.searchsorted(self.days, start_day, side="left")),
+                int(np.searchsorted(self.days, end_day, side="right")),
+            )
+        return (self.days >= start_day) & (self.days <= end_day)
+
+    def last_before(self, day) -> int | None:
+        """Position of the last row dated before `day`, or None when there is none."""
+        day = to_epoch_days(day)
+        if self.is_sorted:
+            position = int(np.searchsorted(self.days, day, side="left")) - 1
+            return position if position >= 0 else None
+        earlier = np.flatnonzero(self.days < day)
+        return int(earlier[-1]) if len(earlier) else None
+
+
+class DateDimension:
+    """
+    Calendar attributes of every day from `first_day` to `last_day`, stored as arrays keyed by
+    epoch day (days since 1970-01-01). All attributes are computed once when the table is built;
+    lookups are vectorized array indexing and accept anything NumPy converts to datetime64[D]
+    (datetime64 arrays, datetime Series, `date` scalars). Dates are plain epoch-day integers
+    internally; results come back as datetime64[D], so a scalar lookup's `.item()` is a `date`.
+
+    Business days are Monday to Friday; weeks end on Friday, matching pandas' `W-FRI`.
+    """
+
+    def __init__(self, first_day: np.datetime64 = FIRST_DAY, last_day: np.datetime64 = LAST_DAY):
+        days: np.ndarray = np.arange(first_day, last_day + np.timedelta64(1, "D"), dtype="datetime64[D]")
+        epoch_days: np.ndarray = days.astype(np.int64)
+        months: np.ndarray = days.astype("datetime64[M]")
+        weekdays: np.ndarray = (epoch_days + 3) % 7  # 1970-01-01 was a Thursday; Monday is 0.
+
+        self._first_day = int(epoch_days[0])
+        self._last_day = int(epoch_days[-1])
+        self.month_start: np.ndarray = months.astype("datetime64[D]").astype(np.int64).astype(np.int32)
+        self.quarter_start: np.ndarray = (
+            (months - months.astype(np.int64) % 3).astype("datetime64[D]").astype(np.int64).astype(np.int32)
+        )
+        self.year_start: np.ndarray = (
+            days.astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64).astype(np.int32)
+        )
+        self.is_month_end: np.ndarray = (days + np.timedelta64(1, "D")).astype("datetime64[M]") != months
+        self.week_ending_friday: np.ndarray = (epoch_days + (4 - weekdays) % 7).astype(np.int32)
+        # Running counts up to and including each day, so counts over a range are one subtraction.
+        self.business_day_ordinal: np.ndarray = np.cumsum(weekdays < 5, dtype=np.int32)
+        self.month_end_ordinal: np.ndarray = np.cumsum(self.is_month_end, dtype=np.int32)
+
+    def _positions(self, dates) -> np.ndarray:
+        epoch_days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        if epoch_days.size and (epoch_days.min() < self._first_day or epoch_days.max() > self._last_day):
+            raise ValueError(
+                f"Dates must lie between {np.datetime64(self._first_day, 'D')} and {np.datetime64(self._last_day, 'D')}."
+            )
+        return epoch_days - self._first_day
+
+    def period_start(self, dates, freq: str) -> np.ndarray:
+        """First day of the month ("M"), quarter ("Q") or year ("Y") containing each date."""
+        if freq not in _PERIOD_FREQS:
+            raise ValueError(f"Unsupported period frequency '{freq}'; expected one of {_PERIOD_FREQS}.")
+        starts = {"M": self.month_start, "Q": self.quarter_start, "Y": self.year_start}[freq]
+        return starts[self._positions(dates)].astype("datetime64[D]")
+
+    def month_end(self, dates) -> np.ndarray:
+        """Whether each date is the last day of its month."""
+        return self.is_month_end[self._positions(dates)]
+
+    def week_ending(self, dates) -> np.ndarray:
+        """The Friday ending each date's week (the date itself on Fridays)."""
+        return self.week_ending_friday[self._positions(dates)].astype("datetime64[D]")
+
+    def count_business_days(self, start, end) -> np.ndarray:
+        """Weekdays from `start` to `end`, both inclusive (0 when `end` precedes `start`)."""
+        return self._count_between(self.business_day_ordinal, start, end)
+
+    def count_month_ends(self, start, end) -> np.ndarray:
+        """Month-end days from `start` to `end`, both inclusive (0 when `end` precedes `start`)."""
+        return self._count_between(self.month_end_ordinal, start, end)
+
+    def count_week_endings(self, start, end) -> np.ndarray:
+        """Fridays from `start` to `end`, both inclusive (0 when `end` precedes `start`)."""
+        first = self.week_ending_friday[self._positions(start)].astype(np.int64)
+        end_days = np.asarray(end, dtype="datetime64[D]").astype(np.int64)
+        last = self.week_ending_friday[self._positions(end)].astype(np.int64)
+        last = np.where(last > end_days, last - 7, last)
+        return np.maximum((last - first) // 7 + 1, 0)
+
+    def _count_between(self, ordinal: np.ndarray, start, end) -> np.ndarray:
+        start_positions = self._positions(start)
+        end_positions = self._positions(end)
+        before_start = np.where(start_positions > 0, ordinal[np.maximum(start_positions - 1, 0)], 0)
+        return np.maximum(ordinal[end_positions].astype(np.int64) - before_start, 0)
+
+
+@lru_cache(maxsize=None)
+def get_date_dimension() -> DateDimension:
+    """Returns the process-wide date dimension, building it on first use."""
+    return DateDimension()
@@ -110,6 +110,10 @@ class Output(BaseModel):
     include_timeseries: bool = False
     include_cumulative: bool = False
     top_n: Optional[int] = 20
+    timeseries_format: Literal["rows", "columnar"] = Field(
+        "rows",
+        description="'rows' returns one object per breakdown item; 'columnar' returns parallel arrays per field.",
+    )
 
 
 class Flags(BaseModel):
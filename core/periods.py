@@ -6,9 +6,12 @@ import pandas as pd
 from pydantic import BaseModel
 
 from common.enums import PeriodType
+from core.date_dimension import get_date_dimension
 from core.envelope import Periods
 from core.errors import APIBadRequestError
 
+_CALENDAR_PERIOD_FREQS = {"YTD": "Y", "QTD": "Q", "MTD": "M"}
+
 
 class ResolvedPeriod(BaseModel):
     """A data carrier for a resolved time period."""
@@ -37,12 +40,8 @@ def resolve_period(period_model: Periods, as_of: date) -> Tuple[date, date]:
         return date.min, as_of
 
     end_date = as_of
-    if period_type == "YTD":
-        start_date = as_of_ts.to_period("Y").start_time.date()
-    elif period_type == "QTD":
-        start_date = as_of_ts.to_period("Q").start_time.date()
-    elif period_type == "MTD":
-        start_date = as_of_ts.to_period("M").start_time.date()
+    if period_type in _CALENDAR_PERIOD_FREQS:
+        start_date: date = get_date_dimension().period_start(as_of, _CALENDAR_PERIOD_FREQS[period_type]).item()
     elif period_type == "WTD":
         start_date = (as_of_ts - pd.to_timedelta(as_of_ts.dayofweek, unit="d")).date()
     elif period_type in ["1Y", "3Y", "5Y"]:
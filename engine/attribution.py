@@ -3,8 +3,9 @@ from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
+from pydantic import TypeAdapter
 
-from adapters.api_adapter import create_engine_dataframe
+from adapters.api_adapter import create_valuation_dataframe
 from app.models.attribution_requests import (
     AttributionModel,
     AttributionRequest,
@@ -25,6 +26,19 @@ from engine.compute import run_calculations
 from engine.config import EngineConfig
 from engine.schema import PortfolioColumns
 
+# Instrument results only feed the weights and returns, so their cumulative pass is skipped.
+_INSTRUMENT_OUTPUT_COLUMNS = (
+    PortfolioColumns.PERF_DATE.value,
+    PortfolioColumns.BEGIN_MV.value,
+    PortfolioColumns.BOD_CF.value,
+    PortfolioColumns.DAILY_ROR.value,
+    "local_ror",
+    "fx_ror",
+)
+
+# Group results are validated per level in one call rather than one model per group.
+_GROUP_RESULTS = TypeAdapter(List[AttributionGroupResult])
+
 
 def _prepare_data_from_instruments(request: AttributionRequest) -> List[PortfolioGroup]:
     """
@@ -48,16 +62,18 @@ def _prepare_data_from_instruments(request: AttributionRequest) -> List[Portfoli
         report_ccy=request.report_ccy,
         fx=request.fx,
         hedging=request.hedging,
+        emit_reset_events=False,
+        output_columns=_INSTRUMENT_OUTPUT_COLUMNS,
     )
 
-    portfolio_df = create_engine_dataframe([item.model_dump() for item in request.portfolio_data.valuation_points])
+    portfolio_df = create_valuation_dataframe(request.portfolio_data.valuation_points)
     portfolio_df[PortfolioColumns.PERF_DATE.value] = pd.to_datetime(portfolio_df[PortfolioColumns.PERF_DATE.value])
     portfolio_df = portfolio_df.set_index(PortfolioColumns.PERF_DATE.value)
     portfolio_bop_mv = portfolio_df[PortfolioColumns.BEGIN_MV.value] + portfolio_df[PortfolioColumns.BOD_CF.value]
 
     all_instruments = []
     for inst in request.instruments_data:
-        inst_df = create_engine_dataframe([item.model_dump() for item in inst.valuation_points])
+        inst_df = create_valuation_dataframe(inst.valuation_points)
         if inst_df.empty:
             continue
 
@@ -72,6 +88,8 @@ def _prepare_data_from_instruments(request: AttributionRequest) -> List[Portfoli
                 metric_basis=twr_config.metric_basis,
                 period_type=twr_config.period_type,
                 currency_mode="BASE_ONLY",
+                emit_reset_events=False,
+                output_columns=_INSTRUMENT_OUTPUT_COLUMNS,
             )
 
         inst_results, _ = run_calculations(inst_df.copy(), inst_twr_config)
@@ -272,7 +290,7 @@ def aggregate_attribution_results(
         level_totals = granular_totals_df.groupby(level_group_by).sum(numeric_only=True)
         level_totals["total_effect"] = level_totals.sum(axis=1)
 
-        group_results = []
+        group_rows = []
         for group_key, row in level_totals.iterrows():
             key_dict = {}
             if isinstance(group_key, tuple):
@@ -280,7 +298,8 @@ def aggregate_attribution_results(
                     key_dict[key_name] = group_key[j]
             else:
                 key_dict[level_group_by[0]] = group_key
-            group_results.append(AttributionGroupResult(key=key_dict, **(row * 100).to_dict()))
+            group_rows.append({"key": key_dict, **(row * 100).to_dict()})
+        group_results = _GROUP_RESULTS.validate_python(group_rows)
 
         overall_level_totals = level_totals.sum()
         levels.append(
@@ -0,0 +1,247 @@
+# engine/batch.py
+import logging
+from typing import Dict, Hashable, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+from engine.compute import (
+    _compact_result_columns,
+    _extract_reset_events,
+    _frame_bytes,
+    _needs_cumulative_pass,
+    _prepare_dataframe,
+    _round_float_columns,
+)
+from engine.config import EngineConfig, PrecisionMode
+from engine.exceptions import EngineCalculationError, InvalidEngineInputError
+from engine.periods import get_effective_period_start_dates
+from engine.policies import _flag_outliers, apply_robustness_policies
+from engine.ror import calculate_cumulative_ror, calculate_daily_ror
+from engine.rules import calculate_nip, calculate_sign, get_series_starts
+from engine.schema import PortfolioColumns
+
+logger = logging.getLogger(__name__)
+
+_FX_ONLY_COLUMNS = [
+    "start_rate",
+    "end_rate",
+    "local_ror",
+    "fx_ror",
+    "local_ror_long_cum_ror",
+    "local_ror_short_cum_ror",
+    "fx_ror_long_cum_ror",
+    "fx_ror_short_cum_ror",
+]
+
+
+def run_batch_calculations(
+    df: pd.DataFrame, configs: Mapping[str, EngineConfig]
+) -> Dict[str, Tuple[pd.DataFrame, Dict]]:
+    """
+    Runs the TWR pipeline for many portfolios stacked in one long-format frame keyed by
+    `portfolio_id`, each with its own EngineConfig.
+
+    Row-wise steps, sign/NIP detection and compounding run once over the whole frame; compounding
+    segments, sign flips and reset look-backs never cross portfolio boundaries. Only steps that
+    genuinely depend on per-portfolio settings (period starts, FX, data policies) are evaluated per
+    distinct configuration. Returns a (results, diagnostics) pair per portfolio, matching what
+    `run_calculations` would return for that portfolio on its own; `lean_memory` and
+    `output_columns` are applied per portfolio when the results are split, and a lean portfolio's
+    `peak_frame_bytes` measures its own rows of the stacked frame.
+    """
+    try:
+        if not isinstance(df, pd.DataFrame):
+            raise InvalidEngineInputError("Input must be a pandas DataFrame.")
+        if df.empty:
+            return {}
+        if PortfolioColumns.PORTFOLIO_ID.value not in df.columns:
+            raise InvalidEngineInputError("Batch input must include a 'portfolio_id' column.")
+
+        portfolio_ids = list(pd.unique(df[PortfolioColumns.PORTFOLIO_ID.value]))
+        missing_configs = [pid for pid in portfolio_ids if pid not in configs]
+        if missing_configs:
+            raise InvalidEngineInputError(f"No engine config provided for portfolio(s): {missing_configs}.")
+        precision_modes = {configs[pid].precision_mode for pid in portfolio_ids}
+        if len(precision_modes) > 1:
+            raise InvalidEngineInputError("All portfolios in a batch must share the same precision_mode.")
+
+        df = _stack_contiguously(df, portfolio_ids)
+        _prepare_dataframe(df, configs[portfolio_ids[0]])
+
+        df, policy_diagnostics = _apply_policies_per_portfolio(df, portfolio_ids, configs)
+        portfolio_col = df[PortfolioColumns.PORTFOLIO_ID.value]
+
+        df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value] = pd.Series(pd.NaT, index=df.index).astype(
+            "datetime64[ns]"
+        )
+        for key_pids in _group_portfolios(portfolio_ids, configs, _period_key).values():
+            mask = portfolio_col.isin(key_pids)
+            df.loc[mask, PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value] = get_effective_period_start_dates(
+                df.loc[mask, PortfolioColumns.PERF_DATE.value], configs[key_pids[0]]
+            )
+
+        fx_pids = [pid for pid in portfolio_ids if _uses_fx(configs[pid])]
+        for key_pids in _group_portfolios(portfolio_ids, configs, _ror_key).values():
+            mask = portfolio_col.isin(key_pids)
+            group_df = df.loc[mask].copy()
+            ror_df = calculate_daily_ror(group_df, configs[key_pids[0]].metric_basis, configs[key_pids[0]])
+            for col in ror_df.columns:
+                df.loc[mask, col] = ror_df[col]
+            for col in ("start_rate", "end_rate"):
+                if col in group_df.columns:
+                    df.loc[mask, col] = group_df[col]
+        if fx_pids:
+            # Portfolios without FX still flow through the component compounding; their
+            # local/fx columns are dropped again when results are split per portfolio.
+            zero = df[PortfolioColumns.DAILY_ROR.value].iloc[0] * 0
+            df["local_ror"] = df["local_ror"].where(portfolio_col.isin(fx_pids), zero)
+            df["fx_ror"] = df["fx_ror"].where(portfolio_col.isin(fx_pids), zero)
+
+        for pid in portfolio_ids:
+            if configs[pid].data_policy:
+                _flag_outliers(df.loc[portfolio_col == pid], configs[pid].data_policy, policy_diagnostics[pid])
+
+        df[PortfolioColumns.SIGN.value] = calculate_sign(df)
+        df[PortfolioColumns.NIP.value] = 0
+        for key_pids in _group_portfolios(portfolio_ids, configs, _nip_key).values():
+            mask = portfolio_col.isin(key_pids)
+            df.loc[mask, PortfolioColumns.NIP.value] = calculate_nip(df.loc[mask], configs[key_pids[0]])
+
+        report_end_dates = pd.to_datetime(
+            portfolio_col.map({pid: configs[pid].report_end_date for pid in portfolio_ids})
+        )
+        calculate_cumulative_ror(df, configs[portfolio_ids[0]], report_end_dates=report_end_dates)
+
+        df[PortfolioColumns.LONG_SHORT.value] = np.select(
+            [df[PortfolioColumns.SIGN.value] == -1, df[PortfolioColumns.SIGN.value] == 1], ["S", "L"], default="N"
+        )
+        df[PortfolioColumns.PERF_RESET.value] = df[PortfolioColumns.PERF_RESET.value].astype(int)
+
+        report_starts = pd.to_datetime(
+            portfolio_col.map(
+                {pid: configs[pid].report_start_date or configs[pid].performance_start_date for pid in portfolio_ids}
+            )
+        )
+        in_report_window = (df[PortfolioColumns.PERF_DATE.value] >= report_starts) & (
+            df[PortfolioColumns.PERF_DATE.value] <= report_end_dates
+        )
+        final_df = df[in_report_window].copy()
+        final_df[PortfolioColumns.PERF_DATE.value] = final_df[PortfolioColumns.PERF_DATE.value].dt.date
+
+        if configs[portfolio_ids[0]].precision_mode != PrecisionMode.DECIMAL_STRICT:
+            for key_pids in _group_portfolios(portfolio_ids, configs, lambda c: c.rounding_precision).values():
+                mask = final_df[PortfolioColumns.PORTFOLIO_ID.value].isin(key_pids)
+                rounded = final_df[mask].copy()
+                _round_float_columns(rounded, configs[key_pids[0]].rounding_precision)
+                final_df.loc[mask] = rounded
+
+        results = _split_results(df, final_df, portfolio_ids, configs, fx_pids, policy_diagnostics)
+
+    except InvalidEngineInputError:
+        raise
+    except Exception as e:
+        logger.exception("An unexpected error occurred during batch engine calculations.")
+        raise EngineCalculationError(f"Batch engine calculation failed unexpectedly: {e}")
+
+    logger.info("Batch performance engine calculation complete for %d portfolio(s).", len(results))
+    return results
+
+
+def _stack_contiguously(df: pd.DataFrame, portfolio_ids: list) -> pd.DataFrame:
+    """Makes every portfolio a contiguous block (first-appearance order), keeping row order inside it."""
+    codes = pd.Categorical(df[PortfolioColumns.PORTFOLIO_ID.value], categories=portfolio_ids).codes
+    return df.iloc[np.argsort(codes, kind="stable")].reset_index(drop=True)
+
+
+def _apply_policies_per_portfolio(
+    df: pd.DataFrame, portfolio_ids: list, configs: Mapping[str, EngineConfig]
+) -> Tuple[pd.DataFrame, Dict[str, Dict]]:
+    """Applies data policies to the portfolios that carry one; other portfolios pass through untouched."""
+    policy_diagnostics = {}
+    if not any(configs[pid].data_policy for pid in portfolio_ids):
+        for pid in portfolio_ids:
+            policy_diagnostics[pid] = apply_robustness_policies(df.iloc[:0], None)[1]
+        return df, policy_diagnostics
+
+    frames = []
+    for pid, group_df in df.groupby(PortfolioColumns.PORTFOLIO_ID.value, sort=False):
+        group_df, policy_diagnostics[pid] = apply_robustness_policies(group_df, configs[pid].data_policy)
+        frames.append(group_df)
+    return pd.concat(frames, ignore_index=True), policy_diagnostics
+
+
+def _split_results(
+    df: pd.DataFrame,
+    final_df: pd.DataFrame,
+    portfolio_ids: list,
+    configs: Mapping[str, EngineConfig],
+    fx_pids: list,
+    policy_diagnostics: Dict[str, Dict],
+) -> Dict[str, Tuple[pd.DataFrame, Dict]]:
+    """Splits the stacked frames into per-portfolio results and diagnostics."""
+    series_starts = get_series_starts(df)
+    row_in_series = np.arange(len(df)) - np.maximum.accumulate(np.where(series_starts, np.arange(len(df)), 0))
+
+    results = {}
+    full_groups = dict(tuple(df.groupby(PortfolioColumns.PORTFOLIO_ID.value, sort=False)))
+    final_groups = dict(tuple(final_df.groupby(PortfolioColumns.PORTFOLIO_ID.value, sort=False)))
+    for pid in portfolio_ids:
+        full_rows = full_groups[pid]
+        portfolio_df = final_groups.get(pid, final_df.iloc[:0]).copy()
+        portfolio_df.index = row_in_series[portfolio_df.index]
+        drop_columns = [PortfolioColumns.PORTFOLIO_ID.value]
+        if pid not in fx_pids:
+            drop_columns += [col for col in _FX_ONLY_COLUMNS if col in portfolio_df.columns]
+        portfolio_df = portfolio_df.drop(columns=drop_columns)
+
+        config = configs[pid]
+        policy = policy_diagnostics[pid]
+        diagnostics = {
+            "nip_days": int(portfolio_df[PortfolioColumns.NIP.value].sum()),
+            "reset_days": int(portfolio_df[PortfolioColumns.PERF_RESET.value].sum()),
+            "effective_period_start": full_rows[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value].min().date(),
+            "notes": policy.get("notes", []),
+            "resets": _extract_reset_events(full_rows) if config.emit_reset_events else [],
+            "policy": policy.get("policy"),
+            "samples": policy.get("samples"),
+        }
+        if not _needs_cumulative_pass(config):
+            # A single run skips the reset pass for such projections; the batch runs it for all.
+            diagnostics["reset_days"] = None
+        if config.lean_memory:
+            _compact_result_columns(portfolio_df)
+            del portfolio_df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value]
+        if config.output_columns is not None:
+            portfolio_df = portfolio_df.drop(
+                columns=[col for col in portfolio_df.columns if col not in config.output_columns]
+            )
+        if config.lean_memory:
+            diagnostics["memory"] = {"peak_frame_bytes": max(_frame_bytes(full_rows), _frame_bytes(portfolio_df))}
+        results[pid] = (portfolio_df, diagnostics)
+    return results
+
+
+def _group_portfolios(portfolio_ids: list, configs: Mapping[str, EngineConfig], key_func) -> Dict[Hashable, list]:
+    """Groups portfolios whose configs agree on the settings a pipeline step depends on."""
+    groups: Dict[Hashable, list] = {}
+    for pid in portfolio_ids:
+        groups.setdefault(key_func(configs[pid]), []).append(pid)
+    return groups
+
+
+def _uses_fx(config: EngineConfig) -> bool:
+    return bool(config.currency_mode and config.currency_mode != "BASE_ONLY" and config.fx)
+
+
+def _period_key(config: EngineConfig) -> Hashable:
+    return (config.period_type, config.performance_start_date, config.report_start_date, config.report_end_date)
+
+
+def _ror_key(config: EngineConfig) -> Hashable:
+    # FX and hedging data are per portfolio, so FX-enabled configs never share a daily RoR evaluation.
+    return (config.metric_basis, id(config) if _uses_fx(config) else None)
+
+
+def _nip_key(config: EngineConfig) -> Hashable:
+    return config.feature_flags.use_nip_v2_rule
@@ -1,55 +1,90 @@
 # engine/breakdown.py
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from app.precision_policy import quantize_performance
+from app.precision_policy import quantize_performance_array
 from common.enums import Frequency
 from core.annualize import annualize_return
+from core.date_dimension import get_date_dimension
 from core.envelope import Annualization
 from engine.schema import PortfolioColumns
 
+_PERIOD_START_FREQS = {Frequency.MONTHLY: "M", Frequency.QUARTERLY: "Q", Frequency.YEARLY: "Y"}
+# Calendar frequencies whose periods nest, finest first.
+_CALENDAR_ROLLUP = (Frequency.MONTHLY, Frequency.QUARTERLY, Frequency.YEARLY)
 
-def _calculate_period_summary_dict(
-    period_df: pd.DataFrame,
-    full_history_df: pd.DataFrame,
-    annualization: Annualization,
-    include_cumulative: bool,
-    rounding_precision: int,
-) -> Dict:
-    """Calculates an aggregated summary dict for a given period DataFrame."""
-    first_day = period_df.iloc[0]
-    last_day = period_df.iloc[-1]
-
-    period_ror = (1 + period_df[PortfolioColumns.DAILY_ROR.value] / 100).prod() - 1
-
-    summary = {
-        PortfolioColumns.BEGIN_MV.value: first_day[PortfolioColumns.BEGIN_MV.value],
-        PortfolioColumns.END_MV.value: last_day[PortfolioColumns.END_MV.value],
-        "net_cash_flow": (period_df[PortfolioColumns.BOD_CF.value] + period_df[PortfolioColumns.EOD_CF.value]).sum(),
-        "period_return_pct": float(quantize_performance(period_ror * 100)),
-    }
-
-    if include_cumulative:
-        summary["cumulative_return_pct_to_date"] = float(
-            quantize_performance(last_day[PortfolioColumns.FINAL_CUM_ROR.value])
-        )
 
+def _summarize_periods(
+    period_days: pd.DataFrame, period_starts: np.ndarray, annualization: Annualization, include_cumulative: bool
+) -> List[Dict]:
+    """
+    Aggregated summary dicts for the consecutive runs of date-sorted `period_days` that begin at
+    `period_starts`. Period returns, first/last values and day counts are taken for every period at
+    once from whole columns and rounded as arrays; only annualization runs per period, on scalars.
+    """
+    period_ends = np.append(period_starts[1:], len(period_days))
+    period_lasts = period_ends - 1
+
+    growth = 1 + period_days[PortfolioColumns.DAILY_ROR.value].to_numpy() / 100
+    missing = pd.isna(growth)
+    if missing.any():
+        growth = np.where(missing, 1, growth)  # `Series.prod` skips missing returns.
+    period_rors = np.multiply.reduceat(growth, period_starts) - 1
+
+    net_cash_flows = (
+        period_days[PortfolioColumns.BOD_CF.value] + period_days[PortfolioColumns.EOD_CF.value]
+    ).to_numpy()
+    if net_cash_flows.dtype != object:
+        net_cash_flows = np.where(np.isnan(net_cash_flows), 0.0, net_cash_flows)
+    begin_mvs = period_days[PortfolioColumns.BEGIN_MV.value].to_numpy()[period_starts]
+    end_mvs = period_days[PortfolioColumns.END_MV.value].to_numpy()[period_lasts]
+    period_return_pcts = quantize_performance_array(period_rors * 100).tolist()
+    cumulative_return_pcts = (
+        quantize_performance_array(period_days[PortfolioColumns.FINAL_CUM_ROR.value].to_numpy()[period_lasts]).tolist()
+        if include_cumulative
+        else None
+    )
+
+    annualized_return_pcts = {}
     if annualization.enabled:
-        days_in_period = (
-            last_day[PortfolioColumns.PERF_DATE.value] - first_day[PortfolioColumns.PERF_DATE.value]
-        ).days + 1
+        perf_dates = period_days[PortfolioColumns.PERF_DATE.value].to_numpy(dtype="datetime64[ns]")
+        days_in_periods = (perf_dates[period_lasts] - perf_dates[period_starts]) // np.timedelta64(1, "D") + 1
         ppy = annualization.periods_per_year or (
             252 if annualization.basis == "BUS/252" else 365.25 if annualization.basis == "ACT/ACT" else 365.0
         )
-
-        # --- START FIX: Remove conditional logic to always annualize if requested ---
-        if days_in_period > 0:
-            annualized_return = annualize_return(period_ror, days_in_period, ppy, annualization.basis) * 100
-            summary["annualized_return_pct"] = float(quantize_performance(annualized_return))
-        # --- END FIX ---
-
-    return summary
+        annualized_periods = np.flatnonzero(days_in_periods > 0).tolist()
+        annualized_returns = [
+            annualize_return(period_rors[i], int(days_in_periods[i]), ppy, annualization.basis) * 100
+            for i in annualized_periods
+        ]
+        annualized_return_pcts = dict(zip(annualized_periods, quantize_performance_array(annualized_returns).tolist()))
+
+    summaries = []
+    for i, (start, end) in enumerate(zip(period_starts.tolist(), period_ends.tolist())):
+        summary = {
+            PortfolioColumns.BEGIN_MV.value: begin_mvs[i],
+            PortfolioColumns.END_MV.value: end_mvs[i],
+            # Summed per period so float totals keep NumPy's pairwise summation order.
+            "net_cash_flow": net_cash_flows[start:end].sum(),
+            "period_return_pct": period_return_pcts[i],
+        }
+        if cumulative_return_pcts is not None:
+            summary["cumulative_return_pct_to_date"] = cumulative_return_pcts[i]
+        if i in annualized_return_pcts:
+            summary["annualized_return_pct"] = annualized_return_pcts[i]
+        summaries.append(summary)
+    return summaries
+
+
+def _period_labels(period_keys: np.ndarray, freq: Frequency) -> List[str]:
+    """Response labels for period keys: the period's start day, or the week-ending Friday for weeks."""
+    if freq == Frequency.QUARTERLY:
+        months = period_keys.astype("datetime64[M]").astype(np.int64)
+        return [f"{1970 + month // 12}-Q{month % 12 // 3 + 1}" for month in months.tolist()]
+    unit = {Frequency.MONTHLY: "M", Frequency.YEARLY: "Y"}.get(freq, "D")
+    return np.datetime_as_string(period_keys, unit=unit).tolist()
 
 
 def generate_performance_breakdowns(
@@ -67,48 +102,76 @@ def generate_performance_breakdowns(
         return {}
 
     daily_df[PortfolioColumns.PERF_DATE.value] = pd.to_datetime(daily_df[PortfolioColumns.PERF_DATE.value])
-    daily_df_indexed = daily_df.set_index(pd.to_datetime(daily_df[PortfolioColumns.PERF_DATE.value]))
+    # Each period holds its days in date order.
+    period_days = daily_df.sort_values(PortfolioColumns.PERF_DATE.value, kind="mergesort")
+    period_plans = _plan_periods(
+        period_days[PortfolioColumns.PERF_DATE.value].to_numpy(dtype="datetime64[ns]"), frequencies
+    )
 
     breakdowns = {}
-
     for freq in frequencies:
-        results = []
         if freq == Frequency.DAILY:
-            for _, row in daily_df.iterrows():
-                summary = {
-                    PortfolioColumns.BEGIN_MV.value: row[PortfolioColumns.BEGIN_MV.value],
-                    PortfolioColumns.END_MV.value: row[PortfolioColumns.END_MV.value],
-                    "net_cash_flow": row[PortfolioColumns.BOD_CF.value] + row[PortfolioColumns.EOD_CF.value],
-                    "period_return_pct": row[PortfolioColumns.DAILY_ROR.value],
-                }
-                if include_cumulative:
-                    summary["cumulative_return_pct_to_date"] = row[PortfolioColumns.FINAL_CUM_ROR.value]
-
-                results.append(
-                    {"period": row[PortfolioColumns.PERF_DATE.value].strftime("%Y-%m-%d"), "summary": summary}
-                )
+            results = _daily_results(daily_df, include_cumulative)
         else:
-            freq_map = {
-                Frequency.MONTHLY: "ME",
-                Frequency.QUARTERLY: "QE",
-                Frequency.YEARLY: "YE",
-                Frequency.WEEKLY: "W-FRI",
-            }
-            resampler = daily_df_indexed.resample(freq_map[freq])
-            for period_timestamp, period_df in resampler:
-                if period_df.empty:
-                    continue
-                summary = _calculate_period_summary_dict(
-                    period_df, daily_df, annualization, include_cumulative, rounding_precision
-                )
-                if freq == Frequency.MONTHLY:
-                    period_str = period_timestamp.strftime("%Y-%m")
-                elif freq == Frequency.QUARTERLY:
-                    period_str = f"{period_timestamp.year}-Q{period_timestamp.quarter}"
-                elif freq == Frequency.YEARLY:
-                    period_str = period_timestamp.strftime("%Y")
-                else:  # Weekly
-                    period_str = period_timestamp.strftime("%Y-%m-%d")
-                results.append({"period": period_str, "summary": summary})
+            period_starts, period_keys = period_plans[freq]
+            summaries = _summarize_periods(period_days, period_starts, annualization, include_cumulative)
+            labels = _period_labels(period_keys, freq)
+            results = [{"period": label, "summary": summary} for label, summary in zip(labels, summaries)]
         breakdowns[freq] = results
     return breakdowns
+
+
+def _plan_periods(
+    sorted_dates: np.ndarray, frequencies: List[Frequency]
+) -> Dict[Frequency, Tuple[np.ndarray, np.ndarray]]:
+    """
+    For each requested aggregate frequency, the row positions where its periods begin in
+    `sorted_dates` and each period's key (its first calendar day, or its week-ending Friday).
+    Months, quarters and years nest, so only the finest requested of them is located among the
+    days; each coarser level is found among the periods of the level below it, at the cost of one
+    lookup per finer period instead of one per day.
+    """
+    calendar = get_date_dimension()
+    plans = {}
+    if Frequency.WEEKLY in frequencies:
+        week_keys = calendar.week_ending(sorted_dates)
+        week_starts = _run_starts(week_keys)
+        plans[Frequency.WEEKLY] = (week_starts, week_keys[week_starts])
+
+    period_starts, period_dates = np.arange(len(sorted_dates)), sorted_dates
+    for freq in _CALENDAR_ROLLUP:
+        if freq not in frequencies:
+            continue
+        keys = calendar.period_start(period_dates, _PERIOD_START_FREQS[freq])
+        runs = _run_starts(keys)
+        period_starts, period_dates = period_starts[runs], keys[runs]
+        plans[freq] = (period_starts, period_dates)
+    return plans
+
+
+def _run_starts(keys: np.ndarray) -> np.ndarray:
+    """Positions where a run of equal consecutive keys begins."""
+    return np.flatnonzero(np.append(True, keys[1:] != keys[:-1]))
+
+
+def _daily_results(daily_df: pd.DataFrame, include_cumulative: bool) -> List[Dict]:
+    """One unaggregated result per row of `daily_df`, in row order."""
+    labels = np.datetime_as_string(daily_df[PortfolioColumns.PERF_DATE.value].to_numpy(dtype="datetime64[D]")).tolist()
+    begin_mvs = daily_df[PortfolioColumns.BEGIN_MV.value].tolist()
+    end_mvs = daily_df[PortfolioColumns.END_MV.value].tolist()
+    net_cash_flows = (daily_df[PortfolioColumns.BOD_CF.value] + daily_df[PortfolioColumns.EOD_CF.value]).tolist()
+    daily_rors = daily_df[PortfolioColumns.DAILY_ROR.value].tolist()
+    cumulative_rors = daily_df[PortfolioColumns.FINAL_CUM_ROR.value].tolist() if include_cumulative else None
+
+    results = []
+    for i, label in enumerate(labels):
+        summary = {
+            PortfolioColumns.BEGIN_MV.value: begin_mvs[i],
+            PortfolioColumns.END_MV.value: end_mvs[i],
+            "net_cash_flow": net_cash_flows[i],
+            "period_return_pct": daily_rors[i],
+        }
+        if cumulative_rors is not None:
+            summary["cumulative_return_pct_to_date"] = cumulative_rors[i]
+        results.append({"period": label, "summary": summary})
+    return results
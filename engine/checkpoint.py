@@ -0,0 +1,178 @@
+# engine/checkpoint.py
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from common.enums import PeriodType
+from engine.config import PrecisionMode
+from engine.schema import PortfolioColumns
+
+# Input columns of the day that is re-evaluated when the next increment arrives.
+CHECKPOINT_INPUT_COLUMNS = [
+    PortfolioColumns.DAY.value,
+    PortfolioColumns.PERF_DATE.value,
+    PortfolioColumns.BEGIN_MV.value,
+    PortfolioColumns.BOD_CF.value,
+    PortfolioColumns.EOD_CF.value,
+    PortfolioColumns.MGMT_FEES.value,
+    PortfolioColumns.END_MV.value,
+]
+
+
+@dataclass(frozen=True)
+class LegCarry:
+    """Running state of one compounded leg: the growth product of the open block and the last leg-day RoR."""
+
+    growth: Any
+    ror: Any
+
+
+@dataclass(frozen=True)
+class SeriesCarry:
+    """
+    State of a series after a given day, sufficient to resume every history-dependent step
+    (sign carry-forward, compounding, reset look-backs and NIP carry-forward) on the next day.
+    """
+
+    perf_date: date
+    effective_period_start_date: date
+    sign: int
+    eod_cf: Any
+    initial_reset: bool
+    # Keyed by cumulative column name, e.g. "temp_long_cum_ror" or "local_ror_short_cum_ror".
+    legs: Dict[str, LegCarry] = field(default_factory=dict)
+    # Published cumulative values (after resets and NIP handling), keyed the same way.
+    cum_rors: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class EngineCheckpoint:
+    """
+    Compact state emitted after a run so the next run only needs the newly appended days.
+
+    The last processed day is kept as raw input (`pending_row`) rather than as final state,
+    because reset rules look one day ahead: it is re-evaluated together with the new days,
+    resuming from `anchor`, the state after the day before it.
+
+    The carried cumulative returns are only valid for the period they were compounded over, so
+    the checkpoint records the `period_type` and the `period_start` of the pending day; a resumed
+    run must assign that day the same period start.
+    """
+
+    precision_mode: PrecisionMode
+    pending_row: Dict[str, Any]
+    anchor: Optional[SeriesCarry]
+    effective_period_start: date
+    period_type: PeriodType
+    period_start: date
+
+    @property
+    def last_date(self) -> date:
+        return self.pending_row[PortfolioColumns.PERF_DATE.value]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializes the checkpoint to JSON-compatible primitives (decimals as strings, dates as ISO)."""
+        anchor = None
+        if self.anchor is not None:
+            anchor = {
+                "perf_date": self.anchor.perf_date.isoformat(),
+                "effective_period_start_date": self.anchor.effective_period_start_date.isoformat(),
+                "sign": self.anchor.sign,
+                "eod_cf": _dump_number(self.anchor.eod_cf),
+                "initial_reset": self.anchor.initial_reset,
+                "legs": {
+                    name: {"growth": _dump_number(leg.growth), "ror": _dump_number(leg.ror)}
+                    for name, leg in self.anchor.legs.items()
+                },
+                "cum_rors": {name: _dump_number(value) for name, value in self.anchor.cum_rors.items()},
+            }
+        pending_row = {
+            name: value.isoformat() if isinstance(value, date) else _dump_number(value)
+            for name, value in self.pending_row.items()
+        }
+        return {
+            "precision_mode": self.precision_mode.value,
+            "pending_row": pending_row,
+            "anchor": anchor,
+            "effective_period_start": self.effective_period_start.isoformat(),
+            "period_type": self.period_type.value,
+            "period_start": self.period_start.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EngineCheckpoint":
+        """Restores a checkpoint produced by `to_dict`."""
+        precision_mode = PrecisionMode(data["precision_mode"])
+
+        def load(value):
+            return _load_number(value, precision_mode)
+
+        anchor = None
+        if data.get("anchor") is not None:
+            raw = data["anchor"]
+            anchor = SeriesCarry(
+                perf_date=date.fromisoformat(raw["perf_date"]),
+                effective_period_start_date=date.fromisoformat(raw["effective_period_start_date"]),
+                sign=int(raw["sign"]),
+                eod_cf=load(raw["eod_cf"]),
+                initial_reset=bool(raw["initial_reset"]),
+                legs={
+                    name: LegCarry(growth=load(leg["growth"]), ror=load(leg["ror"]))
+                    for name, leg in raw["legs"].items()
+                },
+                cum_rors={name: load(value) for name, value in raw["cum_rors"].items()},
+            )
+        pending_row = {
+            name: date.fromisoformat(value) if name == PortfolioColumns.PERF_DATE.value else load(value)
+            for name, value in data["pending_row"].items()
+        }
+        return cls(
+            precision_mode=precision_mode,
+            pending_row=pending_row,
+            anchor=anchor,
+            effective_period_start=date.fromisoformat(data["effective_period_start"]),
+            period_type=PeriodType(data["period_type"]),
+            period_start=date.fromisoformat(data["period_start"]),
+        )
+
+
+def _dump_number(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _load_number(value: Any, precision_mode: PrecisionMode) -> Any:
+    if precision_mode == PrecisionMode.DECIMAL_STRICT and not isinstance(value, int):
+        return Decimal(value)
+    return value
+
+
+def build_checkpoint(
+    df: pd.DataFrame,
+    anchor: Optional[SeriesCarry],
+    precision_mode: PrecisionMode,
+    period_type: PeriodType,
+    effective_period_start: date,
+) -> EngineCheckpoint:
+    """
+    Builds the checkpoint for a single-series frame whose last row becomes the pending day.
+    The frame must still hold its effective period start dates.
+    """
+    last_row = df.iloc[-1]
+    pending_row = {col: last_row[col] for col in CHECKPOINT_INPUT_COLUMNS if col in df.columns}
+    pending_row[PortfolioColumns.PERF_DATE.value] = pd.Timestamp(pending_row[PortfolioColumns.PERF_DATE.value]).date()
+    pending_row = {name: value.item() if hasattr(value, "item") else value for name, value in pending_row.items()}
+    return EngineCheckpoint(
+        precision_mode=precision_mode,
+        pending_row=pending_row,
+        anchor=anchor,
+        effective_period_start=effective_period_start,
+        period_type=period_type,
+        period_start=pd.Timestamp(last_row[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value]).date(),
+    )
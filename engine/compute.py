@@ -1,13 +1,18 @@
 # engine/compute.py
 import logging
+from datetime import date
 from decimal import Decimal
-from typing import Dict, Tuple
+from typing import Dict, List, Mapping, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from core.date_dimension import to_epoch_days
+from engine.checkpoint import EngineCheckpoint, build_checkpoint
 from engine.config import EngineConfig, PrecisionMode
 from engine.exceptions import EngineCalculationError, InvalidEngineInputError
+from engine.fastpath import calculate_array_columns, supports_array_backend
+from engine.fixed_point import to_decimal_series
 from engine.periods import get_effective_period_start_dates
 from engine.policies import _flag_outliers, apply_robustness_policies
 from engine.ror import calculate_cumulative_ror, calculate_daily_ror
@@ -16,12 +21,54 @@ from engine.schema import PortfolioColumns
 
 logger = logging.getLogger(__name__)
 
-
-def run_calculations(df: pd.DataFrame, config: EngineConfig) -> Tuple[pd.DataFrame, Dict]:
+_RESET_REASON_FLAGS = [
+    PortfolioColumns.NCTRL_1,
+    PortfolioColumns.NCTRL_2,
+    PortfolioColumns.NCTRL_3,
+    PortfolioColumns.NCTRL_4,
+]
+_FLAG_COLUMNS = [PortfolioColumns.NIP.value, PortfolioColumns.PERF_RESET.value] + [
+    flag.value for flag in _RESET_REASON_FLAGS
+]
+# Columns written by the cumulative pass; component legs (e.g. `local_ror_long_cum_ror`) follow the same suffix.
+_CUMULATIVE_COLUMNS = {
+    PortfolioColumns.PERF_RESET.value,
+    PortfolioColumns.LONG_CUM_ROR.value,
+    PortfolioColumns.SHORT_CUM_ROR.value,
+    PortfolioColumns.FINAL_CUM_ROR.value,
+} | {flag.value for flag in _RESET_REASON_FLAGS}
+# Reason text for every NCTRL flag combination, indexed by the reset reason bitmask.
+_RESET_REASONS = np.array(
+    [
+        ",".join(flag.name for bit, flag in enumerate(_RESET_REASON_FLAGS) if bitmask >> bit & 1) or "UNKNOWN"
+        for bitmask in range(2 ** len(_RESET_REASON_FLAGS))
+    ],
+    dtype=object,
+)
+
+
+def run_calculations(
+    df: pd.DataFrame,
+    config: EngineConfig,
+    checkpoint: Optional[EngineCheckpoint] = None,
+    emit_checkpoint: bool = False,
+) -> Tuple[pd.DataFrame, Dict]:
     """
     Orchestrates the full portfolio performance calculation pipeline using
     a fully vectorized approach.
     Returns a DataFrame and a diagnostics dictionary.
+
+    With a `checkpoint`, `df` only holds the days appended since the run that emitted it and the
+    calculation resumes from the carried state; the checkpoint's last day is re-evaluated along
+    with the new days because reset rules look one day ahead. With `emit_checkpoint`, the
+    diagnostics carry a "checkpoint" for the next incremental run.
+
+    Small single-series FLOAT64 frames run on the array backend (`engine.fastpath`), which
+    produces the same frame and diagnostics without pandas' per-operation overhead.
+
+    With `config.output_columns`, only those columns are returned. When none of them comes from
+    the cumulative pass (legs, NCTRL flags, resets) and no reset events or checkpoints are
+    involved, that pass is skipped and the diagnostics report `reset_days` as None.
     """
     try:
         if not isinstance(df, pd.DataFrame):
@@ -30,7 +77,21 @@ def run_calculations(df: pd.DataFrame, config: EngineConfig) -> Tuple[pd.DataFra
         if df.empty:
             return pd.DataFrame(), {}
 
+        if checkpoint is None and not emit_checkpoint and supports_array_backend(df, config):
+            return _run_array_calculations(df, config)
+
+        if checkpoint is not None:
+            df = _prepend_checkpoint_row(df, checkpoint, config)
+        carry = checkpoint.anchor if checkpoint is not None else None
+
         _prepare_dataframe(df, config)
+        if (
+            checkpoint is not None
+            and (
+                to_epoch_days(df[PortfolioColumns.PERF_DATE.value].iloc[1:]) <= to_epoch_days(checkpoint.last_date)
+            ).any()
+        ):
+            raise InvalidEngineInputError("Incremental input must only contain dates after the checkpoint's last date.")
 
         df, policy_diagnostics = apply_robustness_policies(df, config.data_policy)
 
@@ -47,51 +108,63 @@ def run_calculations(df: pd.DataFrame, config: EngineConfig) -> Tuple[pd.DataFra
 
         # --- START FIX: Ensure correct order of operations for sign and reset ---
         # Sign must be calculated before cumulative returns and resets that depend on it.
-        df[PortfolioColumns.SIGN.value] = calculate_sign(df)
+        df[PortfolioColumns.SIGN.value] = calculate_sign(df, carry)
         df[PortfolioColumns.NIP.value] = calculate_nip(df, config)
 
-        calculate_cumulative_ror(df, config)
+        snapshot_row = len(df) - 2 if emit_checkpoint and len(df) > 1 else None
+        skip_cumulative = carry is None and not emit_checkpoint and not _needs_cumulative_pass(config)
+        if skip_cumulative:
+            anchor = None
+        elif carry is None and snapshot_row is None:
+            anchor = calculate_cumulative_ror(df, config)
+        else:
+            anchor = calculate_cumulative_ror(df, config, carry=carry, snapshot_row=snapshot_row)
         # --- END FIX ---
 
         df[PortfolioColumns.LONG_SHORT.value] = np.select(
             [df[PortfolioColumns.SIGN.value] == -1, df[PortfolioColumns.SIGN.value] == 1], ["S", "L"], default="N"
         )
 
-        reset_events = []
         df[PortfolioColumns.PERF_RESET.value] = df[PortfolioColumns.PERF_RESET.value].astype(int)
-        reset_rows = df[df[PortfolioColumns.PERF_RESET.value] == 1]
-        for _, row in reset_rows.iterrows():
-            reason_codes = []
-            if row[PortfolioColumns.NCTRL_1.value]:
-                reason_codes.append("NCTRL_1")
-            if row[PortfolioColumns.NCTRL_2.value]:
-                reason_codes.append("NCTRL_2")
-            if row[PortfolioColumns.NCTRL_3.value]:
-                reason_codes.append("NCTRL_3")
-            if row[PortfolioColumns.NCTRL_4.value]:
-                reason_codes.append("NCTRL_4")
-            reset_events.append(
-                {
-                    "date": row[PortfolioColumns.PERF_DATE.value].date(),
-                    "reason": ",".join(reason_codes) or "UNKNOWN",
-                    "impacted_rows": 1,
-                }
-            )
 
-        final_df = _filter_results_to_reporting_period(df, config)
+        effective_period_start = df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value].min().date()
+        if checkpoint is not None:
+            effective_period_start = min(effective_period_start, checkpoint.effective_period_start)
+
+        peak_frame_bytes = 0
+        if config.lean_memory:
+            peak_frame_bytes = _frame_bytes(df)
+            _compact_result_columns(df)
+            if not emit_checkpoint:
+                del df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value]
+
+        reset_events = _extract_reset_events(df) if config.emit_reset_events else []
+
+        final_df = _filter_results_to_reporting_period(df, config, copy=not config.lean_memory)
 
         if config.precision_mode != PrecisionMode.DECIMAL_STRICT:
             _round_float_columns(final_df, config.rounding_precision)
 
-        diagnostics = {
-            "nip_days": int(final_df[PortfolioColumns.NIP.value].sum()),
-            "reset_days": int(final_df[PortfolioColumns.PERF_RESET.value].sum()),
-            "effective_period_start": df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value].min().date(),
-            "notes": policy_diagnostics.get("notes", []),
-            "resets": reset_events,
-            "policy": policy_diagnostics.get("policy"),
-            "samples": policy_diagnostics.get("samples"),
-        }
+        diagnostics = _build_diagnostics(final_df, effective_period_start, policy_diagnostics, reset_events)
+        if skip_cumulative:
+            diagnostics["reset_days"] = None
+        if config.output_columns is not None:
+            final_df = final_df.drop(columns=[col for col in final_df.columns if col not in config.output_columns])
+        if config.lean_memory:
+            diagnostics["memory"] = {"peak_frame_bytes": max(peak_frame_bytes, _frame_bytes(final_df))}
+        if emit_checkpoint:
+            diagnostics["checkpoint"] = build_checkpoint(
+                df,
+                anchor if snapshot_row is not None else carry,
+                config.precision_mode,
+                config.period_type,
+                effective_period_start,
+            )
+            if config.lean_memory:
+                del df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value]
+                # When the report starts after the first row, the results are a separate frame.
+                if PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value in final_df.columns:
+                    del final_df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value]
 
     except InvalidEngineInputError:
         raise
@@ -103,6 +176,122 @@ def run_calculations(df: pd.DataFrame, config: EngineConfig) -> Tuple[pd.DataFra
     return final_df, diagnostics
 
 
+def _run_array_calculations(df: pd.DataFrame, config: EngineConfig) -> Tuple[pd.DataFrame, Dict]:
+    """Assembles the result frame and diagnostics from the array backend's columns in one step."""
+    columns = calculate_array_columns(df, config)
+    _, policy_diagnostics = apply_robustness_policies(df, None)
+    effective_period_start = pd.Timestamp(columns[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value].min()).date()
+    peak_frame_bytes = 0
+    if config.lean_memory:
+        # Counted as `_frame_bytes` counts the pandas path's working frame: column buffers plus the index.
+        peak_frame_bytes = sum(values.nbytes for values in columns.values()) + df.index.memory_usage()
+        _compact_result_columns(columns)
+        del columns[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value]
+    reset_events = _extract_reset_events(columns) if config.emit_reset_events else []
+
+    perf_dates = columns[PortfolioColumns.PERF_DATE.value]
+    effective_report_start = pd.to_datetime(config.report_start_date or config.performance_start_date)
+    report_end_date = pd.to_datetime(config.report_end_date)
+    mask = (perf_dates >= effective_report_start.to_datetime64()) & (perf_dates <= report_end_date.to_datetime64())
+
+    final_columns = {}
+    for name, values in columns.items():
+        if config.output_columns is not None and name not in config.output_columns:
+            continue
+        values = values[mask]
+        if values.dtype == np.float64:
+            values = values.round(config.rounding_precision)
+        final_columns[name] = values
+    if PortfolioColumns.PERF_DATE.value in final_columns:
+        final_columns[PortfolioColumns.PERF_DATE.value] = perf_dates[mask].astype("datetime64[D]").astype(object)
+    final_df = pd.DataFrame(final_columns, index=df.index[mask])
+
+    day_flags = {col: columns[col][mask] for col in [PortfolioColumns.NIP.value, PortfolioColumns.PERF_RESET.value]}
+    diagnostics = _build_diagnostics(day_flags, effective_period_start, policy_diagnostics, reset_events)
+    if not _needs_cumulative_pass(config):
+        # Matches the pandas path, which skips the reset pass for such projections.
+        diagnostics["reset_days"] = None
+    if config.lean_memory:
+        diagnostics["memory"] = {"peak_frame_bytes": max(peak_frame_bytes, _frame_bytes(final_df))}
+    return final_df, diagnostics
+
+
+def _needs_cumulative_pass(config: EngineConfig) -> bool:
+    """Whether a run reads anything derived from the cumulative pass: its columns or reset events."""
+    if config.output_columns is None or config.emit_reset_events:
+        return True
+    return any(col in _CUMULATIVE_COLUMNS or col.endswith("_cum_ror") for col in config.output_columns)
+
+
+def _build_diagnostics(
+    final_df: pd.DataFrame | Mapping[str, np.ndarray],
+    effective_period_start: date,
+    policy_diagnostics: Dict,
+    reset_events: List[Dict],
+) -> Dict:
+    """Summarizes a run: NIP and reset day counts over the reporting period plus policy notes."""
+    return {
+        "nip_days": int(final_df[PortfolioColumns.NIP.value].sum()),
+        "reset_days": int(final_df[PortfolioColumns.PERF_RESET.value].sum()),
+        "effective_period_start": effective_period_start,
+        "notes": policy_diagnostics.get("notes", []),
+        "resets": reset_events,
+        "policy": policy_diagnostics.get("policy"),
+        "samples": policy_diagnostics.get("samples"),
+    }
+
+
+def _prepend_checkpoint_row(df: pd.DataFrame, checkpoint: EngineCheckpoint, config: EngineConfig) -> pd.DataFrame:
+    """Puts the checkpoint's pending day in front of the appended days so it is re-evaluated with them."""
+    if checkpoint.precision_mode != config.precision_mode:
+        raise InvalidEngineInputError("Checkpoint precision_mode does not match the engine configuration.")
+    if checkpoint.period_type != config.period_type:
+        raise InvalidEngineInputError("Checkpoint period_type does not match the engine configuration.")
+    if PortfolioColumns.PORTFOLIO_ID.value in df.columns:
+        raise InvalidEngineInputError("Checkpoints resume a single series; batch input is not supported.")
+
+    pending_row = dict(checkpoint.pending_row)
+    pending_row[PortfolioColumns.PERF_DATE.value] = pd.Timestamp(pending_row[PortfolioColumns.PERF_DATE.value])
+    # 1Y/3Y/5Y periods start relative to report_end_date and EXPLICIT ones at report_start_date,
+    # so moving those dates changes the period the carried cumulative returns were compounded over.
+    period_start = get_effective_period_start_dates(pd.Series([pending_row[PortfolioColumns.PERF_DATE.value]]), config)
+    if period_start.iloc[0].date() != checkpoint.period_start:
+        raise InvalidEngineInputError(
+            f"Checkpoint was taken for a {checkpoint.period_type.value} period starting {checkpoint.period_start}, "
+            f"but this configuration starts it on {period_start.iloc[0].date()}; recalculate the full history."
+        )
+    new_rows = df.copy()
+    new_rows[PortfolioColumns.PERF_DATE.value] = pd.to_datetime(
+        new_rows[PortfolioColumns.PERF_DATE.value], errors="coerce"
+    )
+    return pd.concat([pd.DataFrame([pending_row]), new_rows], ignore_index=True)
+
+
+def _reset_reason_bitmask(df: pd.DataFrame | Mapping[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Masks the reset rows and encodes their NCTRL flags as a bitmask (bit i set for NCTRL_{i+1}).
+    Returns the reset row positions and their bitmasks as columnar arrays.
+    """
+    reset_positions = np.flatnonzero(np.asarray(df[PortfolioColumns.PERF_RESET.value]) == 1)
+    bitmask = np.zeros(len(reset_positions), dtype=np.int8)
+    for bit, flag in enumerate(_RESET_REASON_FLAGS):
+        bitmask |= (np.asarray(df[flag.value])[reset_positions] != 0).astype(np.int8) << bit
+    return reset_positions, bitmask
+
+
+def _extract_reset_events(df: pd.DataFrame | Mapping[str, np.ndarray]) -> List[Dict]:
+    """
+    Builds the reset event list (date and NCTRL reason codes) from the flagged reset rows of a
+    frame or of a mapping of column arrays.
+    """
+    reset_positions, bitmask = _reset_reason_bitmask(df)
+    if not len(reset_positions):
+        return []
+    dates = np.asarray(df[PortfolioColumns.PERF_DATE.value])[reset_positions].astype("datetime64[D]").tolist()
+    reasons = _RESET_REASONS[bitmask].tolist()
+    return [{"date": day, "reason": reason, "impacted_rows": 1} for day, reason in zip(dates, reasons)]
+
+
 def _prepare_dataframe(df: pd.DataFrame, config: EngineConfig):
     """Initializes and prepares the DataFrame for calculation, handling precision mode."""
     numeric_cols = [
@@ -117,7 +306,7 @@ def _prepare_dataframe(df: pd.DataFrame, config: EngineConfig):
     if config.precision_mode == PrecisionMode.DECIMAL_STRICT:
         for col in numeric_cols:
             if col in df.columns:
-                df[col] = df[col].apply(lambda x: Decimal(str(x)) if pd.notna(x) else Decimal(0))
+                df[col] = to_decimal_series(df[col])
     else:
         for col in numeric_cols:
             if col in df.columns:
@@ -131,6 +320,9 @@ def _prepare_dataframe(df: pd.DataFrame, config: EngineConfig):
         if col.value not in df.columns and col.value not in [
             PortfolioColumns.LONG_SHORT.value,
             PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value,
+            PortfolioColumns.PORTFOLIO_ID.value,
+            PortfolioColumns.TEMP_LONG_CUM_ROR.value,
+            PortfolioColumns.TEMP_SHORT_CUM_ROR.value,
         ]:
             df[col.value] = Decimal(0) if config.precision_mode == PrecisionMode.DECIMAL_STRICT else 0.0
     # --- START FIX: Initialize PERF_RESET earlier ---
@@ -139,8 +331,11 @@ def _prepare_dataframe(df: pd.DataFrame, config: EngineConfig):
     df[PortfolioColumns.LONG_SHORT.value] = ""
 
 
-def _filter_results_to_reporting_period(df: pd.DataFrame, config: EngineConfig) -> pd.DataFrame:
-    """Filters the DataFrame to only include dates within the reporting period."""
+def _filter_results_to_reporting_period(df: pd.DataFrame, config: EngineConfig, copy: bool = True) -> pd.DataFrame:
+    """
+    Filters the DataFrame to only include dates within the reporting period. With `copy=False` the
+    working frame itself is returned when every row is in the period, and is otherwise taken once.
+    """
     effective_report_start = pd.to_datetime(config.report_start_date or config.performance_start_date)
     report_end_date = pd.to_datetime(config.report_end_date)
 
@@ -148,12 +343,31 @@ def _filter_results_to_reporting_period(df: pd.DataFrame, config: EngineConfig)
         df[PortfolioColumns.PERF_DATE.value] <= report_end_date
     )
 
-    final_df = df[mask].copy()
+    if copy:
+        final_df = df[mask].copy()
+    elif mask.all():
+        final_df = df
+    else:
+        final_df = df.take(np.flatnonzero(mask.to_numpy()))
     final_df[PortfolioColumns.PERF_DATE.value] = final_df[PortfolioColumns.PERF_DATE.value].dt.date
 
     return final_df
 
 
+def _compact_result_columns(columns: pd.DataFrame | Dict[str, np.ndarray]) -> None:
+    """Narrows the 0/1 flag columns to int8 and stores long/short as a categorical, in place."""
+    for col in _FLAG_COLUMNS:
+        columns[col] = np.asarray(columns[col]).astype(np.int8)
+    columns[PortfolioColumns.LONG_SHORT.value] = pd.Categorical(
+        np.asarray(columns[PortfolioColumns.LONG_SHORT.value]), categories=["L", "N", "S"]
+    )
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    """Shallow memory footprint of a frame: its column buffers and index, not the objects they point to."""
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
 def _round_float_columns(df: pd.DataFrame, precision: int):
     """Rounds float columns to a specified precision to ensure consistency."""
     float_cols = df.select_dtypes(include=["float64"]).columns
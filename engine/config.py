@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 from datetime import date
 from enum import Enum
-from typing import Literal, Optional
+from typing import Literal, Optional, Tuple
 
 from common.enums import PeriodType
 from core.envelope import DataPolicy, FXRequestBlock, HedgingRequestBlock
@@ -44,6 +44,14 @@ class EngineConfig:
     precision_mode: PrecisionMode = PrecisionMode.FLOAT64
     feature_flags: FeatureFlags = field(default_factory=FeatureFlags)
     data_policy: Optional[DataPolicy] = None
+    # When False, reset events are not materialized into the diagnostics.
+    emit_reset_events: bool = True
+    # Single-series FLOAT64 runs up to this many rows use the NumPy array backend (0 disables it).
+    array_backend_max_rows: int = 10_000
+    # Trades result dtypes for memory: int8 flags, categorical long/short, no scratch columns.
+    lean_memory: bool = False
+    # Result columns the caller reads (all when None); see `run_calculations` for the work this skips.
+    output_columns: Optional[Tuple[str, ...]] = None
 
     currency_mode: Optional[Literal["BASE_ONLY", "LOCAL_ONLY", "BOTH"]] = "BASE_ONLY"
     report_ccy: Optional[str] = "USD"
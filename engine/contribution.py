@@ -1,16 +1,28 @@
 # engine/contribution.py
+from dataclasses import replace
 from typing import Dict, Tuple
 
 import numpy as np
 import pandas as pd
 
-from adapters.api_adapter import create_engine_dataframe
+from adapters.api_adapter import create_valuation_dataframe, first_valuation_date
 from app.models.contribution_requests import ContributionRequest, Smoothing
 from common.enums import WeightingScheme
 from engine.compute import run_calculations
 from engine.config import EngineConfig
+from engine.fx import get_fx_rate_index
 from engine.schema import PortfolioColumns
 
+# Position results only feed the daily weights and returns, so their cumulative pass is skipped.
+_POSITION_OUTPUT_COLUMNS = (
+    PortfolioColumns.PERF_DATE.value,
+    PortfolioColumns.BEGIN_MV.value,
+    PortfolioColumns.BOD_CF.value,
+    PortfolioColumns.DAILY_ROR.value,
+    "local_ror",
+    "fx_ror",
+)
+
 
 def _calculate_daily_instrument_contributions(
     instruments_df: pd.DataFrame, portfolio_df: pd.DataFrame, weighting_scheme: WeightingScheme, smoothing: Smoothing
@@ -78,7 +90,7 @@ def _prepare_hierarchical_data(request: ContributionRequest) -> Tuple[pd.DataFra
     """
     Runs TWR calculations and combines all position data and metadata into a single DataFrame.
     """
-    perf_start_date = request.portfolio_data.valuation_points[0].perf_date
+    perf_start_date = first_valuation_date(request.portfolio_data.valuation_points)
     twr_config = EngineConfig(
         performance_start_date=perf_start_date,
         report_start_date=request.report_start_date,
@@ -91,9 +103,10 @@ def _prepare_hierarchical_data(request: ContributionRequest) -> Tuple[pd.DataFra
         report_ccy=request.report_ccy,
         fx=request.fx,
         hedging=request.hedging,
+        emit_reset_events=False,
     )
 
-    portfolio_df = create_engine_dataframe([item.model_dump() for item in request.portfolio_data.valuation_points])
+    portfolio_df = create_valuation_dataframe(request.portfolio_data.valuation_points)
 
     portfolio_twr_config = twr_config
     if twr_config.currency_mode == "BOTH":
@@ -104,6 +117,7 @@ def _prepare_hierarchical_data(request: ContributionRequest) -> Tuple[pd.DataFra
             metric_basis=twr_config.metric_basis,
             period_type=twr_config.period_type,
             currency_mode="BASE_ONLY",
+            emit_reset_events=False,
         )
     portfolio_results_df, portfolio_diags = run_calculations(portfolio_df, portfolio_twr_config)
 
@@ -111,19 +125,17 @@ def _prepare_hierarchical_data(request: ContributionRequest) -> Tuple[pd.DataFra
         portfolio_results_df[PortfolioColumns.PERF_DATE.value]
     )
 
-    fx_rates_df = pd.DataFrame()
-    if request.currency_mode == "BOTH" and request.fx:
-        fx_rates_df = pd.DataFrame([rate.model_dump() for rate in request.fx.rates])
-        fx_rates_df["date"] = pd.to_datetime(fx_rates_df["date"])
-        fx_rates_df.drop_duplicates(subset=["date", "ccy"], keep="last", inplace=True)
+    fx_rate_index = None
+    if request.currency_mode == "BOTH" and request.fx and request.fx.rates:
+        fx_rate_index = get_fx_rate_index(request.fx)
 
     all_positions_data = []
     for position in request.positions_data:
-        position_df = create_engine_dataframe([item.model_dump() for item in position.valuation_points])
+        position_df = create_valuation_dataframe(position.valuation_points)
         if position_df.empty:
             continue
 
-        pos_twr_config = twr_config
+        pos_twr_config = replace(twr_config, output_columns=_POSITION_OUTPUT_COLUMNS)
         position_ccy = position.meta.get("currency")
         if not (request.currency_mode == "BOTH" and position_ccy != request.report_ccy):
             pos_twr_config = EngineConfig(
@@ -133,6 +145,8 @@ def _prepare_hierarchical_data(request: ContributionRequest) -> Tuple[pd.DataFra
                 metric_basis=twr_config.metric_basis,
                 period_type=twr_config.period_type,
                 currency_mode="BASE_ONLY",
+                emit_reset_events=False,
+                output_columns=_POSITION_OUTPUT_COLUMNS,
             )
 
         position_results_df, _ = run_calculations(position_df.copy(), pos_twr_config)
@@ -143,21 +157,14 @@ def _prepare_hierarchical_data(request: ContributionRequest) -> Tuple[pd.DataFra
         for key, value in position.meta.items():
             position_results_df[key] = value
 
-        if request.currency_mode == "BOTH" and position_ccy != request.report_ccy and not fx_rates_df.empty:
-            pos_fx_lookup = fx_rates_df[fx_rates_df["ccy"] == position_ccy][["date", "rate"]].rename(
-                columns={"rate": "fx_rate"}
-            )
-            position_results_df["prior_date"] = position_results_df[PortfolioColumns.PERF_DATE.value] - pd.Timedelta(
-                days=1
-            )
-
-            position_results_df = pd.merge(
-                position_results_df, pos_fx_lookup, left_on="prior_date", right_on="date", how="left"
-            ).ffill()
-
-            if "fx_rate" in position_results_df.columns:
-                for col in [PortfolioColumns.BEGIN_MV.value, PortfolioColumns.BOD_CF.value]:
-                    position_results_df[col] *= position_results_df["fx_rate"]
+        if fx_rate_index is not None and position_ccy != request.report_ccy:
+            # Opening values convert at the rate as of the prior day, carried forward over gaps.
+            prior_dates = position_results_df[PortfolioColumns.PERF_DATE.value].to_numpy(
+                dtype="datetime64[D]"
+            ) - np.timedelta64(1, "D")
+            position_results_df["fx_rate"] = fx_rate_index.asof(prior_dates, ccy=position_ccy)
+            for col in [PortfolioColumns.BEGIN_MV.value, PortfolioColumns.BOD_CF.value]:
+                position_results_df[col] *= position_results_df["fx_rate"]
 
         all_positions_data.append(position_results_df)
 
@@ -0,0 +1,183 @@
+# engine/fastpath.py
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from core.date_dimension import get_date_dimension
+from engine.config import EngineConfig, PrecisionMode
+from engine.exceptions import InvalidEngineInputError
+from engine.periods import get_effective_period_start_array
+from engine.ror import CompoundingPass, compound_float_leg_arrays
+from engine.scan import forward_fill
+from engine.schema import PortfolioColumns
+
+_MONEY_COLUMNS = [
+    PortfolioColumns.BEGIN_MV.value,
+    PortfolioColumns.BOD_CF.value,
+    PortfolioColumns.EOD_CF.value,
+    PortfolioColumns.MGMT_FEES.value,
+    PortfolioColumns.END_MV.value,
+]
+_INPUT_COLUMNS = [PortfolioColumns.DAY.value, PortfolioColumns.PERF_DATE.value] + _MONEY_COLUMNS
+# Columns the pandas pipeline derives itself; frames that already carry one take that path.
+_DERIVED_COLUMNS = {col.value for col in PortfolioColumns if col.value not in _INPUT_COLUMNS} | {"local_ror", "fx_ror"}
+
+
+def supports_array_backend(df: pd.DataFrame, config: EngineConfig) -> bool:
+    """
+    Whether a run can use the array backend: a single FLOAT64 series in base currency, without
+    data policies, small enough (see `EngineConfig.array_backend_max_rows`) for pandas' per-call
+    overhead to dominate, and holding plain float64 amounts.
+    """
+    if len(df) > config.array_backend_max_rows or config.precision_mode != PrecisionMode.FLOAT64:
+        return False
+    if config.data_policy or (config.currency_mode and config.currency_mode != "BASE_ONLY" and config.fx):
+        return False
+    if PortfolioColumns.PERF_DATE.value not in df.columns or not df.columns.is_unique:
+        return False
+    if any(col in _DERIVED_COLUMNS for col in df.columns):
+        return False
+    if any(col in df.columns and df[col].dtype != np.float64 for col in _MONEY_COLUMNS):
+        return False
+    if PortfolioColumns.DAY.value in df.columns and df[PortfolioColumns.DAY.value].dtype.kind not in "iuf":
+        return False
+    return all(isinstance(dtype, np.dtype) for dtype in df.dtypes)
+
+
+def calculate_array_columns(df: pd.DataFrame, config: EngineConfig) -> Dict[str, np.ndarray]:
+    """
+    Runs the TWR pipeline on plain NumPy arrays for a frame accepted by `supports_array_backend`.
+
+    Returns every output column over all input rows, keyed and ordered exactly as the pandas
+    pipeline leaves its working frame, with bit-identical values.
+    """
+    columns = {col: df[col].to_numpy() for col in df.columns}
+    n_rows = len(df)
+
+    for col in [PortfolioColumns.DAY.value] + _MONEY_COLUMNS:
+        values = columns.get(col)
+        if values is None:
+            continue
+        if values.dtype.kind == "f":
+            values = np.where(np.isnan(values), 0.0, values)
+        columns[col] = values
+
+    perf_dates = pd.to_datetime(df[PortfolioColumns.PERF_DATE.value], errors="coerce").to_numpy(dtype="datetime64[ns]")
+    if np.isnat(perf_dates).any():
+        raise InvalidEngineInputError("One or more 'perf_date' values are invalid or missing.")
+    columns[PortfolioColumns.PERF_DATE.value] = perf_dates
+
+    zeros = np.zeros(n_rows, dtype=np.float64)
+    for col in PortfolioColumns:
+        if col.value not in columns and col.value not in [
+            PortfolioColumns.LONG_SHORT.value,
+            PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value,
+            PortfolioColumns.PORTFOLIO_ID.value,
+            PortfolioColumns.TEMP_LONG_CUM_ROR.value,
+            PortfolioColumns.TEMP_SHORT_CUM_ROR.value,
+        ]:
+            columns[col.value] = zeros
+
+    begin_mv = columns[PortfolioColumns.BEGIN_MV.value]
+    bod_cf = columns[PortfolioColumns.BOD_CF.value]
+    eod_cf = columns[PortfolioColumns.EOD_CF.value]
+    end_mv = columns[PortfolioColumns.END_MV.value]
+
+    effective_starts = get_effective_period_start_array(perf_dates, config)
+
+    # Daily RoR (see `calculate_daily_ror`)
+    numerator = end_mv - bod_cf - begin_mv - eod_cf
+    if config.metric_basis == "NET":
+        numerator += columns[PortfolioColumns.MGMT_FEES.value]
+    denominator = np.abs(begin_mv + bod_cf)
+    local_ror = np.zeros(n_rows, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(numerator, denominator, out=local_ror, where=(denominator != 0.0) & (perf_dates >= effective_starts))
+    daily_ror = local_ror * 100.0
+
+    # Sign (see `calculate_sign`): the sign of the capital base, re-evaluated on every flip event.
+    initial_sign = np.sign(begin_mv + bod_cf)
+    prev_eod_cf = _shift(eod_cf, 0.0)
+    is_flip_event = (bod_cf != 0.0) | (prev_eod_cf != 0.0)
+    is_flip_event[0] = True
+    last_flip = np.maximum.accumulate(np.where(is_flip_event, np.arange(n_rows), 0))
+    sign = initial_sign[last_flip]
+    sign = np.where(np.isnan(sign), 0.0, sign).astype(int)
+
+    # NIP (see `calculate_nip`)
+    if config.feature_flags.use_nip_v2_rule:
+        is_nip = (begin_mv + bod_cf == 0.0) & (end_mv + eod_cf == 0.0)
+    else:
+        is_nip = (begin_mv + bod_cf + end_mv + eod_cf == 0.0) & (eod_cf == -np.sign(bod_cf))
+
+    # Cumulative returns (see `calculate_cumulative_ror`)
+    series_starts = np.zeros(n_rows, dtype=bool)
+    series_starts[0] = True
+    temp_block_starts = series_starts.copy()
+    temp_block_starts[1:] |= effective_starts[1:] != effective_starts[:-1]
+    temp_legs, temp_growth = compound_float_leg_arrays(sign, [daily_ror], temp_block_starts, series_starts)
+    temp_long, temp_short = temp_legs[:, 0], temp_legs[:, 1]
+
+    # Initial resets (see `calculate_initial_resets`)
+    is_month_end = get_date_dimension().month_end(perf_dates)
+    next_date_is_after_end = np.append(perf_dates[1:] > np.datetime64(config.report_end_date, "ns"), True)
+    cond_common = (
+        (bod_cf != 0.0) | (np.append(bod_cf[1:], 0.0) != 0.0) | (eod_cf != 0.0) | is_month_end | next_date_is_after_end
+    )
+    nctrl1, nctrl2, nctrl3 = (
+        cond & ~_shift(cond, False) & cond_common
+        for cond in (temp_long < -100, temp_short > 100, (temp_short < -100) & (temp_long != 0))
+    )
+    initial_resets = nctrl1 | nctrl2 | nctrl3
+
+    if initial_resets[:-1].any():
+        block_starts = temp_block_starts.copy()
+        block_starts[1:] |= initial_resets[:-1]
+        previous = CompoundingPass(growth=temp_growth, block_starts=temp_block_starts)
+        legs, _ = compound_float_leg_arrays(sign, [daily_ror], block_starts, series_starts, previous=previous)
+    else:
+        legs = temp_legs.copy()
+    long_cum_ror, short_cum_ror = legs[:, 0], legs[:, 1]
+    long_cum_ror[initial_resets] = 0.0
+    short_cum_ror[initial_resets] = 0.0
+
+    # NCTRL 4 (see `calculate_nctrl4_reset`)
+    nctrl4 = ((_shift(long_cum_ror, 0.0) <= -100.0) | (_shift(short_cum_ror, 0.0) >= 100.0)) & (
+        (bod_cf != 0.0) | (prev_eod_cf != 0.0)
+    )
+    perf_reset = initial_resets | nctrl4
+    long_cum_ror[perf_reset] = 0.0
+    short_cum_ror[perf_reset] = 0.0
+
+    # NIP days carry the previous day's cumulative returns forward.
+    if is_nip.any():
+        long_cum_ror = forward_fill(long_cum_ror, ~is_nip)
+        short_cum_ror = forward_fill(short_cum_ror, ~is_nip)
+    final_cum_ror = ((1.0 + long_cum_ror / 100.0) * (1.0 + short_cum_ror / 100.0) - 1.0) * 100.0
+
+    columns.update(
+        {
+            PortfolioColumns.SIGN.value: sign,
+            PortfolioColumns.DAILY_ROR.value: daily_ror,
+            PortfolioColumns.NIP.value: is_nip.astype(int),
+            PortfolioColumns.PERF_RESET.value: perf_reset.astype(int),
+            PortfolioColumns.NCTRL_1.value: nctrl1.astype(int),
+            PortfolioColumns.NCTRL_2.value: nctrl2.astype(int),
+            PortfolioColumns.NCTRL_3.value: nctrl3.astype(int),
+            PortfolioColumns.NCTRL_4.value: nctrl4.astype(int),
+            PortfolioColumns.LONG_CUM_ROR.value: long_cum_ror,
+            PortfolioColumns.SHORT_CUM_ROR.value: short_cum_ror,
+            PortfolioColumns.FINAL_CUM_ROR.value: final_cum_ror,
+            PortfolioColumns.LONG_SHORT.value: np.select([sign == -1, sign == 1], ["S", "L"], default="N").astype(
+                object
+            ),
+            PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value: effective_starts,
+        }
+    )
+    return columns
+
+
+def _shift(values: np.ndarray, fill_value) -> np.ndarray:
+    """Shifts values down by one row, filling the first row."""
+    return np.concatenate(([fill_value], values[:-1])).astype(values.dtype, copy=False)
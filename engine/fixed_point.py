@@ -0,0 +1,55 @@
+# engine/fixed_point.py
+from decimal import Decimal
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.precision_policy import INPUT_MAX_SCALE
+
+# Largest integer magnitude whose float64 representation is exact; beyond it scaled units are ambiguous.
+_MAX_EXACT_UNITS = 2**53
+
+
+def to_scaled_units(values: np.ndarray) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Converts a numeric array into exact int64 units at the smallest decimal scale that represents
+    every value, bounded by the money input scale of the precision policy.
+    Returns None when the values cannot be represented exactly (too many decimals or too large).
+    """
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64), 0
+    if values.dtype.kind != "f":
+        return None
+
+    float_values = values.astype(np.float64)
+    finite_values = np.where(np.isnan(float_values), 0.0, float_values)
+    if not np.isfinite(finite_values).all():
+        return None
+
+    for scale in range(INPUT_MAX_SCALE["money"] + 1):
+        units = np.rint(finite_values * 10.0**scale)
+        if np.abs(units).max(initial=0.0) >= _MAX_EXACT_UNITS:
+            return None
+        if np.array_equal(units / 10.0**scale, finite_values):
+            return units.astype(np.int64), scale
+    return None
+
+
+def to_decimal_series(series: pd.Series) -> pd.Series:
+    """
+    Converts a column to `Decimal` values (missing values become zero), matching `Decimal(str(x))`
+    exactly. Numeric columns go through exact scaled int64 units instead of a per-value string
+    round trip.
+    """
+    scaled = to_scaled_units(series.to_numpy())
+    if scaled is None:
+        return series.apply(lambda x: Decimal(str(x)) if pd.notna(x) else Decimal(0))
+
+    units, scale = scaled
+    return pd.Series([Decimal(unit).scaleb(-scale) for unit in units.tolist()], index=series.index, dtype=object)
+
+
+def decimal_sign(values: pd.Series) -> pd.Series:
+    """Vectorized sign (-1, 0, 1) of a `Decimal` column without per-element Python callbacks."""
+    return pd.Series(np.sign(values.to_numpy()).astype(int), index=values.index)
@@ -0,0 +1,90 @@
+# engine/fx.py
+import threading
+import weakref
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.envelope import FXRate, FXRequestBlock
+
+
+class FxRateIndex:
+    """
+    Per-currency sorted date/rate arrays with vectorized as-of lookups.
+
+    An as-of lookup returns, for every requested date, the latest rate dated on or before it,
+    i.e. the rate series forward-filled over calendar days. Duplicate (date, ccy) entries keep
+    the last one supplied, matching how client-supplied rates were previously de-duplicated.
+    """
+
+    def __init__(self, series: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        self._series = series
+
+    @classmethod
+    def from_rates(cls, rates: Iterable[FXRate]) -> "FxRateIndex":
+        by_ccy: Dict[str, Dict[np.datetime64, object]] = {}
+        for rate in rates:
+            by_ccy.setdefault(rate.ccy, {})[np.datetime64(rate.date, "D")] = rate.rate
+
+        series = {}
+        for ccy, points in by_ccy.items():
+            dates = np.array(list(points.keys()), dtype="datetime64[D]")
+            values = np.array(list(points.values()), dtype=np.float64)
+            order = np.argsort(dates, kind="stable")
+            series[ccy] = (dates[order], values[order])
+        return cls(series)
+
+    @property
+    def currencies(self) -> list:
+        return list(self._series)
+
+    def asof(
+        self, dates: pd.Series | np.ndarray, ccy: Optional[str] = None, not_before: Optional[np.datetime64] = None
+    ) -> np.ndarray:
+        """
+        Vectorized as-of lookup of `dates` for one currency; NaN where no rate is available.
+        `ccy` may be omitted when the index holds a single currency. Rates dated before
+        `not_before` are ignored.
+        """
+        lookup_dates = np.asarray(dates, dtype="datetime64[D]")
+        result = np.full(lookup_dates.shape, np.nan)
+        if ccy is None:
+            if len(self._series) > 1:
+                raise ValueError(f"FX rates cover several currencies {self.currencies}; a currency must be given.")
+            if not self._series:
+                return result
+            ccy = next(iter(self._series))
+        if ccy not in self._series:
+            return result
+
+        rate_dates, rate_values = self._series[ccy]
+        if not_before is not None:
+            first = np.searchsorted(rate_dates, np.datetime64(not_before, "D"), side="left")
+            rate_dates, rate_values = rate_dates[first:], rate_values[first:]
+
+        positions = np.searchsorted(rate_dates, lookup_dates, side="right") - 1
+        found = positions >= 0
+        result[found] = rate_values[positions[found]]
+        return result
+
+
+_index_cache: Dict[int, FxRateIndex] = {}
+_index_cache_lock = threading.Lock()
+
+
+def get_fx_rate_index(fx: FXRequestBlock) -> FxRateIndex:
+    """
+    Returns the rate index for an FX block, building it once per block object. Every position of a
+    contribution or attribution request shares the same block, so the index is built once per request
+    and released together with the block.
+    """
+    key = id(fx)
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+    if index is None:
+        index = FxRateIndex.from_rates(fx.rates)
+        with _index_cache_lock:
+            _index_cache[key] = index
+        weakref.finalize(fx, _index_cache.pop, key, None)
+    return index
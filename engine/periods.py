@@ -1,43 +1,51 @@
 # engine/periods.py
+import numpy as np
 import pandas as pd
 
 from common.enums import PeriodType
+from core.date_dimension import get_date_dimension
 from engine.config import EngineConfig
 
+_CALENDAR_PERIOD_FREQS = {PeriodType.YTD: "Y", PeriodType.MTD: "M", PeriodType.QTD: "Q"}
+
 
 def get_effective_period_start_dates(perf_dates_dt: pd.Series, config: EngineConfig) -> pd.Series:
     """
     Vectorized calculation of the effective period start date for each row.
     Returns a Series with dtype=datetime64[ns].
     """
-    if config.period_type == PeriodType.YTD:
-        effective_starts = perf_dates_dt.dt.to_period("Y").dt.start_time
-    elif config.period_type == PeriodType.MTD:
-        effective_starts = perf_dates_dt.dt.to_period("M").dt.start_time
-    elif config.period_type == PeriodType.QTD:
-        effective_starts = perf_dates_dt.dt.to_period("Q").dt.start_time
-    elif config.period_type == PeriodType.EXPLICIT:
+    if config.period_type not in _CALENDAR_PERIOD_FREQS:
+        return pd.Series(_fixed_period_start(config), index=perf_dates_dt.index, name=perf_dates_dt.name).astype(
+            "datetime64[ns]"
+        )
+
+    return pd.Series(
+        get_effective_period_start_array(perf_dates_dt.to_numpy(), config),
+        index=perf_dates_dt.index,
+        name=perf_dates_dt.name,
+    )
+
+
+def get_effective_period_start_array(perf_dates: np.ndarray, config: EngineConfig) -> np.ndarray:
+    """Array counterpart of `get_effective_period_start_dates` for datetime64[ns] inputs."""
+    if config.period_type not in _CALENDAR_PERIOD_FREQS:
+        return np.full(perf_dates.shape, _fixed_period_start(config).to_datetime64(), dtype="datetime64[ns]")
+
+    period_starts = get_date_dimension().period_start(perf_dates, _CALENDAR_PERIOD_FREQS[config.period_type])
+    perf_start_day = np.datetime64(config.performance_start_date, "D")
+    return np.maximum(period_starts, perf_start_day).astype("datetime64[ns]")
+
+
+def _fixed_period_start(config: EngineConfig) -> pd.Timestamp:
+    """The single period start shared by every row for non-calendar period types."""
+    if config.period_type == PeriodType.EXPLICIT:
         explicit_start = max(
             config.performance_start_date,
             config.report_start_date or config.performance_start_date,
         )
-        return pd.Series(pd.to_datetime(explicit_start), index=perf_dates_dt.index, name=perf_dates_dt.name).astype(
-            "datetime64[ns]"
-        )
-    elif config.period_type in [PeriodType.ONE_YEAR, PeriodType.THREE_YEARS, PeriodType.FIVE_YEARS]:
+        return pd.to_datetime(explicit_start)
+    if config.period_type in [PeriodType.ONE_YEAR, PeriodType.THREE_YEARS, PeriodType.FIVE_YEARS]:
         years = int(config.period_type.value[:-1])
-        start_date = pd.to_datetime(config.report_end_date) - pd.DateOffset(years=years) + pd.Timedelta(days=1)
-        return pd.Series(start_date, index=perf_dates_dt.index, name=perf_dates_dt.name).astype("datetime64[ns]")
-    elif config.period_type == PeriodType.ITD:
-        return pd.Series(
-            pd.to_datetime(config.performance_start_date), index=perf_dates_dt.index, name=perf_dates_dt.name
-        ).astype("datetime64[ns]")
-    else:
-        # Fallback case, though validation should prevent this.
-        return pd.Series(
-            pd.to_datetime(config.performance_start_date), index=perf_dates_dt.index, name=perf_dates_dt.name
-        ).astype("datetime64[ns]")
-
-    perf_start_dt = pd.to_datetime(config.performance_start_date)
-
-    return effective_starts.where(effective_starts >= perf_start_dt, perf_start_dt).astype("datetime64[ns]")
+        return pd.to_datetime(config.report_end_date) - pd.DateOffset(years=years) + pd.Timedelta(days=1)
+    # ITD, and the fallback case, though validation should prevent other values.
+    return pd.to_datetime(config.performance_start_date)
@@ -1,45 +1,93 @@
 # engine/policies.py
 import logging
+from decimal import Decimal
 from typing import Dict, Tuple
 
 import numpy as np
 import pandas as pd
 from pydantic import BaseModel
 
+from engine.fixed_point import to_decimal_series
+from engine.scan import forward_fill, rolling_median
 from engine.schema import PortfolioColumns
 
 logger = logging.getLogger(__name__)
 
+# Outlier samples reported in diagnostics unless the policy's `max_samples` param says otherwise.
+DEFAULT_MAX_OUTLIER_SAMPLES = 100
+
+
+def _match_dates(perf_dates: np.ndarray, order: np.ndarray, dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Joins requested dates against the frame's sorted date index. Returns, for every matching
+    (request, row) pair, the request position and the row position, in request order.
+    """
+    sorted_dates = perf_dates[order]
+    lo = np.searchsorted(sorted_dates, dates, side="left")
+    counts = np.searchsorted(sorted_dates, dates, side="right") - lo
+    requests = np.repeat(np.arange(len(dates)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return requests, order[np.repeat(lo, counts) + offsets]
+
+
+def _scatter(column: pd.Series, rows: np.ndarray, values: list) -> np.ndarray:
+    """Writes `values` into a copy of `column` at `rows`; on repeated rows the last value wins."""
+    last = len(rows) - 1 - np.unique(rows[::-1], return_index=True)[1]
+    rows = rows[last]
+    if column.dtype == object:
+        new_values = to_decimal_series(pd.Series([values[i] for i in last])).to_numpy()
+        result = column.to_numpy(copy=True)
+    else:
+        new_values = np.asarray([values[i] for i in last], dtype=np.float64)
+        result = column.to_numpy(dtype=np.result_type(column.dtype, new_values), copy=True)
+    result[rows] = new_values
+    return result
+
 
 def _apply_overrides(df: pd.DataFrame, overrides: Dict, diagnostics: Dict) -> pd.DataFrame:
-    """Applies user-provided market value and cash flow overrides in-memory."""
+    """
+    Applies user-provided market value and cash flow overrides in-memory. All overrides are joined
+    against the frame's dates at once; when several overrides hit the same row, the last one wins.
+    """
     if not overrides:
         return df
 
-    df_copy = df.copy()
     mv_overrides = overrides.get("market_values", [])
     cf_overrides = overrides.get("cash_flows", [])
+    if not mv_overrides and not cf_overrides:
+        return df
 
-    for override in mv_overrides:
-        mask = df_copy[PortfolioColumns.PERF_DATE.value] == pd.to_datetime(override["perf_date"])
-        # In a multi-position context, we would also filter by position_id
-        if "position_id" in override:
-            if "position_id" in df_copy.columns:
-                mask &= df_copy["position_id"] == override["position_id"]
-
-        if not df_copy.loc[mask].empty:
-            for key in ["begin_mv", "end_mv"]:
-                if key in override:
-                    df_copy.loc[mask, key] = override[key]
-                    diagnostics["policy"]["overrides"]["applied_mv_count"] += 1
-
-    for override in cf_overrides:
-        mask = df_copy[PortfolioColumns.PERF_DATE.value] == pd.to_datetime(override["perf_date"])
-        if not df_copy.loc[mask].empty:
-            for key in ["bod_cf", "eod_cf"]:
-                if key in override:
-                    df_copy.loc[mask, key] = override[key]
-                    diagnostics["policy"]["overrides"]["applied_cf_count"] += 1
+    perf_dates = pd.to_datetime(df[PortfolioColumns.PERF_DATE.value]).to_numpy(dtype="datetime64[ns]")
+    order = np.argsort(perf_dates, kind="stable")
+    df = df.copy(deep=False)
+
+    for override_list, keys, counter in [
+        (mv_overrides, [PortfolioColumns.BEGIN_MV.value, PortfolioColumns.END_MV.value], "applied_mv_count"),
+        (cf_overrides, [PortfolioColumns.BOD_CF.value, PortfolioColumns.EOD_CF.value], "applied_cf_count"),
+    ]:
+        if not override_list:
+            continue
+        override_dates = pd.to_datetime([override["perf_date"] for override in override_list]).to_numpy(
+            dtype="datetime64[ns]"
+        )
+        requests, rows = _match_dates(perf_dates, order, override_dates)
+
+        # In a multi-position context, market value overrides are also filtered by position_id
+        if counter == "applied_mv_count" and "position_id" in df.columns:
+            override_positions = np.array([override.get("position_id") for override in override_list], dtype=object)
+            wanted = override_positions[requests]
+            keep = pd.isna(wanted) | (df["position_id"].to_numpy()[rows] == wanted)
+            requests, rows = requests[keep], rows[keep]
+
+        matched = np.zeros(len(override_list), dtype=bool)
+        matched[requests] = True
+        for key in keys:
+            has_key = np.array([key in override for override in override_list])
+            diagnostics["policy"]["overrides"][counter] += int((matched & has_key).sum())
+            selected = has_key[requests]
+            if selected.any():
+                values = [override_list[i][key] for i in requests[selected]]
+                df[key] = _scatter(df[key], rows[selected], values)
 
     if (
         diagnostics["policy"]["overrides"]["applied_mv_count"] > 0
@@ -47,43 +95,55 @@ def _apply_overrides(df: pd.DataFrame, overrides: Dict, diagnostics: Dict) -> pd
     ):
         diagnostics["notes"].append("Applied overrides from the data_policy request.")
 
-    return df_copy
+    return df
 
 
 def _apply_ignore_days(df: pd.DataFrame, ignore_days: list, diagnostics: Dict) -> pd.DataFrame:
-    """Applies policy to ignore specified days by carrying forward previous day's state."""
+    """
+    Applies policy to ignore specified days by carrying forward previous day's state. The frame is
+    returned sorted by date; an ignored day takes the closing value of the nearest earlier day that
+    is not ignored, so runs of consecutive ignored days all carry the same value forward.
+    """
     if not ignore_days:
         return df
 
-    df_copy = df.copy()
-    # Ensure DataFrame is sorted by date for correct forward-fill logic
-    df_copy.sort_values(by=PortfolioColumns.PERF_DATE.value, inplace=True)
-    df_copy.set_index(PortfolioColumns.PERF_DATE.value, inplace=True)
-
-    for item in ignore_days:
-        dates_to_ignore = pd.to_datetime(item["dates"])
-        for date in dates_to_ignore:
-            if date in df_copy.index:
-                loc = df_copy.index.get_loc(date)
-                if loc > 0:
-                    prev_day = df_copy.iloc[loc - 1]
-                    df_copy.loc[date, PortfolioColumns.BEGIN_MV.value] = prev_day[PortfolioColumns.END_MV.value]
-                    df_copy.loc[date, PortfolioColumns.END_MV.value] = prev_day[PortfolioColumns.END_MV.value]
-                    df_copy.loc[date, PortfolioColumns.BOD_CF.value] = 0.0
-                    df_copy.loc[date, PortfolioColumns.EOD_CF.value] = 0.0
-                    df_copy.loc[date, PortfolioColumns.MGMT_FEES.value] = 0.0
-                    diagnostics["policy"]["ignored_days_count"] += 1
+    perf_dates = pd.to_datetime(df[PortfolioColumns.PERF_DATE.value]).to_numpy(dtype="datetime64[ns]")
+    order = np.argsort(perf_dates, kind="stable")
+    # Sort by date for the carry-forward, moving perf_date to the front as the date index did before.
+    columns = [PortfolioColumns.PERF_DATE.value] + [c for c in df.columns if c != PortfolioColumns.PERF_DATE.value]
+    df = df.take(order)[columns].reset_index(drop=True)
+    perf_dates = perf_dates[order]
+
+    ignore_dates = pd.to_datetime([d for item in ignore_days for d in item["dates"]]).to_numpy(dtype="datetime64[ns]")
+    _, rows = _match_dates(perf_dates, np.arange(len(df)), ignore_dates)
+    # The first day has no previous state to carry forward.
+    rows = rows[rows > 0]
+    if len(rows):
+        diagnostics["policy"]["ignored_days_count"] += len(rows)
+        is_ignored = np.zeros(len(df), dtype=bool)
+        is_ignored[rows] = True
+        source_rows = np.maximum.accumulate(np.where(is_ignored, 0, np.arange(len(df))))
+        end_mv = df[PortfolioColumns.END_MV.value].to_numpy()
+        carried = np.where(is_ignored, end_mv[source_rows], end_mv)
+        df[PortfolioColumns.BEGIN_MV.value] = np.where(is_ignored, carried, df[PortfolioColumns.BEGIN_MV.value])
+        df[PortfolioColumns.END_MV.value] = carried
+        for col in [PortfolioColumns.BOD_CF.value, PortfolioColumns.EOD_CF.value, PortfolioColumns.MGMT_FEES.value]:
+            zero = Decimal(0) if df[col].dtype == object else 0.0
+            df[col] = np.where(is_ignored, zero, df[col])
 
     if diagnostics["policy"]["ignored_days_count"] > 0:
         diagnostics["notes"].append(
             f"Ignored {diagnostics['policy']['ignored_days_count']} day(s) as specified in data_policy."
         )
 
-    return df_copy.reset_index()
+    return df
 
 
 def _flag_outliers(df: pd.DataFrame, data_policy_model: BaseModel | None, diagnostics: Dict) -> None:
-    """Detects and flags outliers, excluding ignored days from statistical analysis."""
+    """
+    Detects and flags outliers, excluding ignored days from statistical analysis. At most
+    `max_samples` of the flagged rows are reported as samples; `flagged_rows` counts all of them.
+    """
     if not data_policy_model or not data_policy_model.outliers or not data_policy_model.outliers.enabled:
         return
 
@@ -91,49 +151,51 @@ def _flag_outliers(df: pd.DataFrame, data_policy_model: BaseModel | None, diagno
     if outlier_policy.get("action") != "FLAG":
         return
 
-    window = outlier_policy.get("params", {}).get("window", 63)
+    window = int(outlier_policy.get("params", {}).get("window", 63))
     mad_k = outlier_policy.get("params", {}).get("mad_k", 5.0)
+    max_samples = int(outlier_policy.get("params", {}).get("max_samples", DEFAULT_MAX_OUTLIER_SAMPLES))
 
     if PortfolioColumns.DAILY_ROR.value not in df.columns:
         return
 
+    # Statistics run on floats in every precision mode; they only decide which rows to flag.
+    ror = df[PortfolioColumns.DAILY_ROR.value].to_numpy(dtype=np.float64)
+    perf_dates = df[PortfolioColumns.PERF_DATE.value].to_numpy(dtype="datetime64[D]")
+
     # Exclude ignored days from the statistical calculation
-    ror_series = df[PortfolioColumns.DAILY_ROR.value]
-    ror_for_stats = ror_series.copy()
+    valid_mask = np.ones(len(df), dtype=bool)
     if data_policy_model.ignore_days:
-        ignored_dates = {d for item in data_policy_model.ignore_days for d in item.dates}
-        valid_mask = ~df[PortfolioColumns.PERF_DATE.value].dt.date.isin(ignored_dates)
-        ror_for_stats = ror_for_stats.where(valid_mask)  # Use .where to keep index alignment
-
-    median = ror_for_stats.rolling(window=window, min_periods=1).median().ffill()
-    mad = (ror_for_stats - median).abs().rolling(window=window, min_periods=1).median().ffill()
+        ignored_dates = np.array(
+            [d for item in data_policy_model.ignore_days for d in item.dates], dtype="datetime64[D]"
+        )
+        valid_mask = ~np.isin(perf_dates, ignored_dates)
+    ror_for_stats = np.where(valid_mask, ror, np.nan)
 
-    mad.replace(0, np.nan, inplace=True)
-    mad.ffill(inplace=True)
-    mad.fillna(1e-9, inplace=True)
+    median = rolling_median(ror_for_stats, window)
+    median = forward_fill(median, ~np.isnan(median), fill_value=np.nan)
+    mad = rolling_median(np.abs(ror_for_stats - median), window)
+    mad = forward_fill(mad, ~np.isnan(mad) & (mad != 0), fill_value=1e-9)
 
     upper_bound = median + mad_k * mad
     lower_bound = median - mad_k * mad
 
-    # Flag outliers based on the original full series
-    outliers = (ror_series > upper_bound) | (ror_series < lower_bound)
-    # But only flag if the day was not ignored
-    if data_policy_model.ignore_days:
-        outliers &= valid_mask
-
-    diagnostics["policy"]["outliers"]["flagged_rows"] = int(outliers.sum())
-
-    if int(outliers.sum()) > 0:
-        outlier_indices = df.index[outliers]
-        for index in outlier_indices:
-            sample = df.loc[index]
-            diagnostics["samples"]["outliers"].append(
-                {
-                    "date": sample[PortfolioColumns.PERF_DATE.value].strftime("%Y-%m-%d"),
-                    "raw_return": sample[PortfolioColumns.DAILY_ROR.value],
-                    "threshold": upper_bound[index] if ror_series[index] > 0 else lower_bound[index],
-                }
+    # Flag outliers based on the original full series, but only on days that were not ignored
+    outliers = ((ror > upper_bound) | (ror < lower_bound)) & valid_mask
+
+    flagged_rows = np.flatnonzero(outliers)
+    diagnostics["policy"]["outliers"]["flagged_rows"] = len(flagged_rows)
+
+    sample_rows = flagged_rows[:max_samples]
+    if len(sample_rows):
+        sample_ror = ror[sample_rows]
+        thresholds = np.where(sample_ror > 0, upper_bound[sample_rows], lower_bound[sample_rows])
+        sample_dates = np.datetime_as_string(perf_dates[sample_rows], unit="D")
+        diagnostics["samples"]["outliers"].extend(
+            {"date": sample_date, "raw_return": raw_return, "threshold": threshold}
+            for sample_date, raw_return, threshold in zip(
+                sample_dates.tolist(), sample_ror.tolist(), thresholds.tolist()
             )
+        )
 
 
 def apply_robustness_policies(df: pd.DataFrame, data_policy_model: BaseModel | None) -> Tuple[pd.DataFrame, Dict]:
@@ -0,0 +1,162 @@
+# engine/rolling.py
+from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.precision_policy import quantize_performance_array
+from common.enums import Frequency
+from core.annualize import annualize_return
+from core.date_dimension import EpochDayIndex, get_date_dimension, to_epoch_days
+from core.envelope import Annualization
+from engine.breakdown import _plan_periods
+from engine.schema import PortfolioColumns
+
+_PERIOD_MONTHS = {Frequency.MONTHLY: 1, Frequency.QUARTERLY: 3, Frequency.YEARLY: 12}
+
+
+def rolling_window_label(months: int) -> str:
+    """Response key for a trailing window of `months` months, e.g. "12M"."""
+    return f"{months}M"
+
+
+def generate_rolling_returns(
+    daily_df: pd.DataFrame,
+    window_months: List[int],
+    window_end_frequency: Frequency,
+    annualization: Annualization,
+    ends_from: date,
+    ends_to: date,
+    inception_date: date,
+) -> Dict[str, List[Dict]]:
+    """
+    Trailing-window returns from one run of engine results, for windows ending on each
+    `window_end_frequency` period with observations from `ends_from` to `ends_to`. `daily_df`
+    should be an ITD run from inception, whose cumulative returns only restart after resets; windows
+    starting before `inception_date` (or before the first observation, if earlier) are left out.
+
+    Every window is found at once from prefix sums over the days: the log of each day's growth
+    factor, and running counts of zero factors, negative factors and reset days. A window's growth
+    is then the exponential of one difference. Windows holding a reset take the ratio of cumulative
+    returns across the window instead, as `/twr` period totals do.
+    """
+    if daily_df.empty or not window_months:
+        return {}
+
+    day_index = EpochDayIndex(daily_df[PortfolioColumns.PERF_DATE.value])
+    order = np.arange(len(daily_df)) if day_index.is_sorted else np.argsort(day_index.days, kind="stable")
+    days = day_index.days[order].astype(np.int64)
+
+    rates = np.asarray(daily_df[PortfolioColumns.DAILY_ROR.value].to_numpy()[order], dtype=float) / 100
+    rates = np.where(np.isnan(rates), 0.0, rates)  # Missing returns compound as flat days.
+    growth = 1 + rates
+    # log1p keeps small daily returns exact; negative factors contribute log|g| and zeros nothing.
+    log_growth = np.log1p(np.where(growth > 0, rates, np.where(growth == 0, 0.0, -growth - 1)))
+    prefix_log = np.append(0.0, np.cumsum(log_growth))
+    prefix_zeros = np.append(0, np.cumsum(growth == 0))
+    prefix_negatives = np.append(0, np.cumsum(growth < 0))
+    if PortfolioColumns.PERF_RESET.value in daily_df.columns:
+        resets = daily_df[PortfolioColumns.PERF_RESET.value].to_numpy()[order].astype(bool)
+    else:
+        resets = np.zeros(len(days), dtype=bool)
+    prefix_resets = np.append(0, np.cumsum(resets))
+    cumulative = np.asarray(daily_df[PortfolioColumns.FINAL_CUM_ROR.value].to_numpy()[order], dtype=float) / 100
+
+    ends, end_dates = _window_ends(days, window_end_frequency, ends_from, ends_to)
+    history_start = min(int(to_epoch_days(inception_date)), int(days[0]))
+
+    ppy = annualization.periods_per_year or (
+        252 if annualization.basis == "BUS/252" else 365.25 if annualization.basis == "ACT/ACT" else 365.0
+    )
+
+    rolling = {}
+    for months in window_months:
+        start_days = _window_starts(end_dates, months).astype(np.int64)
+        starts = np.searchsorted(days, start_days, side="left")
+        # Windows need history back to their first day and at least one observation.
+        complete = (start_days >= history_start) & (starts <= ends)
+        window_ends, start_days, starts = ends[complete], start_days[complete], starts[complete]
+
+        log_ratio = prefix_log[window_ends + 1] - prefix_log[starts]
+        negative = (prefix_negatives[window_ends + 1] - prefix_negatives[starts]) % 2 == 1
+        window_rors = np.where(negative, -np.exp(log_ratio) - 1, np.expm1(log_ratio))
+        window_rors[prefix_zeros[window_ends + 1] - prefix_zeros[starts] > 0] = -1.0
+
+        has_reset = prefix_resets[window_ends + 1] - prefix_resets[starts] > 0
+        if has_reset.any():
+            start_cumulative = np.where(starts > 0, cumulative[np.maximum(starts - 1, 0)], 0.0)
+            denominators = 1 + start_cumulative
+            with np.errstate(divide="ignore", invalid="ignore"):
+                reset_rors = np.where(
+                    denominators == 0,
+                    cumulative[window_ends],
+                    (1 + cumulative[window_ends]) / denominators - 1,
+                )
+            window_rors = np.where(has_reset, reset_rors, window_rors)
+
+        window_starts = start_days.astype("datetime64[D]").tolist()
+        window_end_dates = end_dates[complete].tolist()
+        return_pcts = quantize_performance_array(window_rors * 100).tolist()
+        results = [
+            {"window_start": window_start, "window_end": window_end, "return_pct": return_pct}
+            for window_start, window_end, return_pct in zip(window_starts, window_end_dates, return_pcts)
+        ]
+        if annualization.enabled:
+            days_in_windows = (days[window_ends] - days[starts] + 1).tolist()
+            window_ror_values = window_rors.tolist()
+            annualized = np.flatnonzero(window_rors >= -1).tolist()
+            annualized_returns = [
+                annualize_return(window_ror_values[i], days_in_windows[i], ppy, annualization.basis) * 100
+                for i in annualized
+            ]
+            for i, annualized_return_pct in zip(annualized, quantize_performance_array(annualized_returns).tolist()):
+                results[i]["annualized_return_pct"] = annualized_return_pct
+        rolling[rolling_window_label(months)] = results
+    return rolling
+
+
+def _window_ends(
+    days: np.ndarray, frequency: Frequency, ends_from: date, ends_to: date
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For each `frequency` period with observations in the range, the position in sorted `days` of
+    its last observation and the date its windows end: the period's last calendar day (its
+    week-ending Friday for weeks), or `ends_to` for a period still open on that day.
+    """
+    first = int(np.searchsorted(days, to_epoch_days(ends_from), side="left"))
+    last = int(np.searchsorted(days, to_epoch_days(ends_to), side="right"))
+    if frequency == Frequency.DAILY or first >= last:
+        positions = np.arange(first, last)
+        return positions, days[positions].astype("datetime64[D]")
+
+    period_starts, period_keys = _plan_periods(days[first:last].astype("datetime64[D]"), [frequency])[frequency]
+    positions = first + np.append(period_starts[1:], last - first) - 1
+    if frequency == Frequency.WEEKLY:
+        period_ends = period_keys.astype("datetime64[D]")
+    else:
+        span = np.timedelta64(_PERIOD_MONTHS[frequency], "M")
+        period_ends = (period_keys.astype("datetime64[M]") + span).astype("datetime64[D]") - np.timedelta64(1, "D")
+    return positions, np.minimum(period_ends, np.datetime64(ends_to, "D"))
+
+
+def _window_starts(end_dates: np.ndarray, months: int) -> np.ndarray:
+    """
+    First day of the `months`-month window ending on each date. Windows ending on a month end
+    cover whole calendar months (a 1-month window ending 28 February starts on 1 February); other
+    windows start the day after the same date `months` earlier, clipped to the end of shorter
+    months as `pd.DateOffset(months=...)` does.
+    """
+    end_months = end_dates.astype("datetime64[M]")
+    target_months = end_months - np.timedelta64(months, "M")
+    month_lengths = (target_months + np.timedelta64(1, "M")).astype("datetime64[D]") - target_months.astype(
+        "datetime64[D]"
+    )
+    day_of_month = end_dates - end_months.astype("datetime64[D]")
+    offset_starts = (
+        target_months.astype("datetime64[D]")
+        + np.minimum(day_of_month, month_lengths - np.timedelta64(1, "D"))
+        + np.timedelta64(1, "D")
+    )
+    whole_month_starts = (target_months + np.timedelta64(1, "M")).astype("datetime64[D]")
+    return np.where(get_date_dimension().month_end(end_dates), whole_month_starts, offset_starts)
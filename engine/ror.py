@@ -1,12 +1,18 @@
 # engine/ror.py
 import warnings
+from dataclasses import dataclass
 from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from engine.checkpoint import LegCarry, SeriesCarry
 from engine.config import EngineConfig
-from engine.rules import calculate_initial_resets, calculate_nctrl4_reset
+from engine.fixed_point import to_decimal_series
+from engine.fx import get_fx_rate_index
+from engine.rules import calculate_initial_resets, calculate_nctrl4_reset, get_series_starts
+from engine.scan import forward_fill, resegmented_cumprod, segmented_cumprod
 from engine.schema import PortfolioColumns
 
 
@@ -57,24 +63,23 @@ def calculate_daily_ror(df: pd.DataFrame, metric_basis: str, config: EngineConfi
 
     result_df = pd.DataFrame(index=df.index)
     if config and config.currency_mode and config.currency_mode != "BASE_ONLY" and config.fx:
-        fx_rates_df = pd.DataFrame([rate.model_dump() for rate in config.fx.rates])
+        # Rates are carried forward from the day before the performance start onwards.
+        rate_index = get_fx_rate_index(config.fx)
+        first_rate_date = np.datetime64(config.performance_start_date, "D") - np.timedelta64(1, "D")
+        perf_dates = df[PortfolioColumns.PERF_DATE.value].to_numpy(dtype="datetime64[D]")
+        df["start_rate"] = rate_index.asof(perf_dates - np.timedelta64(1, "D"), not_before=first_rate_date)
+        df["end_rate"] = rate_index.asof(perf_dates, not_before=first_rate_date)
 
-        if "date" in fx_rates_df.columns and "ccy" in fx_rates_df.columns:
-            fx_rates_df.drop_duplicates(subset=["date", "ccy"], keep="last", inplace=True)
-
-        fx_rates_df["date"] = pd.to_datetime(fx_rates_df["date"])
-        fx_rates_df = fx_rates_df.set_index("date")["rate"].sort_index()
-
-        start_dt = pd.to_datetime(config.performance_start_date) - pd.Timedelta(days=1)
-        end_dt = df[PortfolioColumns.PERF_DATE.value].max()
-        full_date_range = pd.date_range(start=start_dt, end=end_dt, freq="D")
-        all_rates = fx_rates_df.reindex(full_date_range).ffill()
-
-        df["start_rate"] = df[PortfolioColumns.PERF_DATE.value].apply(lambda x: all_rates.get(x - pd.Timedelta(days=1)))
-        df["end_rate"] = df[PortfolioColumns.PERF_DATE.value].map(all_rates)
-
-        fx_ror = (df["end_rate"] / df["start_rate"]) - 1
-        fx_ror = fx_ror.fillna(0.0)
+        if is_decimal_mode:
+            has_rates = df["start_rate"].notna() & df["end_rate"].notna()
+            fx_ror = pd.Series([zero] * len(df), index=df.index, dtype=object)
+            if has_rates.any():
+                fx_ror.loc[has_rates] = to_decimal_series(df.loc[has_rates, "end_rate"]) / to_decimal_series(
+                    df.loc[has_rates, "start_rate"]
+                ) - Decimal(1)
+        else:
+            fx_ror = (df["end_rate"] / df["start_rate"]) - 1
+            fx_ror = fx_ror.fillna(0.0)
 
         if config.hedging and config.hedging.mode == "RATIO" and config.hedging.series:
             hedge_series_df = pd.DataFrame([s.model_dump() for s in config.hedging.series])
@@ -82,7 +87,10 @@ def calculate_daily_ror(df: pd.DataFrame, metric_basis: str, config: EngineConfi
                 hedge_series_df["date"] = pd.to_datetime(hedge_series_df["date"])
                 hedge_map = hedge_series_df.set_index("date")["hedge_ratio"]
                 hedge_ratios = df[PortfolioColumns.PERF_DATE.value].map(hedge_map).fillna(0.0)
-                fx_ror = fx_ror * (1.0 - hedge_ratios)
+                if is_decimal_mode:
+                    fx_ror = fx_ror * (Decimal(1) - to_decimal_series(hedge_ratios))
+                else:
+                    fx_ror = fx_ror * (1.0 - hedge_ratios)
 
         result_df["local_ror"] = local_ror * hundred
         result_df["fx_ror"] = fx_ror * hundred
@@ -93,9 +101,21 @@ def calculate_daily_ror(df: pd.DataFrame, metric_basis: str, config: EngineConfi
     return result_df
 
 
-def calculate_cumulative_ror(df: pd.DataFrame, config):
-    """Orchestrates all cumulative return calculations, supporting both float and Decimal."""
+def calculate_cumulative_ror(
+    df: pd.DataFrame,
+    config,
+    report_end_dates: Optional[pd.Series] = None,
+    carry: Optional[SeriesCarry] = None,
+    snapshot_row: Optional[int] = None,
+) -> Optional[SeriesCarry]:
+    """
+    Orchestrates all cumulative return calculations, supporting both float and Decimal.
+
+    `carry` resumes a single series from the state of the day before the frame's first row.
+    When `snapshot_row` is given, the state after that row is returned so a later run can resume from it.
+    """
     is_decimal_mode = df[PortfolioColumns.DAILY_ROR.value].dtype == "object"
+    zero = Decimal(0) if is_decimal_mode else 0.0
     one = Decimal(1) if is_decimal_mode else 1.0
     hundred = Decimal(100) if is_decimal_mode else 100.0
 
@@ -107,40 +127,65 @@ def calculate_cumulative_ror(df: pd.DataFrame, config):
     if "fx_ror" in df.columns:
         other_components.append("fx_ror")
 
-    # Step 1: Calculate temp cumulative returns for all components (pre-reset)
-    for component_name in base_components + other_components:
-        prefix = f"{component_name}_" if component_name != PortfolioColumns.DAILY_ROR.value else ""
-        df[f"temp_{prefix}long_cum_ror"] = _compound_ror(df, df[component_name], "long", use_resets=False)
-        df[f"temp_{prefix}short_cum_ror"] = _compound_ror(df, df[component_name], "short", use_resets=False)
+    # Step 1: Compound the base TWR without resets. These pre-reset ("temp") legs only feed the
+    # NCTRL 1-3 checks, so they are kept out of the frame.
+    temp_block_starts = _compounding_block_starts(df, False, carry)
+    temp_legs = _compound_legs(df, base_components, "temp_", temp_block_starts, carry)
 
     # Step 2: Determine resets based ONLY on the base TWR
     initial_resets, nctrl1, nctrl2, nctrl3 = calculate_initial_resets(
         df,
-        pd.to_datetime(config.report_end_date),
-        PortfolioColumns.TEMP_LONG_CUM_ROR.value,
-        PortfolioColumns.TEMP_SHORT_CUM_ROR.value,
+        report_end_dates if report_end_dates is not None else pd.to_datetime(config.report_end_date),
+        temp_legs[PortfolioColumns.TEMP_LONG_CUM_ROR.value][0],
+        temp_legs[PortfolioColumns.TEMP_SHORT_CUM_ROR.value][0],
+        carry,
     )
     df[PortfolioColumns.NCTRL_1.value] = nctrl1.astype(int)
     df[PortfolioColumns.NCTRL_2.value] = nctrl2.astype(int)
     df[PortfolioColumns.NCTRL_3.value] = nctrl3.astype(int)
     df[PortfolioColumns.PERF_RESET.value] = initial_resets.astype(int)
 
-    # Step 3: Recalculate all cumulative returns applying the same reset logic
-    for component_name in base_components + other_components:
-        prefix = f"{component_name}_" if component_name != PortfolioColumns.DAILY_ROR.value else ""
-        df[f"{prefix}long_cum_ror"] = _compound_ror(df, df[component_name], "long", use_resets=True)
-        df[f"{prefix}short_cum_ror"] = _compound_ror(df, df[component_name], "short", use_resets=True)
+    # Step 3: Compound all components applying the resets. The base legs only differ from the
+    # pre-reset pass in the blocks that follow a reset, so only those rows are recompounded, and
+    # the pre-reset pass is reused as is when no reset restarts a block.
+    block_starts = _compounding_block_starts(df, True, carry)
+    base_columns = {col: col[len("temp_") :] for col in temp_legs}
+    if np.array_equal(block_starts, temp_block_starts) and (
+        carry is None or all(carry.legs[temp_col] == carry.legs[col] for temp_col, col in base_columns.items())
+    ):
+        legs = {
+            col: (temp_legs[temp_col][0].rename(col), temp_legs[temp_col][1]) for temp_col, col in base_columns.items()
+        }
+    else:
+        previous = {
+            col: CompoundingPass(
+                growth=temp_legs[temp_col][1],
+                block_starts=temp_block_starts,
+                initial_growth=carry.legs[temp_col].growth if carry else None,
+            )
+            for temp_col, col in base_columns.items()
+        }
+        legs = _compound_legs(df, base_components, "", block_starts, carry, previous)
+    legs.update(_compound_legs(df, other_components, "", block_starts, carry))
+    for col, (leg_ror, _) in legs.items():
+        df[col] = leg_ror
+
+    legs = {**temp_legs, **legs}
+    leg_columns = list(legs)
+    if snapshot_row is not None:
+        leg_rors = {col: leg_ror.iloc[snapshot_row] for col, (leg_ror, _) in legs.items()}
 
     is_initial_reset_day = df[PortfolioColumns.PERF_RESET.value] == 1
     for component_name in base_components + other_components:
         prefix = f"{component_name}_" if component_name != PortfolioColumns.DAILY_ROR.value else ""
-        df.loc[is_initial_reset_day, [f"{prefix}long_cum_ror", f"{prefix}short_cum_ror"]] = 0.0
+        df.loc[is_initial_reset_day, [f"{prefix}long_cum_ror", f"{prefix}short_cum_ror"]] = zero
 
     # Step 4: Final reset calculations based on base TWR
     nctrl4_resets = calculate_nctrl4_reset(
         df,
         long_cum_col=PortfolioColumns.LONG_CUM_ROR.value,
         short_cum_col=PortfolioColumns.SHORT_CUM_ROR.value,
+        carry=carry,
     )
     df[PortfolioColumns.NCTRL_4.value] = nctrl4_resets.astype(int)
     df.loc[nctrl4_resets, PortfolioColumns.PERF_RESET.value] = 1  # Use .loc to update
@@ -148,16 +193,16 @@ def calculate_cumulative_ror(df: pd.DataFrame, config):
     is_final_reset_day = df[PortfolioColumns.PERF_RESET.value] == 1
     for component_name in base_components + other_components:
         prefix = f"{component_name}_" if component_name != PortfolioColumns.DAILY_ROR.value else ""
-        df.loc[is_final_reset_day, [f"{prefix}long_cum_ror", f"{prefix}short_cum_ror"]] = 0.0
+        df.loc[is_final_reset_day, [f"{prefix}long_cum_ror", f"{prefix}short_cum_ror"]] = zero
 
     # Step 5: Handle NIP days for all components
     is_nip = df[PortfolioColumns.NIP.value] == 1
     for component_name in base_components + other_components:
         prefix = f"{component_name}_" if component_name != PortfolioColumns.DAILY_ROR.value else ""
-        df.loc[is_nip, [f"{prefix}long_cum_ror", f"{prefix}short_cum_ror"]] = np.nan
-        df[[f"{prefix}long_cum_ror", f"{prefix}short_cum_ror"]] = (
-            df[[f"{prefix}long_cum_ror", f"{prefix}short_cum_ror"]].ffill().fillna(0.0)
-        )
+        leg_pair = [f"{prefix}long_cum_ror", f"{prefix}short_cum_ror"]
+        df.loc[is_nip, leg_pair] = np.nan
+        carried = {col: carry.cum_rors[col] for col in leg_pair} if carry else None
+        df[leg_pair] = _ffill_within_series(df, df[leg_pair], carried).fillna(zero)
 
     # Step 6: Calculate the final cumulative return based ONLY on the base components
     df[PortfolioColumns.FINAL_CUM_ROR.value] = (
@@ -167,9 +212,198 @@ def calculate_cumulative_ror(df: pd.DataFrame, config):
     ) * hundred
     # --- END FIX ---
 
+    if snapshot_row is None:
+        return None
+    row = df.iloc[snapshot_row]
+    initial_reset = bool(nctrl1.iloc[snapshot_row] or nctrl2.iloc[snapshot_row] or nctrl3.iloc[snapshot_row])
+    return SeriesCarry(
+        perf_date=pd.Timestamp(row[PortfolioColumns.PERF_DATE.value]).date(),
+        effective_period_start_date=pd.Timestamp(row[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value]).date(),
+        sign=int(row[PortfolioColumns.SIGN.value]),
+        eod_cf=_to_scalar(row[PortfolioColumns.EOD_CF.value]),
+        initial_reset=initial_reset,
+        legs={
+            col: LegCarry(
+                growth=_to_scalar(legs[col][1][snapshot_row]),
+                ror=_to_scalar(leg_rors[col]),
+            )
+            for col in leg_columns
+        },
+        cum_rors={col: _to_scalar(row[col]) for col in leg_columns if not col.startswith("temp_")},
+    )
+
+
+def _to_scalar(value):
+    """Unwraps NumPy scalars so carried state holds plain Python numbers (or `Decimal`)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _compound_legs(
+    df: pd.DataFrame,
+    components: List[str],
+    column_prefix: str,
+    block_starts: np.ndarray,
+    carry: Optional[SeriesCarry] = None,
+    previous: Optional[Dict[str, "CompoundingPass"]] = None,
+) -> Dict[str, Tuple[pd.Series, np.ndarray]]:
+    """
+    Compounds the long and short legs of every component over the given blocks, floats in one scan.
+    Returns, per cumulative column name, the filled leg return and its running growth product.
+    `previous` maps column names to an earlier pass over the same legs with fewer block starts.
+    """
+    columns = {}
+    for component_name in components:
+        prefix = f"{component_name}_" if component_name != PortfolioColumns.DAILY_ROR.value else ""
+        columns[component_name] = (f"{column_prefix}{prefix}long_cum_ror", f"{column_prefix}{prefix}short_cum_ror")
+    if not columns:
+        return {}
+
+    leg_columns = [col for pair in columns.values() for col in pair]
+    if df[PortfolioColumns.DAILY_ROR.value].dtype == "object":
+        legs = {}
+        for component_name, (long_col, short_col) in columns.items():
+            for leg, col in (("long", long_col), ("short", short_col)):
+                leg_ror, growth = _compound_leg(
+                    df,
+                    df[component_name],
+                    leg,
+                    block_starts,
+                    carry.legs[col] if carry else None,
+                    previous[col] if previous else None,
+                )
+                legs[col] = (leg_ror.rename(col), growth)
+        return legs
+
+    previous_pass = None
+    if previous:
+        previous_pass = CompoundingPass(
+            growth=np.column_stack([previous[col].growth for col in leg_columns]),
+            block_starts=previous[leg_columns[0]].block_starts,
+            initial_growth=[previous[col].initial_growth for col in leg_columns] if carry else None,
+        )
+    filled, cumulative_growth = compound_float_leg_arrays(
+        df[PortfolioColumns.SIGN.value].to_numpy(),
+        [df[name].to_numpy(dtype=np.float64) for name in components],
+        block_starts,
+        get_series_starts(df, carry),
+        [carry.legs[col] for col in leg_columns] if carry else None,
+        previous_pass,
+    )
+    return {
+        col: (pd.Series(filled[:, i], index=df.index, name=col), cumulative_growth[:, i])
+        for i, col in enumerate(leg_columns)
+    }
+
+
+def _ffill_within_series(df: pd.DataFrame, values: pd.DataFrame | pd.Series, carried=None) -> pd.DataFrame | pd.Series:
+    """
+    Forward-fills values without carrying them across portfolio boundaries of a stacked frame.
+    `carried` holds the value(s) carried into a single series resumed from an earlier run.
+    """
+    series_starts = get_series_starts(df)
+    if series_starts.sum() <= 1:
+        filled = values.ffill()
+        return filled.fillna(carried) if carried is not None else filled
+    return values.groupby(series_starts.cumsum()).ffill()
+
+
+def _compounding_block_starts(df: pd.DataFrame, use_resets: bool, carry: Optional[SeriesCarry] = None) -> np.ndarray:
+    """
+    Flags the rows where geometric compounding restarts: a new series, a new effective period,
+    or the day after a reset.
+    """
+    effective_starts = df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value].to_numpy()
+    block_starts = get_series_starts(df, carry)
+    block_starts[1:] |= effective_starts[1:] != effective_starts[:-1]
+    if use_resets:
+        block_starts[1:] |= df[PortfolioColumns.PERF_RESET.value].to_numpy()[:-1] == 1
+    if carry is not None and len(df):
+        block_starts[0] = pd.Timestamp(effective_starts[0]).date() != carry.effective_period_start_date or bool(
+            use_resets and carry.initial_reset
+        )
+    return block_starts
+
+
+@dataclass(frozen=True)
+class CompoundingPass:
+    """
+    A compounding pass kept for reuse: its running growth products, the block starts it restarted
+    at and the carried growth it resumed from.
+    """
+
+    growth: np.ndarray
+    block_starts: np.ndarray
+    initial_growth: Any = None
+
+
+def compound_float_leg_arrays(
+    sign: np.ndarray,
+    daily_rors: List[np.ndarray],
+    block_starts: np.ndarray,
+    series_starts: np.ndarray,
+    carried_legs: Optional[List[LegCarry]] = None,
+    previous: Optional[CompoundingPass] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compounds the long and short legs of every float component with a single segmented scan.
+    Returns the filled leg returns and their running growth products as (rows x legs) arrays, with
+    the long and short leg of each component side by side. `carried_legs` lists the state carried
+    from an earlier run in the same order. With `previous`, an earlier pass over the same legs
+    whose block starts are a subset of `block_starts`, only the rows of newly opened blocks are
+    recompounded.
+    """
+    is_long = sign == 1
+    is_short = sign == -1
+
+    growth = np.empty((len(sign), 2 * len(daily_rors)), dtype=np.float64)
+    for i, ror in enumerate(daily_rors):
+        growth[:, 2 * i] = np.where(is_long, 1.0 + (ror / 100.0), 1.0)
+        growth[:, 2 * i + 1] = np.where(is_short, 1.0 - (ror / 100.0), 1.0)
+
+    initial_growth = initial_ror = None
+    if carried_legs is not None:
+        initial_growth = np.array([leg.growth for leg in carried_legs], dtype=np.float64)
+        initial_ror = np.array([leg.ror for leg in carried_legs], dtype=np.float64)
+
+    if previous is None:
+        cumulative_growth = segmented_cumprod(growth, block_starts, initial=initial_growth)
+    else:
+        cumulative_growth = resegmented_cumprod(
+            growth,
+            block_starts,
+            previous.growth,
+            previous.block_starts,
+            initial=initial_growth,
+            previous_initial=previous.initial_growth,
+        )
+    cumulative_ror = (cumulative_growth - 1.0) * 100.0
+    cumulative_ror[:, 1::2] *= -1.0
+
+    leg_mask = np.empty(growth.shape, dtype=bool)
+    leg_mask[:, 0::2] = is_long[:, None]
+    leg_mask[:, 1::2] = is_short[:, None]
+    filled = forward_fill(cumulative_ror, leg_mask, fill_value=0.0, segment_starts=series_starts, initial=initial_ror)
+    return filled, cumulative_growth
+
 
 def _compound_ror(df: pd.DataFrame, daily_ror: pd.Series, leg: str, use_resets=False) -> pd.Series:
     """Helper for geometric compounding, supporting both float and Decimal."""
+    return _compound_leg(df, daily_ror, leg, _compounding_block_starts(df, use_resets))[0]
+
+
+def _compound_leg(
+    df: pd.DataFrame,
+    daily_ror: pd.Series,
+    leg: str,
+    block_starts: np.ndarray,
+    carried: Optional[LegCarry] = None,
+    previous: Optional[CompoundingPass] = None,
+) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Compounds one leg over the given blocks, optionally resuming from a carried leg state.
+    Returns the filled leg return together with its running growth product. `previous` is an
+    earlier pass over the same leg (see `compound_float_leg_arrays`).
+    """
     is_decimal_mode = daily_ror.dtype == "object"
     one = Decimal(1) if is_decimal_mode else 1.0
     hundred = Decimal(100) if is_decimal_mode else 100.0
@@ -184,28 +418,22 @@ def _compound_ror(df: pd.DataFrame, daily_ror: pd.Series, leg: str, use_resets=F
         growth_factor = one - (daily_ror / hundred)
     growth_factor = growth_factor.where(is_leg_day, one)
 
-    prev_eff_start = df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value].shift(1)
-    is_period_start = df[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value] != prev_eff_start
-    if not df.empty:
-        is_period_start.iloc[0] = True
-
-    block_starts = is_period_start
-    if use_resets:
-        prev_day_was_reset = df[PortfolioColumns.PERF_RESET.value].shift(1, fill_value=0) == 1
-        block_starts |= prev_day_was_reset
-    block_ids = block_starts.cumsum()
-
-    if is_decimal_mode:
-
-        def decimal_cumprod(series):
-            result = series.copy()
-            for i in range(1, len(series)):
-                result.iloc[i] = result.iloc[i - 1] * result.iloc[i]
-            return result
-
-        cumulative_growth = growth_factor.groupby(block_ids, group_keys=False).apply(decimal_cumprod)
+    growth_values = growth_factor.to_numpy(dtype=object if is_decimal_mode else np.float64)
+    initial_growth = carried.growth if carried else None
+    if previous is None:
+        growth_product = segmented_cumprod(growth_values, block_starts, initial=initial_growth)
     else:
-        cumulative_growth = growth_factor.groupby(block_ids).cumprod()
+        growth_product = resegmented_cumprod(
+            growth_values,
+            block_starts,
+            previous.growth,
+            previous.block_starts,
+            initial=initial_growth,
+            previous_initial=previous.initial_growth,
+        )
+    cumulative_growth = pd.Series(
+        growth_product, index=growth_factor.index, dtype=object if is_decimal_mode else np.float64
+    )
 
     cumulative_ror = (cumulative_growth - one) * hundred
     if leg == "short":
@@ -214,6 +442,6 @@ def _compound_ror(df: pd.DataFrame, daily_ror: pd.Series, leg: str, use_resets=F
 
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", FutureWarning)
-        filled_ror = leg_ror.ffill().fillna(zero)
+        filled_ror = _ffill_within_series(df, leg_ror, carried.ror if carried else None).fillna(zero)
 
-    return filled_ror
+    return filled_ror, growth_product
@@ -1,11 +1,14 @@
 # engine/rules.py
 from decimal import Decimal
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from core.date_dimension import get_date_dimension
+from engine.checkpoint import SeriesCarry
 from engine.config import EngineConfig
+from engine.fixed_point import decimal_sign
 from engine.schema import PortfolioColumns
 
 
@@ -18,28 +21,49 @@ def _get_decimal_sign(d: Decimal) -> Decimal:
     return Decimal(0)
 
 
-def calculate_sign(df: pd.DataFrame) -> pd.Series:
-    """Vectorized calculation of the 'sign' column, supporting both float and Decimal."""
+def get_series_starts(df: pd.DataFrame, carry: Optional[SeriesCarry] = None) -> np.ndarray:
+    """
+    Flags the first row of every independent series. A frame holds a single series unless it
+    carries a `portfolio_id` column, in which case each contiguous portfolio block is its own series.
+    With a `carry`, the first row continues a series from an earlier run and is not a start.
+    """
+    series_starts = np.zeros(len(df), dtype=bool)
+    if df.empty:
+        return series_starts
+    series_starts[0] = carry is None
+    if PortfolioColumns.PORTFOLIO_ID.value in df.columns:
+        portfolio_ids = df[PortfolioColumns.PORTFOLIO_ID.value].to_numpy()
+        series_starts[1:] = portfolio_ids[1:] != portfolio_ids[:-1]
+    return series_starts
+
+
+def get_series_ends(df: pd.DataFrame) -> np.ndarray:
+    """Flags the last row of every independent series (see `get_series_starts`)."""
+    series_starts = get_series_starts(df)
+    return np.append(series_starts[1:], True) if len(series_starts) else series_starts
+
+
+def calculate_sign(df: pd.DataFrame, carry: Optional[SeriesCarry] = None) -> pd.Series:
+    """
+    Vectorized calculation of the 'sign' column, supporting both float and Decimal.
+    With a `carry`, the sign and EOD cash flow of the preceding day come from an earlier run.
+    """
     is_decimal_mode = df[PortfolioColumns.BEGIN_MV.value].dtype == "object"
     zero = Decimal(0) if is_decimal_mode else 0.0
 
     if is_decimal_mode:
-        initial_sign = (df[PortfolioColumns.BEGIN_MV.value] + df[PortfolioColumns.BOD_CF.value]).apply(
-            _get_decimal_sign
-        )
+        initial_sign = decimal_sign(df[PortfolioColumns.BEGIN_MV.value] + df[PortfolioColumns.BOD_CF.value])
     else:
         initial_sign = np.sign(df[PortfolioColumns.BEGIN_MV.value] + df[PortfolioColumns.BOD_CF.value])
 
-    prev_eod_cf = df[PortfolioColumns.EOD_CF.value].shift(1, fill_value=zero)
+    prev_eod_cf = df[PortfolioColumns.EOD_CF.value].shift(1, fill_value=carry.eod_cf if carry else zero)
     prev_perf_reset = df[PortfolioColumns.PERF_RESET.value].shift(1, fill_value=0)
     is_flip_event = (df[PortfolioColumns.BOD_CF.value] != zero) | (prev_eod_cf != zero) | (prev_perf_reset == 1)
-
-    if not df.empty:
-        is_flip_event.iloc[0] = True
+    is_flip_event |= get_series_starts(df, carry)
 
     flip_group = is_flip_event.cumsum()
     event_signs = initial_sign.where(is_flip_event)
-    final_sign = event_signs.groupby(flip_group).ffill().fillna(zero)
+    final_sign = event_signs.groupby(flip_group).ffill().fillna(carry.sign if carry else zero)
     return final_sign.astype(int)
 
 
@@ -65,7 +89,7 @@ def calculate_nip(df: pd.DataFrame, config: EngineConfig) -> pd.Series:
     eod_cf_series = df[PortfolioColumns.EOD_CF.value]
 
     if is_decimal_mode:
-        sign_of_bod_cf = bod_cf_series.apply(_get_decimal_sign)
+        sign_of_bod_cf = decimal_sign(bod_cf_series)
     else:
         sign_of_bod_cf = np.sign(bod_cf_series)
 
@@ -74,19 +98,32 @@ def calculate_nip(df: pd.DataFrame, config: EngineConfig) -> pd.Series:
 
 
 def calculate_initial_resets(
-    df: pd.DataFrame, report_end_date: pd.Timestamp, temp_long_col: str, temp_short_col: str
+    df: pd.DataFrame,
+    report_end_date: pd.Timestamp | pd.Series,
+    temp_long_col: str | pd.Series,
+    temp_short_col: str | pd.Series,
+    carry: Optional[SeriesCarry] = None,
 ) -> Tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
-    """Calculates resets based on NCTRL 1, 2, and 3. This is a pure function."""
+    """
+    Calculates resets based on NCTRL 1, 2, and 3. This is a pure function.
+    The pre-reset cumulative legs are given as columns of `df` or as Series named after their leg.
+    `report_end_date` may be a per-row Series when several portfolios are stacked in one frame.
+    With a `carry`, the preceding day's temporary cumulative returns come from an earlier run.
+    """
+    temp_long = df[temp_long_col] if isinstance(temp_long_col, str) else temp_long_col
+    temp_short = df[temp_short_col] if isinstance(temp_short_col, str) else temp_short_col
     is_decimal_mode = df[PortfolioColumns.BOD_CF.value].dtype == "object"
     zero = Decimal(0) if is_decimal_mode else 0.0
 
-    eom_mask = df[PortfolioColumns.PERF_DATE.value].dt.is_month_end
-    next_day_bod_cf = df[PortfolioColumns.BOD_CF.value].shift(-1).fillna(zero)
+    series_starts = get_series_starts(df, carry)
+    series_ends = get_series_ends(df)
+
+    eom_mask = pd.Series(get_date_dimension().month_end(df[PortfolioColumns.PERF_DATE.value]), index=df.index)
+    next_day_bod_cf = df[PortfolioColumns.BOD_CF.value].shift(-1).fillna(zero).where(~series_ends, zero)
 
     future_date = pd.Timestamp.max.normalize()
     next_date_is_after_end = df[PortfolioColumns.PERF_DATE.value].shift(-1, fill_value=future_date) > report_end_date
-    if not df.empty:
-        next_date_is_after_end.iloc[-1] = True
+    next_date_is_after_end |= series_ends
 
     # --- START FIX: Revert the logic to remove dependency on 'sign' ---
     cond_common = (
@@ -98,27 +135,47 @@ def calculate_initial_resets(
     )
     # --- END FIX ---
 
-    cond_nctrl1 = df[temp_long_col] < -100
-    cond_nctrl2 = df[temp_short_col] > 100
-    cond_nctrl3 = (df[temp_short_col] < -100) & (df[temp_long_col] != 0)
+    def breach_conditions(temp_long, temp_short):
+        return temp_long < -100, temp_short > 100, (temp_short < -100) & (temp_long != 0)
+
+    conditions = breach_conditions(temp_long, temp_short)
+    if carry is not None:
+        prev_conditions = breach_conditions(carry.legs[temp_long.name].ror, carry.legs[temp_short.name].ror)
+    else:
+        prev_conditions = (False, False, False)
 
-    nctrl1 = (cond_nctrl1 & ~cond_nctrl1.shift(1, fill_value=False)) & cond_common
-    nctrl2 = (cond_nctrl2 & ~cond_nctrl2.shift(1, fill_value=False)) & cond_common
-    nctrl3 = (cond_nctrl3 & ~cond_nctrl3.shift(1, fill_value=False)) & cond_common
+    nctrl1, nctrl2, nctrl3 = (
+        (cond & ~(cond.shift(1, fill_value=bool(prev_cond)) & ~series_starts)) & cond_common
+        for cond, prev_cond in zip(conditions, prev_conditions)
+    )
 
     resets = nctrl1 | nctrl2 | nctrl3
     return resets, nctrl1, nctrl2, nctrl3
 
 
-def calculate_nctrl4_reset(df: pd.DataFrame, long_cum_col: str, short_cum_col: str) -> pd.Series:
-    """Calculates resets based on NCTRL 4. This is a pure function."""
+def calculate_nctrl4_reset(
+    df: pd.DataFrame, long_cum_col: str, short_cum_col: str, carry: Optional[SeriesCarry] = None
+) -> pd.Series:
+    """
+    Calculates resets based on NCTRL 4. This is a pure function.
+    With a `carry`, the preceding day's cumulative returns and EOD cash flow come from an earlier run.
+    """
     is_decimal_mode = df[PortfolioColumns.BOD_CF.value].dtype == "object"
     zero = Decimal(0) if is_decimal_mode else 0.0
     hundred = Decimal(-100) if is_decimal_mode else -100.0
 
-    prev_long_ror = df[long_cum_col].shift(1, fill_value=zero)
-    prev_short_ror = df[short_cum_col].shift(1, fill_value=zero)
-    prev_eod_cf = df[PortfolioColumns.EOD_CF.value].shift(1, fill_value=zero)
+    if carry is not None:
+        # The preceding day's values as seen at this step: after initial-reset zeroing only.
+        carried_long = zero if carry.initial_reset else carry.legs[long_cum_col].ror
+        carried_short = zero if carry.initial_reset else carry.legs[short_cum_col].ror
+        carried_eod_cf = carry.eod_cf
+    else:
+        carried_long = carried_short = carried_eod_cf = zero
+
+    is_series_start = get_series_starts(df, carry)
+    prev_long_ror = df[long_cum_col].shift(1, fill_value=carried_long).where(~is_series_start, zero)
+    prev_short_ror = df[short_cum_col].shift(1, fill_value=carried_short).where(~is_series_start, zero)
+    prev_eod_cf = df[PortfolioColumns.EOD_CF.value].shift(1, fill_value=carried_eod_cf).where(~is_series_start, zero)
 
     nctrl4 = ((prev_long_ror <= hundred) | (prev_short_ror >= -hundred)) & (
         (df[PortfolioColumns.BOD_CF.value] != zero) | (prev_eod_cf != zero)
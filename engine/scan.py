@@ -0,0 +1,158 @@
+# engine/scan.py
+import numpy as np
+
+
+def segmented_cumprod(values: np.ndarray, segment_starts: np.ndarray, initial=None) -> np.ndarray:
+    """
+    Multiplicative prefix scan that restarts at every flagged segment start.
+
+    Accepts a 1-D array or a 2-D (rows x columns) array whose columns all share the same
+    segmentation, so several legs/components can be compounded in a single pass. Products are
+    accumulated strictly left-to-right inside each segment, which keeps the results bit-identical
+    to `Series.groupby(segment_ids).cumprod()` (including its NaN-skipping behaviour).
+    Object arrays (e.g. `Decimal` values) are multiplied in the same order under the active
+    decimal context, so DECIMAL_STRICT results match a row-by-row running product exactly.
+
+    `initial` resumes a product carried over from an earlier run: when the first row is not a
+    segment start, the first segment continues from it instead of starting afresh.
+    """
+    values = np.asarray(values)
+    if values.dtype != object:
+        values = values.astype(np.float64, copy=False)
+    n_rows = values.shape[0]
+    out = np.empty_like(values)
+    if n_rows == 0:
+        return out
+
+    starts = np.asarray(segment_starts, dtype=bool).copy()
+    resumes = initial is not None and not starts[0]
+    starts[0] = True
+
+    nan_mask = np.isnan(values) if values.dtype != object else np.zeros(values.shape, dtype=bool)
+    has_nan = bool(nan_mask.any())
+    work = np.where(nan_mask, 1.0, values) if has_nan else values
+    if resumes:
+        work = work.copy()
+        work[0] = initial * work[0]
+
+    start_idx = np.flatnonzero(starts)
+    lengths = np.diff(np.append(start_idx, n_rows))
+    max_length = int(lengths.max())
+
+    # Choose the cheaper of two exact strategies: one accumulate per segment, or one vectorized
+    # step per position-within-segment. Either way the work is min(#segments, longest segment).
+    if len(start_idx) <= max_length:
+        for start, length in zip(start_idx.tolist(), lengths.tolist()):
+            np.multiply.accumulate(work[start : start + length], axis=0, out=out[start : start + length])
+    else:
+        out[...] = work
+        position = np.arange(n_rows) - np.repeat(start_idx, lengths)
+        order = np.argsort(position, kind="stable")
+        bounds = np.cumsum(np.bincount(position, minlength=max_length))
+        for step in range(1, max_length):
+            rows = order[bounds[step - 1] : bounds[step]]
+            out[rows] = out[rows - 1] * work[rows]
+
+    if has_nan:
+        out[nan_mask] = np.nan
+    return out
+
+
+def forward_fill(
+    values: np.ndarray, valid: np.ndarray, fill_value=0.0, segment_starts: np.ndarray | None = None, initial=None
+) -> np.ndarray:
+    """
+    Carries the last valid value forward along axis 0 and uses `fill_value` before the first one.
+    Equivalent to `Series.where(valid).ffill().fillna(fill_value)` on float64 arrays. When
+    `segment_starts` is given, values are never carried across a segment boundary. `initial`
+    is a value carried over from an earlier run; it replaces `fill_value` in the first segment
+    unless the first row is itself a segment start.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.asarray(valid, dtype=bool) & ~np.isnan(values)
+    n_rows = values.shape[0]
+    if n_rows == 0:
+        return values.copy()
+
+    row_index = np.arange(n_rows).reshape((n_rows,) + (1,) * (values.ndim - 1))
+    last_valid = np.maximum.accumulate(np.where(valid, row_index, -1), axis=0)
+    segment_first_row = np.zeros(row_index.shape, dtype=np.intp)
+    if segment_starts is not None:
+        segment_first_row = np.maximum.accumulate(np.where(segment_starts, np.arange(n_rows), 0)).reshape(
+            row_index.shape
+        )
+        last_valid = np.where(last_valid >= segment_first_row, last_valid, -1)
+    if initial is not None and not (segment_starts is not None and segment_starts[0]):
+        fill_value = np.where(segment_first_row == 0, np.asarray(initial, dtype=np.float64), fill_value)
+    filled = np.take_along_axis(values, np.maximum(last_valid, 0), axis=0)
+    return np.where(last_valid >= 0, filled, fill_value)
+
+
+def resegmented_cumprod(
+    values: np.ndarray,
+    segment_starts: np.ndarray,
+    previous: np.ndarray,
+    previous_starts: np.ndarray,
+    initial=None,
+    previous_initial=None,
+) -> np.ndarray:
+    """
+    `segmented_cumprod(values, segment_starts, initial)`, derived from `previous`: the products of an
+    earlier scan of the same values over `previous_starts` (a subset of `segment_starts`), resumed
+    from `previous_initial`. Rows whose segment is unchanged keep their earlier products and only
+    the segments opened by the additional starts are rescanned, so the result stays bit-identical
+    while the work shrinks to the rows that actually restart.
+    """
+    starts = np.asarray(segment_starts, dtype=bool)
+    out = np.array(previous, copy=True)
+    n_rows = starts.shape[0]
+    if n_rows == 0:
+        return out
+
+    row_index = np.arange(n_rows)
+    segment_first_row = np.maximum.accumulate(np.where(starts, row_index, -1))
+    changed = segment_first_row != np.maximum.accumulate(
+        np.where(np.asarray(previous_starts, dtype=bool), row_index, -1)
+    )
+    if not starts[0] and not _same_initial(initial, previous_initial):
+        # The first segment resumes from a different carried product.
+        changed |= segment_first_row < 0
+    if changed.any():
+        out[changed] = segmented_cumprod(np.asarray(values)[changed], starts[changed], initial=initial)
+    return out
+
+
+def _same_initial(initial, previous_initial) -> bool:
+    if initial is None or previous_initial is None:
+        return initial is None and previous_initial is None
+    return bool(np.array_equal(np.asarray(initial, dtype=object), np.asarray(previous_initial, dtype=object)))
+
+
+def rolling_median(values: np.ndarray, window: int, chunk_rows: int = 4096) -> np.ndarray:
+    """
+    Trailing rolling median over the non-NaN values of the last `window` rows, NaN where that
+    window holds no value. Bit-identical to `Series.rolling(window, min_periods=1).median()`:
+    each window is sorted (NaNs last) and the middle value, or the mean of the two middle values,
+    is taken from its valid prefix. Windows are sorted `chunk_rows` at a time, which bounds the
+    scratch memory to `chunk_rows * window` values on long histories.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_rows = values.shape[0]
+    out = np.full(n_rows, np.nan)
+    if n_rows == 0:
+        return out
+
+    padded = np.concatenate((np.full(window - 1, np.nan), values))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    valid_counts = np.convolve(~np.isnan(padded), np.ones(window, dtype=np.int64), mode="valid")
+    for start in range(0, n_rows, chunk_rows):
+        counts = valid_counts[start : start + chunk_rows]
+        rows = np.flatnonzero(counts)
+        if not len(rows):
+            continue
+        counts = counts[rows]
+        sorted_windows = np.sort(windows[start + rows], axis=1)
+        lower = sorted_windows[np.arange(len(rows)), (counts - 1) // 2]
+        upper = sorted_windows[np.arange(len(rows)), counts // 2]
+        out[start + rows] = np.where(counts % 2 == 1, lower, (lower + upper) / 2)
+    return out
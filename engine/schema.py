@@ -39,3 +39,7 @@ class PortfolioColumns(str, Enum):
 
     # --- Helper/Temporary Fields ---
     EFFECTIVE_PERIOD_START_DATE = "effective_period_start_date"
+
+    # --- Batch Fields ---
+    # Identifies independent series when several portfolios are stacked in one frame.
+    PORTFOLIO_ID = "portfolio_id"
@@ -5,7 +5,6 @@ from typing import Any, AsyncIterator
 
 import orjson
 from fastapi import FastAPI
-from fastapi.encoders import jsonable_encoder
 from fastapi.openapi.utils import get_openapi
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import JSONResponse
@@ -19,6 +18,7 @@ from app.api.endpoints import (
     performance,
     returns_series,
 )
+from app.api.serialization import encode_excluding_none
 from app.core.config import get_settings
 from app.core.exceptions import PerformanceCalculatorError
 from app.core.handlers import performance_calculator_exception_handler
@@ -28,51 +28,12 @@ from app.openapi_enrichment import enrich_openapi_schema
 
 
 # --- FIX START: Create a robust custom JSON response class ---
-def _clean_none_from_dict(d: dict) -> dict:
-    """Recursively removes keys with None values from a dictionary."""
-    out = {}
-    for k, v in d.items():
-        if v is not None:
-            if isinstance(v, dict):
-                out[k] = _clean_none_from_dict(v)
-            elif isinstance(v, list):
-                out[k] = _clean_none_from_list(v)
-            else:
-                out[k] = v
-    return out
-
-
-def _clean_none_from_list(items: list) -> list:
-    """Recursively removes None values from lists and dicts within lists."""
-    out = []
-    for v in items:
-        if v is not None:
-            if isinstance(v, dict):
-                out.append(_clean_none_from_dict(v))
-            elif isinstance(v, list):
-                out.append(_clean_none_from_list(v))
-            else:
-                out.append(v)
-    return out
-
-
 class ORJSONResponseExcludeNull(JSONResponse):
     def render(self, content: Any) -> bytes:
         """
         Serializes content to JSON using orjson, after removing null values.
         """
-        # jsonable_encoder handles Pydantic models, datetimes, etc.
-        encoded_content = jsonable_encoder(content)
-
-        # Recursively remove None values
-        if isinstance(encoded_content, dict):
-            cleaned_content = _clean_none_from_dict(encoded_content)
-        elif isinstance(encoded_content, list):
-            cleaned_content = _clean_none_from_list(encoded_content)
-        else:
-            cleaned_content = encoded_content
-
-        return orjson.dumps(cleaned_content)
+        return orjson.dumps(encode_excluding_none(content))
 
 
 # --- FIX END ---
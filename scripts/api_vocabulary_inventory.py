@@ -131,7 +131,23 @@ def _extract_fields(
         fields.append(field)
 
         nested_type = prop_resolved.get("type")
-        if nested_type == "object" or "$ref" in prop_schema:
+        alternatives = [
+            option
+            for option in prop_resolved.get("anyOf", [])
+            if isinstance(option, dict) and option.get("type") != "null"
+        ]
+        if len(alternatives) > 1:
+            # A field accepting several shapes documents the fields of each.
+            for option in alternatives:
+                fields.extend(
+                    _extract_fields(
+                        {"type": "object", "properties": {prop_name: option}},
+                        components=components,
+                        prefix=prefix,
+                        location=location,
+                    )[1:]
+                )
+        elif nested_type == "object" or "$ref" in prop_schema:
             fields.extend(
                 _extract_fields(
                     prop_schema,
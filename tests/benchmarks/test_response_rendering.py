@@ -0,0 +1,40 @@
+# tests/benchmarks/test_response_rendering.py
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.responses import PerformanceResponse
+from main import ORJSONResponseExcludeNull, app
+
+
+@pytest.fixture(scope="module")
+def ten_year_daily_response():
+    """A ten-year daily TWR response with timeseries, as FastAPI hands it to the response class."""
+    days = [date(2015, 1, 1) + timedelta(days=i) for i in range(3650)]
+    end_mvs = [100000.0 * 1.0002 ** (i + 1) for i in range(len(days))]
+    payload = {
+        "portfolio_id": "BENCHMARK_RESPONSE_01",
+        "performance_start_date": "2014-12-31",
+        "metric_basis": "NET",
+        "report_end_date": days[-1].isoformat(),
+        "analyses": [{"period": "ITD", "frequencies": ["daily", "monthly"]}],
+        "valuation_points": {
+            "perf_date": [day.isoformat() for day in days],
+            "begin_mv": [100000.0] + end_mvs[:-1],
+            "end_mv": end_mvs,
+        },
+        "output": {"include_timeseries": True},
+        "annualization": {"enabled": True},
+    }
+    with TestClient(app) as client:
+        response = client.post("/performance/twr", json=payload)
+    assert response.status_code == 200
+    return PerformanceResponse.model_validate(response.json()).model_dump(mode="json")
+
+
+def test_response_rendering_performance(benchmark, ten_year_daily_response):
+    """Benchmarks rendering a ten-year daily response to JSON bytes without nulls."""
+    benchmark.group = "Response Rendering (10y daily)"
+    body = benchmark(ORJSONResponseExcludeNull, ten_year_daily_response)
+    assert b"null" not in body.body
@@ -57,6 +57,31 @@ def test_contribution_endpoint_multi_period(client):
     assert "YTD" in results
 
 
+def test_contribution_endpoint_accepts_columnar_valuation_points(client, happy_path_payload):
+    """Valuation points sent as parallel arrays give the same results as one object per day."""
+
+    def to_columns(points):
+        return {field: [point.get(field, 0.0) for point in points] for field in points[0]}
+
+    columnar = {
+        **happy_path_payload,
+        "portfolio_data": {
+            **happy_path_payload["portfolio_data"],
+            "valuation_points": to_columns(happy_path_payload["portfolio_data"]["valuation_points"]),
+        },
+        "positions_data": [
+            {**position, "valuation_points": to_columns(position["valuation_points"])}
+            for position in happy_path_payload["positions_data"]
+        ],
+    }
+
+    by_row = client.post("/performance/contribution", json=happy_path_payload)
+    by_column = client.post("/performance/contribution", json=columnar)
+
+    assert by_column.status_code == 200
+    assert by_column.json()["results_by_period"] == by_row.json()["results_by_period"]
+
+
 def test_contribution_endpoint_multi_currency(client):
     """Tests an end-to-end multi-currency contribution request."""
     payload = {
@@ -1,10 +1,15 @@
 # tests/integration/test_performance_api.py
+import json
+import os
 from uuid import uuid4
 
+import numpy as np
+import pandas as pd
 import pytest
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
+from app.core.config import get_settings
 from engine.exceptions import EngineCalculationError, InvalidEngineInputError
 from main import app
 
@@ -111,6 +116,138 @@ def test_calculate_twr_endpoint_legacy_path_and_diagnostics(client):
     assert response_data["audit"]["counts"]["input_rows"] == 5
 
 
+def test_calculate_twr_endpoint_rolling_windows_reach_back_before_the_period(client):
+    """Rolling windows ending in MTD use history from before the month, from the same engine run."""
+    payload = {
+        "portfolio_id": "ROLLING_TEST",
+        "performance_start_date": "2024-12-31",
+        "metric_basis": "NET",
+        "report_end_date": "2025-03-31",
+        "analyses": [
+            {"period": "MTD", "frequencies": ["monthly"], "rolling": {"months": [1, 3]}},
+            {"period": "YTD", "frequencies": ["monthly"]},
+        ],
+        "valuation_points": [
+            {"day": 1, "perf_date": "2025-01-31", "begin_mv": 1000.0, "end_mv": 1010.0},
+            {"day": 2, "perf_date": "2025-02-28", "begin_mv": 1010.0, "end_mv": 1030.2},
+            {"day": 3, "perf_date": "2025-03-31", "begin_mv": 1030.2, "end_mv": 1061.106},
+        ],
+    }
+    response = client.post("/performance/twr", json=payload)
+    assert response.status_code == 200
+    results = response.json()["results_by_period"]
+
+    assert "rolling_returns" not in results["YTD"]
+    rolling = results["MTD"]["rolling_returns"]
+    assert rolling["1M"] == [
+        {"window_start": "2025-03-01", "window_end": "2025-03-31", "return_pct": pytest.approx(3.0)}
+    ]
+    assert rolling["3M"][0]["window_start"] == "2025-01-01"
+    assert rolling["3M"][0]["return_pct"] == pytest.approx(results["YTD"]["portfolio_return"]["base"], abs=1e-6)
+
+
+def test_calculate_twr_endpoint_rolling_windows_holding_a_reset_do_not_depend_on_analysis_order(client):
+    """A window crossing a year start and holding a reset is measured on cumulative returns from inception."""
+    dates_and_values = [
+        ("2024-10-31", 1000.0, 1010.0),
+        ("2024-11-29", 1010.0, 1030.0),
+        ("2024-12-09", 1030.0, 500.0),
+        ("2024-12-10", 500.0, -50.0),
+        ("2024-12-11", -50.0, 1050.0),
+        ("2024-12-31", 1050.0, 1100.0),
+        ("2025-01-15", 1100.0, 1120.0),
+        ("2025-01-31", 1120.0, 1150.0),
+    ]
+    valuation_points = [
+        {"day": i + 1, "perf_date": perf_date, "begin_mv": begin_mv, "end_mv": end_mv}
+        for i, (perf_date, begin_mv, end_mv) in enumerate(dates_and_values)
+    ]
+    valuation_points[4]["bod_cf"] = 1000.0
+    rolling_ytd = {"period": "YTD", "frequencies": ["monthly"], "rolling": {"months": [3]}}
+    payload = {
+        "portfolio_id": "ROLLING_RESET_TEST",
+        "performance_start_date": "2024-10-01",
+        "metric_basis": "GROSS",
+        "report_end_date": "2025-01-31",
+        "valuation_points": valuation_points,
+    }
+
+    windows = []
+    for analyses in ([rolling_ytd], [{"period": "ITD", "frequencies": ["monthly"]}, rolling_ytd]):
+        response = client.post("/performance/twr", json={**payload, "analyses": analyses})
+        assert response.status_code == 200
+        windows.append(response.json()["results_by_period"]["YTD"]["rolling_returns"]["3M"])
+
+    # Growth since the 10 December reset, over growth to 31 October: 1.210526 / 1.01.
+    for window in windows:
+        assert window == [
+            {"window_start": "2024-11-01", "window_end": "2025-01-31", "return_pct": pytest.approx(19.854091)}
+        ]
+
+
+def _sign_flipping_valuation_points(days: int = 500) -> list:
+    """Daily points with sign flips, cash flows and large swings, so short legs and resets occur."""
+    rng = np.random.default_rng(7)
+    begin_mv = rng.normal(100, 80, days).round(2)
+    end_mv = (begin_mv * (1 + rng.normal(0, 0.3, days))).round(2)
+    bod_cf = np.where(rng.random(days) < 0.1, rng.normal(0, 150, days).round(2), 0.0)
+    perf_dates = pd.date_range("2023-10-01", periods=days).strftime("%Y-%m-%d")
+    return [
+        {"day": i + 1, "perf_date": perf_dates[i], "begin_mv": begin_mv[i], "bod_cf": bod_cf[i], "end_mv": end_mv[i]}
+        for i in range(days)
+    ]
+
+
+def test_calculate_twr_endpoint_rolling_leaves_the_analysis_results_unchanged(client):
+    """Asking for rolling windows adds them without changing the analysis's totals, breakdowns or diagnostics."""
+    payload = {
+        "portfolio_id": "ROLLING_ISOLATION_TEST",
+        "performance_start_date": "2023-09-30",
+        "metric_basis": "GROSS",
+        "report_end_date": "2025-02-11",
+        "valuation_points": _sign_flipping_valuation_points(),
+    }
+    ytd = {"period": "YTD", "frequencies": ["daily", "monthly"]}
+
+    plain = client.post("/performance/twr", json={**payload, "analyses": [ytd]}).json()
+    with_rolling = client.post(
+        "/performance/twr", json={**payload, "analyses": [{**ytd, "rolling": {"months": [1, 3]}}]}
+    ).json()
+
+    assert with_rolling["results_by_period"]["YTD"].pop("rolling_returns")["3M"]
+    assert with_rolling["results_by_period"] == plain["results_by_period"]
+    assert with_rolling["diagnostics"] == plain["diagnostics"]
+    assert with_rolling["meta"]["periods"] == plain["meta"]["periods"]
+    assert with_rolling["audit"] == plain["audit"]
+
+
+def test_calculate_twr_endpoint_rolling_windows_do_not_depend_on_the_period_type(client):
+    """On data with sign flips and resets, a YTD analysis reports the windows an ITD analysis reports."""
+    payload = {
+        "portfolio_id": "ROLLING_PERIOD_TYPE_TEST",
+        "performance_start_date": "2023-09-30",
+        "metric_basis": "GROSS",
+        "report_end_date": "2025-02-11",
+        "valuation_points": _sign_flipping_valuation_points(),
+    }
+    rolling = {"months": [1, 3, 12]}
+
+    itd = client.post(
+        "/performance/twr",
+        json={**payload, "analyses": [{"period": "ITD", "frequencies": ["monthly"], "rolling": rolling}]},
+    ).json()
+    ytd = client.post(
+        "/performance/twr",
+        json={**payload, "analyses": [{"period": "YTD", "frequencies": ["monthly"], "rolling": rolling}]},
+    ).json()
+
+    assert itd["diagnostics"]["reset_days"] > 0
+    for window, items in ytd["results_by_period"]["YTD"]["rolling_returns"].items():
+        itd_items = itd["results_by_period"]["ITD"]["rolling_returns"][window]
+        assert items
+        assert items == [item for item in itd_items if item["window_end"] >= "2025-01-01"]
+
+
 def test_calculate_twr_endpoint_multi_period(client):
     """Tests a multi-period request for MTD and YTD."""
     payload = {
@@ -254,6 +391,151 @@ def test_twr_respects_include_timeseries_flag(client):
     assert "daily_data" not in daily_breakdown_without
 
 
+def test_twr_columnar_timeseries_format_matches_the_row_format(client):
+    """output.timeseries_format='columnar' returns each frequency as parallel arrays of the row values."""
+    payload = {
+        "portfolio_id": "COLUMNAR_OUTPUT_TEST",
+        "performance_start_date": "2024-12-31",
+        "metric_basis": "NET",
+        "report_end_date": "2025-02-04",
+        "analyses": [{"period": "ITD", "frequencies": ["daily", "monthly"]}],
+        "valuation_points": {
+            "perf_date": ["2025-01-02", "2025-01-03", "2025-01-31", "2025-02-03", "2025-02-04"],
+            "begin_mv": [1000.0, 1010.0, 1005.0, 1020.0, 1032.0],
+            "end_mv": [1010.0, 1005.0, 1020.0, 1032.0, 1029.0],
+        },
+        "output": {"include_timeseries": True, "include_cumulative": True},
+        "annualization": {"enabled": True},
+    }
+    rows = client.post("/performance/twr", json=payload).json()["results_by_period"]["ITD"]
+
+    payload["output"]["timeseries_format"] = "columnar"
+    response = client.post("/performance/twr", json=payload)
+    assert response.status_code == 200
+    columnar = response.json()["results_by_period"]["ITD"]
+
+    assert columnar["portfolio_return"] == rows["portfolio_return"]
+    for frequency, items in rows["breakdowns"].items():
+        columns = columnar["breakdowns"][frequency]
+        assert columns["period"] == [item["period"] for item in items]
+        for field in ("begin_mv", "end_mv", "net_cash_flow", "period_return_pct", "cumulative_return_pct_to_date"):
+            assert columns[field] == [item["summary"][field] for item in items]
+    # Only aggregated periods are annualized, so the daily breakdown has no annualized column.
+    assert "annualized_return_pct" not in columnar["breakdowns"]["daily"]
+    assert columnar["breakdowns"]["monthly"]["annualized_return_pct"] == [
+        item["summary"]["annualized_return_pct"] for item in rows["breakdowns"]["monthly"]
+    ]
+    daily_rows = [item["daily_data"][0] for item in rows["breakdowns"]["daily"]]
+    assert columnar["breakdowns"]["daily"]["daily_data"] == {
+        name: [row[name] for row in daily_rows] for name in daily_rows[0]
+    }
+    assert "daily_data" not in columnar["breakdowns"]["monthly"]
+
+
+def test_twr_streams_ndjson_records_matching_the_json_response(client):
+    """With Accept: application/x-ndjson the response streams as records that rebuild the JSON response."""
+    payload = {
+        "calculation_id": str(uuid4()),
+        "portfolio_id": "NDJSON_STREAM_TEST",
+        "performance_start_date": "2024-12-31",
+        "metric_basis": "NET",
+        "report_end_date": "2025-02-04",
+        "analyses": [
+            {"period": "ITD", "frequencies": ["daily", "monthly"]},
+            {"period": "MTD", "frequencies": ["daily"]},
+        ],
+        "valuation_points": {
+            "perf_date": ["2025-01-02", "2025-01-03", "2025-01-31", "2025-02-03", "2025-02-04"],
+            "begin_mv": [1000.0, 1010.0, 1005.0, 1020.0, 1032.0],
+            "end_mv": [1010.0, 1005.0, 1020.0, 1032.0, 1029.0],
+        },
+        "output": {"include_timeseries": True},
+    }
+    expected = client.post("/performance/twr", json=payload).json()
+
+    response = client.post("/performance/twr", json=payload, headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["record"] for record in records].count("breakdown") == 5 + 2 + 2
+
+    header = records[0]
+    assert header.pop("record") == "header"
+    rebuilt = {**header, "results_by_period": {}}
+    for record in records[1:]:
+        kind, period = record.pop("record"), record.pop("period")
+        if kind == "period":
+            rebuilt["results_by_period"][period] = {"breakdowns": {}, **record}
+        else:
+            assert kind == "breakdown"
+            breakdowns = rebuilt["results_by_period"][period]["breakdowns"]
+            breakdowns.setdefault(record["frequency"], []).append(record["item"])
+
+    assert rebuilt == expected
+
+
+def _ndjson_stream_payload():
+    return {
+        "calculation_id": str(uuid4()),
+        "portfolio_id": "NDJSON_STREAM_TEST",
+        "performance_start_date": "2024-12-31",
+        "metric_basis": "NET",
+        "report_end_date": "2025-01-03",
+        "analyses": [{"period": "ITD", "frequencies": ["daily", "monthly"]}],
+        "valuation_points": {
+            "perf_date": ["2025-01-01", "2025-01-02", "2025-01-03"],
+            "begin_mv": [1000.0, 1010.0, 1005.0],
+            "end_mv": [1010.0, 1005.0, 1020.0],
+        },
+        "output": {"include_timeseries": True},
+    }
+
+
+def test_twr_streamed_lineage_captures_the_streamed_breakdowns(client):
+    """Lineage of a streamed response holds the same breakdowns as lineage of the JSON response."""
+    lineage_path = get_settings().LINEAGE_STORAGE_PATH
+    json_payload = _ndjson_stream_payload()
+    stream_payload = {**json_payload, "calculation_id": str(uuid4())}
+
+    client.post("/performance/twr", json=json_payload)
+    client.post("/performance/twr", json=stream_payload, headers={"Accept": "application/x-ndjson"})
+
+    captured = {}
+    for payload in (json_payload, stream_payload):
+        with open(os.path.join(lineage_path, payload["calculation_id"], "response.json")) as f:
+            captured[payload["calculation_id"]] = json.load(f)["results_by_period"]
+    assert captured[stream_payload["calculation_id"]]["ITD"]["breakdowns"]["daily"]
+    assert captured[stream_payload["calculation_id"]] == captured[json_payload["calculation_id"]]
+
+
+def test_twr_stream_failing_mid_response_ends_with_an_error_record(client, monkeypatch):
+    """A failure after the status line is sent is logged and closes the stream with an error record."""
+
+    def failing_items(*args, **kwargs):
+        raise RuntimeError("breakdown failed")
+        yield
+
+    def failing_breakdowns(*args, **kwargs):
+        raise RuntimeError("breakdown failed")
+
+    monkeypatch.setattr("app.api.endpoints.performance.iter_breakdown_items", failing_items)
+    monkeypatch.setattr("app.api.endpoints.performance.format_breakdowns_for_response", failing_breakdowns)
+    payload = {**_ndjson_stream_payload(), "calculation_id": str(uuid4())}
+
+    response = client.post("/performance/twr", json=payload, headers={"Accept": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["record"] for record in records[:-1]] == ["header", "period"]
+    assert records[-1] == {"record": "error", "detail": "An unexpected server error occurred: breakdown failed"}
+    # Lineage still records the period totals that were streamed, without breakdowns.
+    lineage_path = get_settings().LINEAGE_STORAGE_PATH
+    with open(os.path.join(lineage_path, payload["calculation_id"], "response.json")) as f:
+        captured_itd = json.load(f)["results_by_period"]["ITD"]
+    assert captured_itd["portfolio_return"] == records[1]["portfolio_return"]
+    assert not captured_itd["breakdowns"]
+
+
 def test_twr_response_includes_portfolio_return_summary(client):
     """Tests that the top-level portfolio_return object is present for single-currency requests."""
     payload = {
@@ -325,6 +607,17 @@ def test_calculate_twr_endpoint_error_handling(client, mocker, error_class, expe
     assert "detail" in response.json()
 
 
+def test_twr_reports_malformed_json_bodies_as_validation_errors(client):
+    """Bodies parsed with orjson still report JSON syntax errors as 422 json_invalid."""
+    response = client.post(
+        "/performance/twr",
+        content=b'{"portfolio_id": "MALFORMED", "valuation_points": [',
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+
+
 def test_twr_returns_400_when_no_periods_resolve(client, mocker):
     mocker.patch("app.api.endpoints.performance.resolve_periods", return_value=[])
     payload = {
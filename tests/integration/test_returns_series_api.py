@@ -88,6 +88,35 @@ def test_returns_series_weekly_uses_geometric_linking():
     assert abs(actual - expected) < Decimal("0.0000000001")
 
 
+def test_returns_series_columnar_format_returns_parallel_arrays():
+    payload = {
+        "portfolio_id": "DEMO_DPM_EUR_001",
+        "as_of_date": "2026-02-27",
+        "window": {"mode": "EXPLICIT", "from_date": "2026-02-23", "to_date": "2026-02-27"},
+        "frequency": "DAILY",
+        "metric_basis": "NET",
+        "series_selection": {"include_portfolio": True, "include_benchmark": True},
+        "source": {
+            "input_mode": "inline_bundle",
+            "inline_bundle": {"portfolio_returns": _daily_points(), "benchmark_returns": _daily_points()},
+        },
+    }
+
+    with TestClient(app) as client:
+        rows = client.post("/integration/returns/series", json=payload).json()["series"]
+        response = client.post("/integration/returns/series", json={**payload, "timeseries_format": "columnar"})
+
+    assert response.status_code == 200
+    series = response.json()["series"]
+    assert "risk_free_returns" not in series
+    for name in ("portfolio_returns", "benchmark_returns"):
+        assert series[name] == {
+            "date": [point["date"] for point in rows[name]],
+            "return_value": [point["return_value"] for point in rows[name]],
+        }
+    assert series["portfolio_returns"]["return_value"][0] == "0.010000000000"
+
+
 def test_returns_series_strict_intersection_aligns_dates():
     benchmark_points = [
         {"date": "2026-02-24", "return_value": "0.0050"},
@@ -2,16 +2,21 @@
 from datetime import date
 from typing import Any, Dict, List
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from adapters.api_adapter import (
     create_engine_config,
     create_engine_dataframe,
+    create_valuation_dataframe,
+    first_valuation_date,
+    format_breakdown_columns,
     format_breakdowns_for_response,
 )
-from app.models.requests import PerformanceRequest
-from app.models.responses import PerformanceResultItem, PerformanceSummary
+from app.api.serialization import encode_excluding_none
+from app.models.requests import DailyInputData, PerformanceRequest, ValuationPointColumns
+from app.models.responses import PerformanceBreakdownColumns, PerformanceResultItem, PerformanceSummary
 from common.enums import Frequency, PeriodType
 from engine.config import EngineConfig
 from engine.schema import PortfolioColumns
@@ -112,6 +117,26 @@ def test_create_engine_dataframe_raises_error():
         create_engine_dataframe(malformed_api_data)
 
 
+def test_create_valuation_dataframe_builds_the_same_frame_from_columns_and_rows():
+    """Columnar valuation points give the engine exactly the frame per-day points give it."""
+    rows = [
+        DailyInputData(day=1, perf_date=date(2025, 1, 1), begin_mv=1000.0, end_mv=1010.0),
+        DailyInputData(day=2, perf_date=date(2025, 1, 2), begin_mv=1010.0, bod_cf=5.0, end_mv=1020.0),
+        DailyInputData(day=3, perf_date=date(2025, 1, 2), begin_mv=1010.0, eod_cf=-2.0, end_mv=1021.0),
+    ]
+    columns = ValuationPointColumns(
+        perf_date=[row.perf_date for row in rows],
+        begin_mv=[row.begin_mv for row in rows],
+        bod_cf=[row.bod_cf for row in rows],
+        eod_cf=[row.eod_cf for row in rows],
+        end_mv=[row.end_mv for row in rows],
+    )
+
+    pd.testing.assert_frame_equal(create_valuation_dataframe(columns), create_valuation_dataframe(rows))
+    assert first_valuation_date(columns) == first_valuation_date(rows) == date(2025, 1, 1)
+    assert create_valuation_dataframe(ValuationPointColumns(perf_date=[], begin_mv=[], end_mv=[])).empty
+
+
 def test_format_breakdowns_for_response_daily(sample_engine_outputs):
     """Tests that the daily breakdown is formatted correctly with snake_case keys."""
     breakdowns_data, daily_results_df = sample_engine_outputs
@@ -160,3 +185,86 @@ def test_format_breakdowns_populates_daily_cumulative_return(sample_engine_outpu
 
     daily_summary = formatted_response[Frequency.DAILY][0].summary
     assert daily_summary.cumulative_return_pct_to_date is None
+
+
+def test_format_breakdowns_keeps_daily_rows_aligned_across_chunks():
+    """Items validated a chunk at a time each keep their own daily row, and items past the frame get none."""
+    rows = 2500
+    breakdowns_data = {
+        Frequency.DAILY: [
+            {
+                "period": f"day-{i}",
+                "summary": {
+                    PortfolioColumns.BEGIN_MV: float(i),
+                    PortfolioColumns.END_MV: float(i + 1),
+                    "net_cash_flow": 0.0,
+                    "period_return_pct": 1.0,
+                },
+            }
+            for i in range(rows)
+        ]
+    }
+    daily_results_df = pd.DataFrame({PortfolioColumns.BEGIN_MV.value: np.arange(rows - 1, dtype=float)})
+
+    daily_breakdown = format_breakdowns_for_response(breakdowns_data, daily_results_df, include_timeseries=True)[
+        Frequency.DAILY
+    ]
+
+    assert [item.period for item in daily_breakdown] == [f"day-{i}" for i in range(rows)]
+    assert all(item.summary.begin_mv == item.daily_data[0]["begin_mv"] for item in daily_breakdown[:-1])
+    assert daily_breakdown[-1].daily_data is None
+
+
+def test_format_breakdown_columns_returns_parallel_arrays(sample_engine_outputs):
+    """Columnar breakdowns carry one array entry per item, with the daily rows as columns."""
+    breakdowns_data, daily_results_df = sample_engine_outputs
+    breakdowns_data[Frequency.MONTHLY].append(
+        {
+            "period": "2025-02",
+            "summary": {
+                PortfolioColumns.BEGIN_MV: 1010.0,
+                PortfolioColumns.END_MV: 1030.2,
+                "net_cash_flow": 0.0,
+                "period_return_pct": 2.0,
+                "cumulative_return_pct_to_date": 3.02,
+                "annualized_return_pct": 26.8,
+            },
+        }
+    )
+
+    formatted_response = format_breakdown_columns(breakdowns_data, daily_results_df, include_timeseries=True)
+
+    monthly = formatted_response[Frequency.MONTHLY]
+    assert isinstance(monthly, PerformanceBreakdownColumns)
+    assert monthly.period == ["2025-01", "2025-02"]
+    assert monthly.end_mv == [1010.0, 1030.2]
+    assert monthly.cumulative_return_pct_to_date == [1.0, 3.02]
+    assert np.isnan(monthly.annualized_return_pct[0])
+    assert monthly.annualized_return_pct[1] == 26.8
+    assert monthly.daily_data is None
+
+    daily = formatted_response[Frequency.DAILY]
+    assert daily.annualized_return_pct is None
+    assert daily.daily_data[PortfolioColumns.BEGIN_MV.value] == [1000.0]
+    assert daily.daily_data[PortfolioColumns.PERF_DATE.value] == [date(2025, 1, 1)]
+
+
+def test_format_breakdown_columns_keeps_missing_daily_entries_in_place(sample_engine_outputs):
+    """Missing daily values render as nulls in place, so every column keeps one entry per day."""
+    breakdowns_data, _ = sample_engine_outputs
+    breakdowns_data[Frequency.DAILY].append({**breakdowns_data[Frequency.DAILY][0], "period": "2025-01-02"})
+    daily_results_df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: [date(2025, 1, 1), date(2025, 1, 2)],
+            PortfolioColumns.DAILY_ROR.value: [np.nan, 1.0],
+            PortfolioColumns.LONG_SHORT.value: ["L", None],
+        }
+    )
+
+    columns = format_breakdown_columns(breakdowns_data, daily_results_df, include_timeseries=True)[Frequency.DAILY]
+    rendered = encode_excluding_none(columns.model_dump(mode="json"))["daily_data"]
+
+    assert {name: len(values) for name, values in rendered.items()} == dict.fromkeys(rendered, 2)
+    assert np.isnan(rendered[PortfolioColumns.DAILY_ROR.value][0])
+    assert np.isnan(rendered[PortfolioColumns.LONG_SHORT.value][1])
+    assert rendered[PortfolioColumns.PERF_DATE.value] == ["2025-01-01", "2025-01-02"]
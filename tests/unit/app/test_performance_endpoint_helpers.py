@@ -8,6 +8,7 @@ from app.api.endpoints.performance import (
     _calculate_total_return_from_slice,
     _get_total_cum_ror,
 )
+from core.date_dimension import EpochDayIndex
 from engine.schema import PortfolioColumns
 
 
@@ -131,3 +132,19 @@ def test_calculate_total_return_from_slice_non_reset_handles_zero_fx_denominator
     result = _calculate_total_return_from_slice(non_reset_df, non_reset_df)
     assert result.local == pytest.approx(-100.0)
     assert result.fx == 0.0
+
+
+def test_calculate_total_return_from_slice_reset_measures_from_the_day_before_the_slice():
+    full_df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)],
+            PortfolioColumns.PERF_RESET.value: [False, False, True],
+            PortfolioColumns.FINAL_CUM_ROR.value: [5.0, 10.0, 21.0],
+        }
+    )
+    day_index = EpochDayIndex(full_df[PortfolioColumns.PERF_DATE.value])
+
+    result = _calculate_total_return_from_slice(full_df.iloc[2:], full_df, day_index)
+
+    assert result.base == pytest.approx(10.0)
+    assert result == _calculate_total_return_from_slice(full_df.iloc[2:], full_df)
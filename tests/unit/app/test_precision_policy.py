@@ -1,10 +1,13 @@
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
 from app.precision_policy import (
+    PERFORMANCE_SCALE,
     ROUNDING_POLICY_VERSION,
     normalize_input,
+    quantize_array,
     quantize_fx_rate,
     quantize_money,
     quantize_performance,
@@ -60,3 +63,28 @@ def test_normalize_input_rejects_unknown_semantic_type() -> None:
 def test_normalize_input_handles_non_integer_exponent() -> None:
     value = normalize_input(Decimal("NaN"), "money")
     assert value.is_nan()
+
+
+def test_quantize_array_matches_decimal_quantization_of_each_value() -> None:
+    rng = np.random.default_rng(7)
+    midpoints = [float(f"{n}5e-7") for n in rng.integers(-(10**6), 10**6, 500)]
+    values = np.concatenate(
+        [rng.normal(0, 5, 2_000), rng.normal(0, 1e-6, 500), midpoints, [0.0, -0.0, -4e-7, 1e17, 12.9999995]]
+    )
+
+    result = quantize_array(values, PERFORMANCE_SCALE)
+
+    expected = [float(quantize_performance(value)) for value in values.tolist()]
+    assert result.tolist() == expected
+    assert np.signbit(result).tolist() == np.signbit(expected).tolist()
+
+
+def test_quantize_array_quantizes_decimals_and_keeps_missing_values() -> None:
+    result = quantize_array(np.array([Decimal("1.005"), Decimal("-2.675")], dtype=object), Decimal("0.01"))
+    assert result.tolist() == [1.0, -2.68]
+    assert np.isnan(quantize_array([np.nan, 1.0], Decimal("0.01"))[0])
+
+
+def test_quantize_array_rejects_a_non_finite_scale() -> None:
+    with pytest.raises(ValueError, match="Invalid quantization scale"):
+        quantize_array(np.array([1.25]), Decimal("NaN"))
@@ -1,20 +1,32 @@
 import json
 from pathlib import Path
 
+import numpy as np
+
 from app.precision_policy import (
     ROUNDING_POLICY_VERSION,
     quantize_fx_rate,
+    quantize_fx_rate_array,
     quantize_money,
+    quantize_money_array,
     quantize_performance,
+    quantize_performance_array,
     quantize_price,
+    quantize_price_array,
     quantize_quantity,
+    quantize_quantity_array,
     quantize_risk,
+    quantize_risk_array,
 )
 
 
-def test_rounding_golden_vectors() -> None:
+def _golden_vectors() -> dict:
     fixture = Path(__file__).resolve().parents[2] / "fixtures" / "rounding-golden-vectors.json"
-    payload = json.loads(fixture.read_text(encoding="utf-8"))
+    return json.loads(fixture.read_text(encoding="utf-8"))
+
+
+def test_rounding_golden_vectors() -> None:
+    payload = _golden_vectors()
     assert ROUNDING_POLICY_VERSION == payload["policy_version"]
     quantizers = {
         "money": quantize_money,
@@ -27,3 +39,19 @@ def test_rounding_golden_vectors() -> None:
     for semantic, quantizer in quantizers.items():
         actual = [str(quantizer(value)) for value in payload["vectors"][semantic]]
         assert actual == payload["expected"][semantic]
+
+
+def test_array_rounding_golden_vectors() -> None:
+    payload = _golden_vectors()
+    quantizers = {
+        "money": quantize_money_array,
+        "price": quantize_price_array,
+        "fx_rate": quantize_fx_rate_array,
+        "quantity": quantize_quantity_array,
+        "performance": quantize_performance_array,
+        "risk": quantize_risk_array,
+    }
+    for semantic, quantizer in quantizers.items():
+        vectors = np.array([float(value) for value in payload["vectors"][semantic]])
+        expected = [float(value) for value in payload["expected"][semantic]]
+        assert quantizer(vectors).tolist() == expected
@@ -0,0 +1,19 @@
+import json
+
+from app.api.serialization import iter_ndjson_chunks
+
+
+def test_iter_ndjson_chunks_writes_one_line_per_record_without_nulls():
+    records = [{"record": "header", "note": None}, {"values": [1.5, None]}]
+    body = b"".join(iter_ndjson_chunks(records))
+    assert body == b'{"record":"header"}\n{"values":[1.5]}\n'
+
+
+def test_iter_ndjson_chunks_groups_lines_into_chunks_of_about_the_given_size():
+    records = [{"day": day, "padding": "x" * 40} for day in range(100)]
+    chunks = list(iter_ndjson_chunks(records, chunk_bytes=512))
+    assert len(chunks) > 1
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    assert all(len(chunk) < 512 + 64 for chunk in chunks)
+    lines = b"".join(chunks).splitlines()
+    assert [json.loads(line)["day"] for line in lines] == list(range(100))
@@ -0,0 +1,124 @@
+# tests/unit/core/test_date_dimension.py
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.date_dimension import DateDimension, EpochDayIndex, get_date_dimension, to_epoch_days
+
+
+@pytest.fixture(scope="module")
+def random_dates() -> pd.Series:
+    rng = np.random.default_rng(11)
+    epoch_days = rng.integers(pd.Timestamp("1678-01-01").value // 86_400_000_000_000, 106_000, 5_000)
+    return pd.Series(pd.to_datetime(epoch_days, unit="D"))
+
+
+def test_small_table_attributes_match_pandas():
+    """Every attribute array of a table built over a short range, checked day by day against pandas."""
+    days = pd.date_range("2023-12-25", "2025-03-10")
+    calendar = DateDimension(np.datetime64("2023-12-25", "D"), np.datetime64("2025-03-10", "D"))
+
+    def as_dates(epoch_days):
+        return epoch_days.astype("datetime64[D]").astype("datetime64[ns]")
+
+    for attribute, freq in [("month_start", "M"), ("quarter_start", "Q"), ("year_start", "Y")]:
+        expected = days.to_period(freq).start_time.to_numpy()
+        np.testing.assert_array_equal(as_dates(getattr(calendar, attribute)), expected)
+    np.testing.assert_array_equal(calendar.is_month_end, days.is_month_end)
+    np.testing.assert_array_equal(as_dates(calendar.week_ending_friday), (days + pd.offsets.Week(weekday=4, n=0)))
+    business_days = pd.bdate_range(days[0], days[-1])
+    np.testing.assert_array_equal(calendar.business_day_ordinal, np.cumsum(days.isin(business_days)))
+    np.testing.assert_array_equal(calendar.month_end_ordinal, np.cumsum(days.is_month_end))
+    assert calendar.count_business_days(date(2023, 12, 25), date(2025, 3, 10)) == len(business_days)
+    with pytest.raises(ValueError, match="between 2023-12-25 and 2025-03-10"):
+        calendar.month_end(date(2025, 3, 11))
+
+
+def test_get_date_dimension_builds_one_shared_table():
+    get_date_dimension.cache_clear()
+    calendar = get_date_dimension()
+
+    assert get_date_dimension() is calendar
+    assert calendar.period_start(date(1677, 1, 1), "Y").item() == date(1677, 1, 1)
+
+
+@pytest.mark.parametrize("freq", ["M", "Q", "Y"])
+def test_period_start_matches_pandas_periods(random_dates, freq):
+    expected = random_dates.dt.to_period(freq).dt.start_time.to_numpy()
+
+    result = get_date_dimension().period_start(random_dates, freq)
+
+    np.testing.assert_array_equal(result.astype("datetime64[ns]"), expected)
+
+
+def test_month_end_and_week_ending_match_pandas(random_dates):
+    calendar = get_date_dimension()
+
+    np.testing.assert_array_equal(calendar.month_end(random_dates), random_dates.dt.is_month_end.to_numpy())
+    expected_fridays = (random_dates + pd.offsets.Week(weekday=4, n=0)).to_numpy()
+    np.testing.assert_array_equal(calendar.week_ending(random_dates).astype("datetime64[ns]"), expected_fridays)
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (date(2025, 1, 1), date(2025, 1, 1)),
+        (date(2025, 1, 3), date(2025, 1, 10)),
+        (date(2024, 2, 26), date(2024, 3, 31)),
+        (date(2019, 6, 15), date(2025, 8, 29)),
+        (date(2025, 3, 1), date(2025, 2, 1)),
+    ],
+)
+def test_range_counts_match_pandas_date_ranges(start, end):
+    calendar = get_date_dimension()
+
+    assert calendar.count_business_days(start, end) == len(pd.bdate_range(start, end))
+    assert calendar.count_month_ends(start, end) == len(pd.date_range(start, end, freq="ME"))
+    assert calendar.count_week_endings(start, end) == len(pd.date_range(start, end, freq="W-FRI"))
+
+
+def test_scalar_lookups_return_dates():
+    assert get_date_dimension().period_start(date(2025, 8, 31), "Q").item() == date(2025, 7, 1)
+
+
+def test_rejects_dates_outside_the_table_and_unknown_frequencies():
+    calendar = get_date_dimension()
+
+    with pytest.raises(ValueError, match="Dates must lie between"):
+        calendar.month_end(np.datetime64("2300-01-01"))
+    with pytest.raises(ValueError, match="Unsupported period frequency"):
+        calendar.period_start(date(2025, 1, 1), "W")
+
+
+def test_to_epoch_days_accepts_dates_strings_and_timestamps():
+    expected = np.array([0, 20_090], dtype=np.int32)
+
+    np.testing.assert_array_equal(to_epoch_days(pd.Series([date(1970, 1, 1), date(2025, 1, 2)])), expected)
+    np.testing.assert_array_equal(to_epoch_days(pd.to_datetime(["1970-01-01 09:30", "2025-01-02 00:00"])), expected)
+    assert to_epoch_days("2025-01-02") == 20_090
+
+
+@pytest.mark.parametrize(
+    "perf_dates",
+    [
+        ["2025-01-02", "2025-01-02", "2025-01-03", "2025-01-06"],
+        ["2025-01-06", "2025-01-02", "2025-01-03", "2025-01-02"],
+    ],
+)
+def test_epoch_day_index_windows_match_date_masks(perf_dates):
+    """Sorted columns are searched and unsorted ones masked; both select the same rows."""
+    frame = pd.DataFrame({"perf_date": pd.to_datetime(perf_dates).date, "row": range(4)})
+    day_index = EpochDayIndex(frame["perf_date"])
+
+    for start, end in [
+        (date(2025, 1, 2), date(2025, 1, 3)),
+        (date(2025, 1, 3), date(2025, 1, 5)),
+        (date(2025, 1, 7), date(2025, 1, 9)),
+    ]:
+        expected = frame[(frame["perf_date"] >= start) & (frame["perf_date"] <= end)]
+        pd.testing.assert_frame_equal(frame.iloc[day_index.window(start, end)], expected)
+
+        earlier = frame.index[frame["perf_date"] < start]
+        assert day_index.last_before(start) == (earlier[-1] if len(earlier) else None)
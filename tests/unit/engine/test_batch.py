@@ -0,0 +1,213 @@
+# tests/unit/engine/test_batch.py
+from dataclasses import replace
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.requests import DataPolicy
+from engine.batch import run_batch_calculations
+from engine.compute import run_calculations
+from engine.config import EngineConfig, PeriodType, PrecisionMode
+from engine.exceptions import EngineCalculationError, InvalidEngineInputError
+from engine.schema import PortfolioColumns
+from tests.unit.engine import characterization_data as scenarios
+
+SCENARIOS = {
+    "growth": scenarios.standard_growth_scenario,
+    "long_flip": scenarios.long_flip_scenario,
+    "short_flip": scenarios.short_flip_scenario,
+    "nip": scenarios.zero_value_nip_scenario,
+    "eod_flip_net": scenarios.eod_flip_net_scenario,
+    "multi_currency": scenarios.multi_currency_scenario,
+    "cumulative": scenarios.cumulative_return_scenario,
+}
+
+
+def _scenario_inputs(scenario):
+    config, input_df, _ = scenario()
+    # Not every scenario carries a day counter; give all of them one so the stacked column stays integer.
+    input_df[PortfolioColumns.DAY.value] = range(1, len(input_df) + 1)
+    return config, input_df
+
+
+def _stacked_scenarios():
+    frames, configs = [], {}
+    for portfolio_id, scenario in SCENARIOS.items():
+        config, input_df = _scenario_inputs(scenario)
+        frames.append(input_df.assign(**{PortfolioColumns.PORTFOLIO_ID.value: portfolio_id}))
+        configs[portfolio_id] = config
+    return pd.concat(frames, ignore_index=True), configs
+
+
+def test_run_batch_calculations_matches_individual_runs():
+    """Every portfolio in a stacked batch gets exactly the result of its own single run."""
+    stacked_df, configs = _stacked_scenarios()
+
+    results = run_batch_calculations(stacked_df, configs)
+
+    assert list(results) == list(SCENARIOS)
+    for portfolio_id, scenario in SCENARIOS.items():
+        config, input_df = _scenario_inputs(scenario)
+        expected_df, expected_diagnostics = run_calculations(input_df, config)
+        result_df, diagnostics = results[portfolio_id]
+        pd.testing.assert_frame_equal(result_df, expected_df, check_like=True)
+        assert diagnostics == expected_diagnostics
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {"lean_memory": True},
+        {"output_columns": (PortfolioColumns.PERF_DATE.value, PortfolioColumns.FINAL_CUM_ROR.value)},
+        {"lean_memory": True, "output_columns": (PortfolioColumns.PERF_DATE.value, PortfolioColumns.LONG_SHORT.value)},
+        # Reads nothing from the cumulative pass, so single runs report reset_days as None.
+        {
+            "emit_reset_events": False,
+            "output_columns": (PortfolioColumns.PERF_DATE.value, PortfolioColumns.DAILY_ROR.value),
+        },
+    ],
+)
+def test_run_batch_calculations_applies_lean_memory_and_output_columns_per_portfolio(settings):
+    """Lean results and column projections match each portfolio's own single run."""
+    stacked_df, configs = _stacked_scenarios()
+    configs = {portfolio_id: replace(config, **settings) for portfolio_id, config in configs.items()}
+    configs["growth"] = replace(configs["growth"], lean_memory=False, output_columns=None)
+
+    results = run_batch_calculations(stacked_df, configs)
+
+    for portfolio_id, scenario in SCENARIOS.items():
+        _, input_df = _scenario_inputs(scenario)
+        expected_df, expected_diagnostics = run_calculations(input_df, configs[portfolio_id])
+        result_df, diagnostics = results[portfolio_id]
+        pd.testing.assert_frame_equal(result_df, expected_df, check_like=True)
+        assert ("memory" in diagnostics) == configs[portfolio_id].lean_memory
+        diagnostics.pop("memory", None)
+        expected_diagnostics.pop("memory", None)
+        assert diagnostics == expected_diagnostics
+
+
+def test_run_batch_calculations_does_not_compound_across_portfolios():
+    """Interleaved rows are regrouped per portfolio and compounding restarts for each one."""
+    config = EngineConfig(
+        performance_start_date=date(2024, 12, 31),
+        report_end_date=date(2025, 1, 2),
+        metric_basis="GROSS",
+        period_type=PeriodType.YTD,
+    )
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PORTFOLIO_ID.value: ["A", "B", "A", "B"],
+            PortfolioColumns.PERF_DATE.value: ["2025-01-01", "2025-01-01", "2025-01-02", "2025-01-02"],
+            PortfolioColumns.BEGIN_MV.value: [100.0, 100.0, 110.0, 95.0],
+            PortfolioColumns.END_MV.value: [110.0, 95.0, 121.0, 99.75],
+        }
+    )
+
+    results = run_batch_calculations(df, {"A": config, "B": config})
+
+    assert results["A"][0][PortfolioColumns.FINAL_CUM_ROR.value].tolist() == [10.0, 21.0]
+    assert results["B"][0][PortfolioColumns.FINAL_CUM_ROR.value].tolist() == [-5.0, -0.25]
+
+
+def test_run_batch_calculations_applies_data_policies_per_portfolio():
+    """Overrides, ignored days and outlier flags apply to their own portfolio only, as in single runs."""
+    rng = np.random.default_rng(5)
+    perf_dates = pd.date_range("2025-01-01", periods=40)
+    frames = []
+    for portfolio_id in ["overrides", "ignore_and_outliers", "plain"]:
+        begin_mv = 1000 + rng.normal(0, 5, 40).round(2)
+        end_mv = (begin_mv * (1 + rng.normal(0, 0.002, 40))).round(2)
+        end_mv[25] = begin_mv[25] * 1.4
+        frames.append(
+            pd.DataFrame(
+                {
+                    PortfolioColumns.PORTFOLIO_ID.value: portfolio_id,
+                    PortfolioColumns.DAY.value: np.arange(1, 41),
+                    PortfolioColumns.PERF_DATE.value: perf_dates,
+                    PortfolioColumns.BEGIN_MV.value: begin_mv,
+                    PortfolioColumns.END_MV.value: end_mv,
+                }
+            )
+        )
+    base_config = EngineConfig(
+        performance_start_date=date(2024, 12, 31),
+        report_end_date=date(2025, 2, 9),
+        metric_basis="GROSS",
+        period_type=PeriodType.YTD,
+    )
+    configs = {
+        "overrides": replace(
+            base_config,
+            data_policy=DataPolicy.model_validate(
+                {
+                    "overrides": {
+                        "market_values": [{"perf_date": "2025-01-10", "end_mv": 1100.0}],
+                        "cash_flows": [{"perf_date": "2025-01-11", "bod_cf": 50.0}],
+                    }
+                }
+            ),
+        ),
+        "ignore_and_outliers": replace(
+            base_config,
+            data_policy=DataPolicy.model_validate(
+                {
+                    "ignore_days": [
+                        {"entity_type": "PORTFOLIO", "entity_id": "ignore_and_outliers", "dates": ["2025-01-05"]}
+                    ],
+                    "outliers": {"enabled": True, "action": "FLAG", "params": {"window": 10, "mad_k": 3.0}},
+                }
+            ),
+        ),
+        "plain": base_config,
+    }
+
+    results = run_batch_calculations(pd.concat(frames, ignore_index=True), configs)
+
+    for frame in frames:
+        portfolio_id = frame[PortfolioColumns.PORTFOLIO_ID.value].iloc[0]
+        single_df = frame.drop(columns=[PortfolioColumns.PORTFOLIO_ID.value])
+        expected_df, expected_diagnostics = run_calculations(single_df, configs[portfolio_id])
+        result_df, diagnostics = results[portfolio_id]
+        pd.testing.assert_frame_equal(result_df, expected_df, check_like=True)
+        assert diagnostics == expected_diagnostics
+    assert results["overrides"][1]["policy"]["overrides"] == {"applied_mv_count": 1, "applied_cf_count": 1}
+    assert results["ignore_and_outliers"][1]["policy"]["ignored_days_count"] == 1
+    assert results["ignore_and_outliers"][1]["policy"]["outliers"]["flagged_rows"] > 0
+
+
+def test_run_batch_calculations_empty_dataframe():
+    assert run_batch_calculations(pd.DataFrame(), {}) == {}
+
+
+def test_run_batch_calculations_requires_a_dataframe():
+    with pytest.raises(InvalidEngineInputError, match="pandas DataFrame"):
+        run_batch_calculations([{"portfolio_id": "A"}], {})
+
+
+def test_run_batch_calculations_requires_one_precision_mode():
+    stacked_df, configs = _stacked_scenarios()
+    configs["nip"] = replace(configs["nip"], precision_mode=PrecisionMode.DECIMAL_STRICT)
+    with pytest.raises(InvalidEngineInputError, match="precision_mode"):
+        run_batch_calculations(stacked_df, configs)
+
+
+def test_run_batch_calculations_wraps_unexpected_errors(mocker):
+    stacked_df, configs = _stacked_scenarios()
+    mocker.patch("engine.batch.calculate_cumulative_ror", side_effect=RuntimeError("boom"))
+    with pytest.raises(EngineCalculationError, match="Batch engine calculation failed unexpectedly: boom"):
+        run_batch_calculations(stacked_df, configs)
+
+
+def test_run_batch_calculations_requires_portfolio_id():
+    config, input_df, _ = scenarios.standard_growth_scenario()
+    with pytest.raises(InvalidEngineInputError, match="portfolio_id"):
+        run_batch_calculations(input_df, {"growth": config})
+
+
+def test_run_batch_calculations_requires_config_per_portfolio():
+    stacked_df, configs = _stacked_scenarios()
+    configs.pop("nip")
+    with pytest.raises(InvalidEngineInputError, match="nip"):
+        run_batch_calculations(stacked_df, configs)
@@ -1,12 +1,13 @@
 # tests/unit/engine/test_breakdown.py
 from datetime import date
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from common.enums import Frequency
 from core.envelope import Annualization
-from engine.breakdown import _calculate_period_summary_dict, generate_performance_breakdowns
+from engine.breakdown import generate_performance_breakdowns
 from engine.schema import PortfolioColumns
 
 
@@ -113,11 +114,11 @@ def test_annualization_correctly_handles_sparse_long_period():
         PortfolioColumns.FINAL_CUM_ROR: [2.0, 5.0],
     }
     df = pd.DataFrame(year_long_sparse_data)
-    df_indexed = df.set_index(pd.to_datetime(df[PortfolioColumns.PERF_DATE]))
 
     annualization_config = Annualization(enabled=True, basis="ACT/365")
 
-    summary = _calculate_period_summary_dict(df_indexed, df_indexed, annualization_config, False, rounding_precision=6)
+    breakdowns = generate_performance_breakdowns(df, [Frequency.YEARLY], annualization_config, False)
+    summary = breakdowns[Frequency.YEARLY][0]["summary"]
 
     assert "annualized_return_pct" in summary
     assert summary["annualized_return_pct"] == pytest.approx(4.986004, abs=1e-6)
@@ -154,3 +155,69 @@ def test_generate_breakdowns_skips_empty_resample_buckets(default_annualization)
         sparse, [Frequency.MONTHLY], default_annualization, False, rounding_precision=6
     )
     assert len(breakdowns[Frequency.MONTHLY]) == 2
+
+
+def test_generate_breakdowns_skips_missing_daily_returns_like_series_prod(sample_daily_results, default_annualization):
+    sample_daily_results.loc[1, PortfolioColumns.DAILY_ROR] = np.nan
+
+    breakdowns = generate_performance_breakdowns(
+        sample_daily_results, [Frequency.MONTHLY], default_annualization, False, rounding_precision=6
+    )
+
+    jan, feb = (item["summary"] for item in breakdowns[Frequency.MONTHLY])
+    assert jan["period_return_pct"] == pytest.approx(10.0)
+    assert feb["period_return_pct"] == pytest.approx(3.030303)
+
+
+def test_generate_breakdowns_aggregates_unsorted_days_in_date_order(default_annualization):
+    """Periods take their first and last values by date, while daily results keep row order."""
+    unsorted = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE: [date(2025, 2, 3), date(2025, 1, 31), date(2025, 2, 4), date(2025, 1, 30)],
+            PortfolioColumns.BEGIN_MV: [121.0, 110.0, 135.0, 100.0],
+            PortfolioColumns.BOD_CF: [10.0, 0.0, 0.0, 0.0],
+            PortfolioColumns.EOD_CF: [0.0, 0.0, 5.0, 0.0],
+            PortfolioColumns.END_MV: [135.0, 121.0, 140.0, 110.0],
+            PortfolioColumns.DAILY_ROR: [3.0, 10.0, 0.0, 10.0],
+            PortfolioColumns.FINAL_CUM_ROR: [24.63, 21.0, 24.63, 10.0],
+        }
+    )
+
+    breakdowns = generate_performance_breakdowns(
+        unsorted, [Frequency.DAILY, Frequency.MONTHLY], default_annualization, True
+    )
+
+    assert [item["period"] for item in breakdowns[Frequency.DAILY]] == [
+        "2025-02-03",
+        "2025-01-31",
+        "2025-02-04",
+        "2025-01-30",
+    ]
+    jan, feb = (item["summary"] for item in breakdowns[Frequency.MONTHLY])
+    assert (jan["begin_mv"], jan["end_mv"], jan["period_return_pct"]) == (100.0, 121.0, 21.0)
+    assert (feb["begin_mv"], feb["end_mv"], feb["net_cash_flow"]) == (121.0, 140.0, 15.0)
+
+
+def test_rolled_up_breakdowns_match_breakdowns_requested_alone():
+    """Quarters and years found from monthly periods equal those computed straight from the days."""
+    rng = np.random.default_rng(3)
+    perf_dates = pd.bdate_range("2022-11-15", "2025-02-10")
+    daily = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE: perf_dates.date,
+            PortfolioColumns.BEGIN_MV: rng.uniform(90, 110, len(perf_dates)),
+            PortfolioColumns.BOD_CF: rng.choice([0.0, 5.0], len(perf_dates)),
+            PortfolioColumns.EOD_CF: rng.choice([0.0, -3.0], len(perf_dates)),
+            PortfolioColumns.END_MV: rng.uniform(90, 110, len(perf_dates)),
+            PortfolioColumns.DAILY_ROR: rng.normal(0, 1, len(perf_dates)),
+            PortfolioColumns.FINAL_CUM_ROR: rng.normal(0, 5, len(perf_dates)),
+        }
+    )
+    annualization = Annualization(enabled=True, basis="ACT/365")
+    frequencies = [Frequency.MONTHLY, Frequency.QUARTERLY, Frequency.YEARLY]
+
+    combined = generate_performance_breakdowns(daily.copy(), frequencies, annualization, True)
+
+    for freq in frequencies:
+        assert combined[freq] == generate_performance_breakdowns(daily.copy(), [freq], annualization, True)[freq]
+    assert [item["period"] for item in combined[Frequency.QUARTERLY]][:2] == ["2022-Q4", "2023-Q1"]
@@ -0,0 +1,198 @@
+# tests/unit/engine/test_checkpoint.py
+import json
+from dataclasses import replace
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.checkpoint import EngineCheckpoint, LegCarry, SeriesCarry
+from engine.compute import run_calculations
+from engine.config import EngineConfig, PeriodType, PrecisionMode
+from engine.exceptions import InvalidEngineInputError
+from engine.schema import PortfolioColumns
+
+
+def _volatile_history(n_days: int = 60) -> pd.DataFrame:
+    """Daily history with sign flips, cash flows and large swings so resets and NIP days occur."""
+    rng = np.random.default_rng(11)
+    begin_mv = rng.normal(100, 80, n_days).round(2)
+    end_mv = (begin_mv * (1 + rng.normal(0, 0.8, n_days))).round(2)
+    begin_mv[::9] = 0.0
+    end_mv[::9] = 0.0
+    return pd.DataFrame(
+        {
+            PortfolioColumns.DAY.value: np.arange(1, n_days + 1),
+            PortfolioColumns.PERF_DATE.value: pd.date_range("2024-12-20", periods=n_days),
+            PortfolioColumns.BEGIN_MV.value: begin_mv,
+            PortfolioColumns.BOD_CF.value: np.where(rng.random(n_days) < 0.2, rng.normal(0, 150, n_days).round(2), 0.0),
+            PortfolioColumns.EOD_CF.value: np.where(rng.random(n_days) < 0.2, rng.normal(0, 150, n_days).round(2), 0.0),
+            PortfolioColumns.MGMT_FEES.value: 0.0,
+            PortfolioColumns.END_MV.value: end_mv,
+        }
+    )
+
+
+def _config(history: pd.DataFrame, precision_mode: PrecisionMode) -> EngineConfig:
+    return EngineConfig(
+        performance_start_date=date(2024, 12, 25),
+        report_end_date=history[PortfolioColumns.PERF_DATE.value].iloc[-1].date(),
+        metric_basis="NET",
+        period_type=PeriodType.YTD,
+        precision_mode=precision_mode,
+    )
+
+
+@pytest.mark.parametrize("precision_mode", [PrecisionMode.FLOAT64, PrecisionMode.DECIMAL_STRICT])
+def test_incremental_runs_match_full_recalculation(precision_mode):
+    """Chained incremental runs reproduce the full recalculation exactly, day by day."""
+    history = _volatile_history()
+    config = _config(history, precision_mode)
+
+    _, diagnostics = run_calculations(history.iloc[:40].copy(), config, emit_checkpoint=True)
+    checkpoint = diagnostics["checkpoint"]
+    covered = 40
+    for end in [41, 42, 50, 60]:
+        new_rows = history.iloc[covered:end].copy()
+        result_df, diagnostics = run_calculations(new_rows, config, checkpoint=checkpoint, emit_checkpoint=True)
+        checkpoint = diagnostics["checkpoint"]
+        covered = end
+
+        # The previous last day is re-evaluated alongside the new days.
+        assert len(result_df) == len(new_rows) + 1
+        expected_df, _ = run_calculations(history.iloc[:end].copy(), config)
+        expected_df = expected_df.iloc[-len(result_df) :].reset_index(drop=True)
+        pd.testing.assert_frame_equal(result_df.reset_index(drop=True), expected_df, check_like=True)
+
+    assert checkpoint.last_date == date(2025, 2, 17)
+
+
+@pytest.mark.parametrize("precision_mode", [PrecisionMode.FLOAT64, PrecisionMode.DECIMAL_STRICT])
+def test_checkpoint_round_trips_through_json(precision_mode):
+    history = _volatile_history(30)
+    config = _config(history, precision_mode)
+
+    _, diagnostics = run_calculations(history.iloc[:20].copy(), config, emit_checkpoint=True)
+    restored = EngineCheckpoint.from_dict(json.loads(json.dumps(diagnostics["checkpoint"].to_dict())))
+
+    assert restored == diagnostics["checkpoint"]
+    resumed_df, _ = run_calculations(history.iloc[20:].copy(), config, checkpoint=restored)
+    expected_df, _ = run_calculations(history.copy(), config)
+    pd.testing.assert_frame_equal(
+        resumed_df.reset_index(drop=True), expected_df.iloc[-len(resumed_df) :].reset_index(drop=True), check_like=True
+    )
+
+
+def test_single_day_run_emits_checkpoint_without_anchor():
+    history = _volatile_history(5)
+    config = _config(history, PrecisionMode.FLOAT64)
+
+    _, diagnostics = run_calculations(history.iloc[:1].copy(), config, emit_checkpoint=True)
+
+    assert diagnostics["checkpoint"].anchor is None
+    assert diagnostics["checkpoint"].last_date == date(2024, 12, 20)
+
+
+def test_incremental_run_rejects_dates_already_covered():
+    history = _volatile_history(10)
+    config = _config(history, PrecisionMode.FLOAT64)
+    _, diagnostics = run_calculations(history.iloc[:5].copy(), config, emit_checkpoint=True)
+
+    with pytest.raises(InvalidEngineInputError, match="after the checkpoint"):
+        run_calculations(history.iloc[4:].copy(), config, checkpoint=diagnostics["checkpoint"])
+
+
+def test_incremental_run_rejects_precision_mode_mismatch():
+    history = _volatile_history(10)
+    _, diagnostics = run_calculations(
+        history.iloc[:5].copy(), _config(history, PrecisionMode.FLOAT64), emit_checkpoint=True
+    )
+
+    with pytest.raises(InvalidEngineInputError, match="precision_mode"):
+        run_calculations(
+            history.iloc[5:].copy(),
+            _config(history, PrecisionMode.DECIMAL_STRICT),
+            checkpoint=diagnostics["checkpoint"],
+        )
+
+
+def test_incremental_run_follows_a_moving_report_end_for_calendar_periods():
+    """YTD periods start on calendar dates, so each increment may report up to its own last day."""
+    history = _volatile_history(30)
+    first = replace(_config(history, PrecisionMode.FLOAT64), report_end_date=date(2025, 1, 8))
+    _, diagnostics = run_calculations(history.iloc[:20].copy(), first, emit_checkpoint=True)
+
+    config = _config(history, PrecisionMode.FLOAT64)
+    resumed_df, _ = run_calculations(history.iloc[20:].copy(), config, checkpoint=diagnostics["checkpoint"])
+    expected_df, _ = run_calculations(history.copy(), config)
+    pd.testing.assert_frame_equal(
+        resumed_df.reset_index(drop=True), expected_df.iloc[-len(resumed_df) :].reset_index(drop=True), check_like=True
+    )
+
+
+def test_incremental_run_rejects_a_period_start_moved_by_report_end_date():
+    """A one-year period starts a year before report_end_date, so moving that date moves the period."""
+    history = _volatile_history(30)
+    first = EngineConfig(
+        performance_start_date=date(2024, 12, 25),
+        report_end_date=date(2025, 1, 8),
+        metric_basis="NET",
+        period_type=PeriodType.ONE_YEAR,
+    )
+    _, diagnostics = run_calculations(history.iloc[:20].copy(), first, emit_checkpoint=True)
+
+    with pytest.raises(InvalidEngineInputError, match="period starting"):
+        run_calculations(
+            history.iloc[20:].copy(),
+            replace(first, report_end_date=date(2025, 1, 18)),
+            checkpoint=diagnostics["checkpoint"],
+        )
+
+
+def test_incremental_run_rejects_period_type_mismatch():
+    history = _volatile_history(10)
+    config = _config(history, PrecisionMode.FLOAT64)
+    _, diagnostics = run_calculations(history.iloc[:5].copy(), config, emit_checkpoint=True)
+
+    with pytest.raises(InvalidEngineInputError, match="period_type"):
+        run_calculations(
+            history.iloc[5:].copy(), replace(config, period_type=PeriodType.MTD), checkpoint=diagnostics["checkpoint"]
+        )
+
+
+def test_incremental_run_rejects_batch_input():
+    history = _volatile_history(10)
+    config = _config(history, PrecisionMode.FLOAT64)
+    _, diagnostics = run_calculations(history.iloc[:5].copy(), config, emit_checkpoint=True)
+
+    with pytest.raises(InvalidEngineInputError, match="single series"):
+        run_calculations(
+            history.iloc[5:].assign(**{PortfolioColumns.PORTFOLIO_ID.value: "A"}),
+            config,
+            checkpoint=diagnostics["checkpoint"],
+        )
+
+
+def test_checkpoint_serializes_numpy_scalars_as_plain_numbers():
+    checkpoint = EngineCheckpoint(
+        precision_mode=PrecisionMode.FLOAT64,
+        pending_row={PortfolioColumns.PERF_DATE.value: date(2025, 1, 2), PortfolioColumns.END_MV.value: 101.5},
+        anchor=SeriesCarry(
+            perf_date=date(2025, 1, 1),
+            effective_period_start_date=date(2025, 1, 1),
+            sign=1,
+            eod_cf=np.float64(0.0),
+            initial_reset=False,
+            legs={"temp_long_cum_ror": LegCarry(growth=np.float64(1.015), ror=np.float64(1.5))},
+            cum_rors={"temp_long_cum_ror": np.float64(1.5)},
+        ),
+        effective_period_start=date(2025, 1, 1),
+        period_type=PeriodType.YTD,
+        period_start=date(2025, 1, 1),
+    )
+
+    anchor = json.loads(json.dumps(checkpoint.to_dict()))["anchor"]
+
+    assert anchor["legs"] == {"temp_long_cum_ror": {"growth": 1.015, "ror": 1.5}}
+    assert EngineCheckpoint.from_dict(checkpoint.to_dict()) == checkpoint
@@ -1,12 +1,13 @@
 # tests/unit/engine/test_compute.py
+from dataclasses import replace
 from datetime import date
 from decimal import Decimal
 
 import pandas as pd
 import pytest
 
-from engine.compute import run_calculations
-from engine.config import EngineConfig, PeriodType, PrecisionMode
+from engine.compute import _extract_reset_events, run_calculations
+from engine.config import EngineConfig, FXRequestBlock, PeriodType, PrecisionMode
 from engine.exceptions import EngineCalculationError, InvalidEngineInputError
 from engine.schema import PortfolioColumns
 
@@ -91,6 +92,9 @@ def test_run_calculations_invalid_date_input():
     df = pd.DataFrame(data)
     with pytest.raises(InvalidEngineInputError, match="One or more 'perf_date' values are invalid or missing."):
         run_calculations(df, config)
+    # The pandas pipeline validates dates the same way as the array backend.
+    with pytest.raises(InvalidEngineInputError, match="One or more 'perf_date' values are invalid or missing."):
+        run_calculations(df, replace(config, array_backend_max_rows=0))
 
 
 def test_run_calculations_unexpected_exception_handling(mocker):
@@ -100,6 +104,7 @@ def test_run_calculations_unexpected_exception_handling(mocker):
         report_end_date=date(2025, 1, 1),
         metric_basis="NET",
         period_type=PeriodType.YTD,
+        array_backend_max_rows=0,
     )
     data = {
         PortfolioColumns.PERF_DATE.value: ["2025-01-01"],
@@ -134,6 +139,7 @@ def test_run_calculations_emits_all_reset_reason_codes(mocker):
         report_end_date=date(2025, 1, 1),
         metric_basis="NET",
         period_type=PeriodType.YTD,
+        array_backend_max_rows=0,
     )
     df = pd.DataFrame(
         {
@@ -168,3 +174,237 @@ def test_run_calculations_emits_all_reset_reason_codes(mocker):
     assert "NCTRL_2" in diagnostics["resets"][0]["reason"]
     assert "NCTRL_3" in diagnostics["resets"][0]["reason"]
     assert "NCTRL_4" in diagnostics["resets"][0]["reason"]
+
+
+def test_run_calculations_decimal_strict_handles_nip_and_fx():
+    """DECIMAL_STRICT keeps every return column in Decimal across NIP days and FX decomposition."""
+    config = EngineConfig(
+        performance_start_date=date(2024, 12, 31),
+        report_end_date=date(2025, 1, 4),
+        metric_basis="NET",
+        period_type=PeriodType.YTD,
+        precision_mode=PrecisionMode.DECIMAL_STRICT,
+        currency_mode="BOTH",
+        fx=FXRequestBlock.model_validate(
+            {
+                "rates": [
+                    {"date": date(2024, 12, 31), "ccy": "EUR", "rate": 1.10},
+                    {"date": date(2025, 1, 1), "ccy": "EUR", "rate": 1.12},
+                    {"date": date(2025, 1, 3), "ccy": "EUR", "rate": 1.09},
+                ]
+            }
+        ),
+    )
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"]),
+            PortfolioColumns.BEGIN_MV.value: [100.0, 0.0, 0.0, 110.0],
+            PortfolioColumns.BOD_CF.value: [0.0, 0.0, 110.0, 0.0],
+            PortfolioColumns.EOD_CF.value: [-105.0, 0.0, 0.0, 0.0],
+            PortfolioColumns.MGMT_FEES.value: [0.0, 0.0, 0.0, 0.0],
+            PortfolioColumns.END_MV.value: [105.0, 0.0, 110.0, 111.1],
+        }
+    )
+
+    result_df, diagnostics = run_calculations(df, config)
+
+    assert diagnostics["nip_days"] == 1
+    for column in ["daily_ror", "local_ror", "fx_ror", "long_cum_ror", "final_cum_ror"]:
+        assert all(isinstance(value, Decimal) for value in result_df[column]), column
+    assert result_df["local_ror"].iloc[3] == Decimal("1")
+    assert result_df["fx_ror"].iloc[0] == (Decimal("1.12") / Decimal("1.1") - 1) * 100
+
+
+def test_extract_reset_events_decodes_reason_bitmask():
+    """Reset events are built from masked NCTRL columns, one event per reset row, in date order."""
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04"]),
+            PortfolioColumns.PERF_RESET.value: [1, 0, 1, 1],
+            PortfolioColumns.NCTRL_1.value: [1, 1, 0, 0],
+            PortfolioColumns.NCTRL_2.value: [0, 0, 0, 0],
+            PortfolioColumns.NCTRL_3.value: [0, 0, 0, 0],
+            PortfolioColumns.NCTRL_4.value: [1, 0, 0, 1],
+        }
+    )
+
+    assert _extract_reset_events(df) == [
+        {"date": date(2025, 1, 1), "reason": "NCTRL_1,NCTRL_4", "impacted_rows": 1},
+        {"date": date(2025, 1, 3), "reason": "UNKNOWN", "impacted_rows": 1},
+        {"date": date(2025, 1, 4), "reason": "NCTRL_4", "impacted_rows": 1},
+    ]
+
+
+def test_run_calculations_skips_reset_events_when_not_emitted():
+    config = EngineConfig(
+        performance_start_date=date(2025, 1, 1),
+        report_end_date=date(2025, 1, 1),
+        metric_basis="NET",
+        period_type=PeriodType.YTD,
+        emit_reset_events=False,
+    )
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: [date(2025, 1, 1)],
+            PortfolioColumns.BEGIN_MV.value: [100.0],
+            PortfolioColumns.BOD_CF.value: [0.0],
+            PortfolioColumns.EOD_CF.value: [0.0],
+            PortfolioColumns.MGMT_FEES.value: [0.0],
+            PortfolioColumns.END_MV.value: [-50.0],
+        }
+    )
+
+    result_df, diagnostics = run_calculations(df, config)
+
+    assert result_df[PortfolioColumns.PERF_RESET.value].iloc[0] == 1
+    assert diagnostics["resets"] == []
+
+
+@pytest.mark.parametrize("array_backend_max_rows", [0, 10_000])
+def test_run_calculations_keeps_pre_reset_legs_out_of_the_result(array_backend_max_rows):
+    """Resets are still detected from the pre-reset legs, which are not materialized as columns."""
+    config = EngineConfig(
+        performance_start_date=date(2025, 1, 1),
+        report_end_date=date(2025, 1, 3),
+        metric_basis="NET",
+        period_type=PeriodType.YTD,
+        array_backend_max_rows=array_backend_max_rows,
+    )
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03"]),
+            PortfolioColumns.BEGIN_MV.value: [100.0, 50.0, 10.0],
+            PortfolioColumns.BOD_CF.value: [0.0, 0.0, 0.0],
+            PortfolioColumns.EOD_CF.value: [0.0, 1.0, 0.0],
+            PortfolioColumns.MGMT_FEES.value: [0.0, 0.0, 0.0],
+            PortfolioColumns.END_MV.value: [50.0, -5.0, 11.0],
+        }
+    )
+
+    result_df, _ = run_calculations(df, config)
+
+    assert result_df[PortfolioColumns.NCTRL_1.value].tolist() == [0, 1, 0]
+    assert result_df[PortfolioColumns.LONG_CUM_ROR.value].tolist() == [-50.0, 0.0, 10.0]
+    assert not [col for col in result_df.columns if col.startswith("temp_")]
+
+
+@pytest.mark.parametrize("array_backend_max_rows", [0, 10_000])
+def test_run_calculations_lean_memory_compacts_the_result(array_backend_max_rows):
+    """Lean mode returns the same values with narrow flag dtypes and reports the frame's peak footprint."""
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03"]),
+            PortfolioColumns.BEGIN_MV.value: [100.0, 50.0, 10.0],
+            PortfolioColumns.BOD_CF.value: [0.0, 0.0, 0.0],
+            PortfolioColumns.EOD_CF.value: [0.0, 1.0, 0.0],
+            PortfolioColumns.MGMT_FEES.value: [0.0, 0.0, 0.0],
+            PortfolioColumns.END_MV.value: [50.0, -5.0, 11.0],
+        }
+    )
+    config = EngineConfig(
+        performance_start_date=date(2025, 1, 1),
+        report_start_date=date(2025, 1, 2),
+        report_end_date=date(2025, 1, 3),
+        metric_basis="NET",
+        period_type=PeriodType.YTD,
+        array_backend_max_rows=array_backend_max_rows,
+    )
+    expected_df, expected_diagnostics = run_calculations(df.copy(), config)
+
+    result_df, diagnostics = run_calculations(df.copy(), replace(config, lean_memory=True))
+
+    assert diagnostics.pop("memory")["peak_frame_bytes"] > 0
+    assert diagnostics == expected_diagnostics
+    assert PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value not in result_df.columns
+    assert result_df[PortfolioColumns.NCTRL_1.value].dtype == "int8"
+    assert result_df[PortfolioColumns.PERF_RESET.value].dtype == "int8"
+    assert isinstance(result_df[PortfolioColumns.LONG_SHORT.value].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        result_df,
+        expected_df.drop(columns=[PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value]),
+        check_dtype=False,
+        check_categorical=False,
+    )
+
+
+def test_run_calculations_lean_memory_reports_the_same_peak_on_both_backends():
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03"]),
+            PortfolioColumns.BEGIN_MV.value: [100.0, 50.0, 10.0],
+            PortfolioColumns.END_MV.value: [50.0, -5.0, 11.0],
+        }
+    )
+    config = EngineConfig(
+        performance_start_date=date(2025, 1, 1),
+        report_end_date=date(2025, 1, 3),
+        metric_basis="NET",
+        period_type=PeriodType.YTD,
+        lean_memory=True,
+    )
+
+    _, array_diagnostics = run_calculations(df.copy(), config)
+    _, pandas_diagnostics = run_calculations(df.copy(), replace(config, array_backend_max_rows=0))
+
+    assert array_diagnostics["memory"] == pandas_diagnostics["memory"]
+
+
+def test_run_calculations_lean_memory_with_checkpoint_drops_period_starts_from_filtered_results():
+    """The period start column kept for the checkpoint is dropped from results filtered to a later report start."""
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03"]),
+            PortfolioColumns.BEGIN_MV.value: [100.0, 50.0, 10.0],
+            PortfolioColumns.END_MV.value: [50.0, -5.0, 11.0],
+        }
+    )
+    config = EngineConfig(
+        performance_start_date=date(2025, 1, 1),
+        report_start_date=date(2025, 1, 2),
+        report_end_date=date(2025, 1, 3),
+        metric_basis="NET",
+        period_type=PeriodType.YTD,
+        lean_memory=True,
+    )
+
+    result_df, diagnostics = run_calculations(df, config, emit_checkpoint=True)
+
+    assert len(result_df) == 2
+    assert PortfolioColumns.EFFECTIVE_PERIOD_START_DATE.value not in result_df.columns
+    assert diagnostics["checkpoint"].period_start == date(2025, 1, 1)
+
+
+@pytest.mark.parametrize("array_backend_max_rows", [0, 10_000])
+def test_run_calculations_projects_output_columns(array_backend_max_rows):
+    """Projected runs return the requested columns of the full run; reset work is skipped when unread."""
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03"]),
+            PortfolioColumns.BEGIN_MV.value: [100.0, 50.0, 10.0],
+            PortfolioColumns.BOD_CF.value: [0.0, 0.0, 0.0],
+            PortfolioColumns.EOD_CF.value: [0.0, 1.0, 0.0],
+            PortfolioColumns.MGMT_FEES.value: [0.0, 0.0, 0.0],
+            PortfolioColumns.END_MV.value: [50.0, -5.0, 11.0],
+        }
+    )
+    config = EngineConfig(
+        performance_start_date=date(2025, 1, 1),
+        report_end_date=date(2025, 1, 3),
+        metric_basis="NET",
+        period_type=PeriodType.YTD,
+        emit_reset_events=False,
+        array_backend_max_rows=array_backend_max_rows,
+    )
+    full_df, full_diagnostics = run_calculations(df.copy(), config)
+
+    returns_only = (PortfolioColumns.DAILY_ROR.value, PortfolioColumns.PERF_DATE.value, "local_ror")
+    result_df, diagnostics = run_calculations(df.copy(), replace(config, output_columns=returns_only))
+    pd.testing.assert_frame_equal(
+        result_df, full_df[[PortfolioColumns.PERF_DATE.value, PortfolioColumns.DAILY_ROR.value]]
+    )
+    assert diagnostics == {**full_diagnostics, "reset_days": None}
+
+    with_resets = (PortfolioColumns.PERF_DATE.value, PortfolioColumns.NCTRL_1.value)
+    result_df, diagnostics = run_calculations(df.copy(), replace(config, output_columns=with_resets))
+    pd.testing.assert_frame_equal(result_df, full_df[list(with_resets)])
+    assert diagnostics == full_diagnostics
@@ -0,0 +1,101 @@
+# tests/unit/engine/test_fastpath.py
+from dataclasses import replace
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.enums import PeriodType
+from core.envelope import DataPolicy
+from engine.compute import run_calculations
+from engine.config import EngineConfig, FeatureFlags, PrecisionMode
+from engine.fastpath import supports_array_backend
+from engine.schema import PortfolioColumns
+
+
+def _volatile_history(n_days: int = 70) -> pd.DataFrame:
+    """Daily history with sign flips, cash flows, NIP days and large swings so every reset rule fires."""
+    rng = np.random.default_rng(7)
+    begin_mv = rng.normal(100, 90, n_days).round(2)
+    end_mv = (begin_mv * (1 + rng.normal(0, 0.9, n_days))).round(2)
+    begin_mv[::11] = 0.0
+    end_mv[::11] = 0.0
+    return pd.DataFrame(
+        {
+            PortfolioColumns.DAY.value: np.arange(1, n_days + 1),
+            PortfolioColumns.PERF_DATE.value: pd.date_range("2024-12-15", periods=n_days),
+            PortfolioColumns.BEGIN_MV.value: begin_mv,
+            PortfolioColumns.BOD_CF.value: np.where(rng.random(n_days) < 0.2, rng.normal(0, 150, n_days).round(2), 0.0),
+            PortfolioColumns.EOD_CF.value: np.where(rng.random(n_days) < 0.2, rng.normal(0, 150, n_days).round(2), 0.0),
+            PortfolioColumns.MGMT_FEES.value: np.where(rng.random(n_days) < 0.1, -0.25, 0.0),
+            PortfolioColumns.END_MV.value: end_mv,
+        }
+    )
+
+
+def _config(**overrides) -> EngineConfig:
+    settings = dict(
+        performance_start_date=date(2024, 12, 20),
+        report_end_date=date(2025, 2, 10),
+        metric_basis="NET",
+        period_type=PeriodType.YTD,
+    )
+    settings.update(overrides)
+    return EngineConfig(**settings)
+
+
+@pytest.mark.parametrize("period_type", list(PeriodType))
+@pytest.mark.parametrize("metric_basis", ["NET", "GROSS"])
+def test_array_backend_matches_pandas_pipeline(period_type, metric_basis):
+    config = _config(period_type=period_type, metric_basis=metric_basis, report_start_date=date(2025, 1, 5))
+    history = _volatile_history()
+    assert supports_array_backend(history, config)
+
+    result_df, diagnostics = run_calculations(history.copy(), config)
+    expected_df, expected_diagnostics = run_calculations(history.copy(), replace(config, array_backend_max_rows=0))
+
+    pd.testing.assert_frame_equal(result_df, expected_df, check_exact=True)
+    assert diagnostics == expected_diagnostics
+
+
+def test_array_backend_matches_pandas_pipeline_for_sparse_input():
+    """Missing optional columns, extra columns, a custom index and the NIP v2 rule are all preserved."""
+    history = _volatile_history(30).drop(columns=[PortfolioColumns.DAY.value, PortfolioColumns.MGMT_FEES.value])
+    history["account"] = "A-1"
+    history.index = history.index * 2 + 100
+    history[PortfolioColumns.PERF_DATE.value] = history[PortfolioColumns.PERF_DATE.value].dt.date
+    config = _config(feature_flags=FeatureFlags(use_nip_v2_rule=True), rounding_precision=2)
+
+    result_df, diagnostics = run_calculations(history.copy(), config)
+    expected_df, expected_diagnostics = run_calculations(history.copy(), replace(config, array_backend_max_rows=0))
+
+    pd.testing.assert_frame_equal(result_df, expected_df, check_exact=True)
+    assert diagnostics == expected_diagnostics
+    assert diagnostics["resets"]
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"array_backend_max_rows": 10},
+        {"precision_mode": PrecisionMode.DECIMAL_STRICT},
+        {"data_policy": DataPolicy.model_validate({"ignore_days": []})},
+    ],
+)
+def test_supports_array_backend_rejects_unsupported_runs(overrides):
+    assert not supports_array_backend(_volatile_history(20), _config(**overrides))
+
+
+def test_supports_array_backend_rejects_stacked_or_integer_frames():
+    history = _volatile_history(20)
+    assert not supports_array_backend(history.assign(portfolio_id="P1"), _config())
+    assert not supports_array_backend(history.assign(begin_mv=1), _config())
+
+
+def test_supports_array_backend_rejects_frames_without_plain_dates_or_days():
+    history = _volatile_history(20)
+    assert not supports_array_backend(history.drop(columns=[PortfolioColumns.PERF_DATE.value]), _config())
+    duplicated = pd.concat([history, history[[PortfolioColumns.END_MV.value]]], axis=1)
+    assert not supports_array_backend(duplicated, _config())
+    assert not supports_array_backend(history.assign(**{PortfolioColumns.DAY.value: "1"}), _config())
@@ -0,0 +1,46 @@
+# tests/unit/engine/test_fixed_point.py
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from engine.fixed_point import decimal_sign, to_decimal_series, to_scaled_units
+
+
+def test_to_scaled_units_picks_smallest_exact_scale():
+    units, scale = to_scaled_units(np.array([1000.0, 1234.56, -0.1]))
+    assert scale == 2
+    assert units.tolist() == [100000, 123456, -10]
+
+
+def test_to_scaled_units_rejects_values_beyond_money_scale():
+    assert to_scaled_units(np.array([1.123456789])) is None
+
+
+def test_to_scaled_units_rejects_values_too_large_to_be_exact():
+    assert to_scaled_units(np.array([1e17 + 0.5])) is None
+
+
+def test_to_scaled_units_rejects_infinite_values():
+    assert to_scaled_units(np.array([1.5, np.nan, np.inf])) is None
+
+
+def test_to_decimal_series_matches_string_conversion():
+    """Scaled-unit conversion must be value-identical to the Decimal(str(x)) path it replaces."""
+    values = pd.Series([101.12, 0.1, -2500.0, np.nan, 99999999.99])
+
+    result = to_decimal_series(values)
+
+    expected = [Decimal(str(v)) if pd.notna(v) else Decimal(0) for v in values]
+    assert result.tolist() == expected
+    assert all(isinstance(v, Decimal) for v in result)
+
+
+def test_to_decimal_series_falls_back_for_unscalable_values():
+    result = to_decimal_series(pd.Series([1.123456789]))
+    assert result.iloc[0] == Decimal("1.123456789")
+
+
+def test_decimal_sign_is_vectorized_over_decimals():
+    result = decimal_sign(pd.Series([Decimal("-3.5"), Decimal("0"), Decimal("0.01")], dtype=object))
+    assert result.tolist() == [-1, 0, 1]
@@ -0,0 +1,58 @@
+# tests/unit/engine/test_fx.py
+from datetime import date
+
+import numpy as np
+import pytest
+
+from core.envelope import FXRequestBlock
+from engine.fx import FxRateIndex, get_fx_rate_index
+
+
+@pytest.fixture
+def fx_block():
+    return FXRequestBlock.model_validate(
+        {
+            "rates": [
+                {"date": "2025-01-03", "ccy": "EUR", "rate": 1.10},
+                {"date": "2025-01-01", "ccy": "EUR", "rate": 1.05},
+                {"date": "2025-01-03", "ccy": "EUR", "rate": 1.12},
+                {"date": "2025-01-02", "ccy": "GBP", "rate": 1.25},
+            ]
+        }
+    )
+
+
+def test_asof_carries_rates_forward_and_keeps_last_duplicate(fx_block):
+    index = FxRateIndex.from_rates(fx_block.rates)
+    dates = np.array(["2024-12-31", "2025-01-01", "2025-01-02", "2025-01-03", "2025-01-09"], dtype="datetime64[D]")
+
+    np.testing.assert_array_equal(index.asof(dates, ccy="EUR"), [np.nan, 1.05, 1.05, 1.12, 1.12])
+    np.testing.assert_array_equal(index.asof(dates, ccy="GBP"), [np.nan, np.nan, 1.25, 1.25, 1.25])
+    assert np.isnan(index.asof(dates, ccy="JPY")).all()
+
+
+def test_asof_ignores_rates_before_floor(fx_block):
+    index = FxRateIndex.from_rates(fx_block.rates)
+    dates = np.array(["2025-01-02", "2025-01-03"], dtype="datetime64[D]")
+
+    result = index.asof(dates, ccy="EUR", not_before=np.datetime64(date(2025, 1, 2), "D"))
+
+    np.testing.assert_array_equal(result, [np.nan, 1.12])
+
+
+def test_asof_requires_currency_when_several_are_indexed(fx_block):
+    with pytest.raises(ValueError, match="several currencies"):
+        FxRateIndex.from_rates(fx_block.rates).asof(np.array(["2025-01-02"], dtype="datetime64[D]"))
+
+
+def test_asof_without_currency_uses_the_only_indexed_one(fx_block):
+    dates = np.array(["2025-01-01", "2025-01-02"], dtype="datetime64[D]")
+    eur_only = FxRateIndex.from_rates([rate for rate in fx_block.rates if rate.ccy == "EUR"])
+
+    np.testing.assert_array_equal(eur_only.asof(dates), [1.05, 1.05])
+    assert np.isnan(FxRateIndex.from_rates([]).asof(dates)).all()
+
+
+def test_get_fx_rate_index_is_built_once_per_block(fx_block):
+    assert get_fx_rate_index(fx_block) is get_fx_rate_index(fx_block)
+    assert get_fx_rate_index(fx_block) is not get_fx_rate_index(fx_block.model_copy(deep=True))
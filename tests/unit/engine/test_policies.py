@@ -1,4 +1,6 @@
 # tests/unit/engine/test_policies.py
+from decimal import Decimal
+
 import pandas as pd
 import pytest
 
@@ -84,6 +86,13 @@ def test_no_policy_does_nothing(sample_policy_df):
     assert diags["policy"]["ignored_days_count"] == 0
 
 
+def test_empty_overrides_leave_the_frame_untouched(sample_policy_df):
+    policy = DataPolicy.model_validate({"overrides": {"market_values": [], "cash_flows": []}})
+    result_df, diags = apply_robustness_policies(sample_policy_df, policy)
+    pd.testing.assert_frame_equal(result_df, sample_policy_df)
+    assert diags["policy"]["overrides"] == {"applied_mv_count": 0, "applied_cf_count": 0}
+
+
 def test_flag_outliers_returns_early_when_disabled(sample_policy_df):
     diagnostics = {"policy": {"outliers": {"flagged_rows": 0}}, "samples": {"outliers": []}}
     policy_model = DataPolicy.model_validate({"outliers": {"enabled": False}})
@@ -116,3 +125,86 @@ def test_flag_outliers_returns_early_when_daily_ror_missing(sample_policy_df):
     df_without_ror = sample_policy_df.drop(columns=[PortfolioColumns.END_MV.value]).copy()
     _flag_outliers(df_without_ror, policy_model, diagnostics)
     assert diagnostics["policy"]["outliers"]["flagged_rows"] == 0
+
+
+def test_apply_ignore_days_carries_forward_over_consecutive_days(sample_policy_df):
+    """Consecutive ignored days all carry the last non-ignored close, whatever order they are listed in."""
+    policy = DataPolicy.model_validate(
+        {
+            "ignore_days": [
+                {"entity_type": "PORTFOLIO", "entity_id": "P", "dates": ["2025-03-16"]},
+                {"entity_type": "PORTFOLIO", "entity_id": "P", "dates": ["2025-03-15"]},
+            ]
+        }
+    )
+    result_df, diags = apply_robustness_policies(sample_policy_df, policy)
+    assert result_df[PortfolioColumns.BEGIN_MV.value].tolist() == [100.0, 110.0, 110.0]
+    assert result_df[PortfolioColumns.END_MV.value].tolist() == [110.0, 110.0, 110.0]
+    assert result_df[PortfolioColumns.BOD_CF.value].tolist() == [0.0, 0.0, 0.0]
+    assert diags["policy"]["ignored_days_count"] == 2
+
+
+def test_apply_overrides_last_override_wins(sample_policy_df):
+    """Several overrides for the same day are all counted, and the last one listed is applied."""
+    policy = DataPolicy.model_validate(
+        {
+            "overrides": {
+                "market_values": [
+                    {"perf_date": "2025-03-15", "end_mv": 500.0},
+                    {"perf_date": "2025-03-15", "position_id": "P2", "end_mv": 600.0},
+                    {"perf_date": "2025-03-15", "begin_mv": 105.0, "end_mv": 700.0},
+                    {"perf_date": "2025-03-20", "end_mv": 800.0},
+                ]
+            }
+        }
+    )
+    result_df, diags = apply_robustness_policies(sample_policy_df, policy)
+    assert result_df[PortfolioColumns.BEGIN_MV.value].tolist() == [100.0, 105.0, 120.0]
+    assert result_df[PortfolioColumns.END_MV.value].tolist() == [110.0, 700.0, 130.0]
+    assert diags["policy"]["overrides"]["applied_mv_count"] == 3
+    assert sample_policy_df.loc[1, PortfolioColumns.END_MV.value] == 120.0
+
+
+def test_policies_keep_decimal_columns_decimal(sample_policy_df):
+    """In decimal mode, overridden and zeroed values stay `Decimal`."""
+    money_cols = [
+        PortfolioColumns.BEGIN_MV.value,
+        PortfolioColumns.END_MV.value,
+        PortfolioColumns.BOD_CF.value,
+        PortfolioColumns.EOD_CF.value,
+        PortfolioColumns.MGMT_FEES.value,
+    ]
+    for col in money_cols:
+        sample_policy_df[col] = sample_policy_df[col].apply(lambda x: Decimal(str(x)))
+    policy = DataPolicy.model_validate(
+        {
+            "overrides": {"cash_flows": [{"perf_date": "2025-03-14", "eod_cf": 2.5}]},
+            "ignore_days": [{"entity_type": "PORTFOLIO", "entity_id": "P", "dates": ["2025-03-15"]}],
+        }
+    )
+    result_df, _ = apply_robustness_policies(sample_policy_df, policy)
+    assert all(isinstance(value, Decimal) for col in money_cols for value in result_df[col])
+    assert result_df.loc[0, PortfolioColumns.EOD_CF.value] == Decimal("2.5")
+    assert result_df.loc[1, PortfolioColumns.END_MV.value] == Decimal("110.0")
+
+
+def test_flag_outliers_caps_samples_but_counts_every_outlier():
+    """Only the first `max_samples` outliers are sampled; `flagged_rows` still counts all of them."""
+    daily_ror = [1.0, 1.1, 0.9, 1.0] * 5
+    daily_ror[5], daily_ror[11], daily_ror[17] = 90.0, -80.0, 70.0
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: pd.date_range(start="2025-01-01", periods=20),
+            PortfolioColumns.DAILY_ROR.value: daily_ror,
+        }
+    )
+    policy_model = DataPolicy.model_validate(
+        {"outliers": {"enabled": True, "action": "FLAG", "params": {"window": 5, "mad_k": 3.0, "max_samples": 2}}}
+    )
+    diagnostics = {"policy": {"outliers": {"flagged_rows": 0}}, "samples": {"outliers": []}}
+    _flag_outliers(df, policy_model, diagnostics)
+    assert diagnostics["policy"]["outliers"]["flagged_rows"] == 3
+    assert [sample["date"] for sample in diagnostics["samples"]["outliers"]] == ["2025-01-06", "2025-01-12"]
+    assert diagnostics["samples"]["outliers"][1]["raw_return"] == -80.0
+    # Negative returns are reported against the lower bound, positive ones against the upper bound.
+    assert diagnostics["samples"]["outliers"][1]["threshold"] < 1.0 < diagnostics["samples"]["outliers"][0]["threshold"]
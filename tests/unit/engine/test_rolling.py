@@ -0,0 +1,135 @@
+# tests/unit/engine/test_rolling.py
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.enums import Frequency
+from core.envelope import Annualization
+from engine.rolling import generate_rolling_returns
+from engine.schema import PortfolioColumns
+
+
+def _daily_results(perf_dates, daily_rors, final_cum_rors=None, resets=None) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE.value: pd.to_datetime(perf_dates).date,
+            PortfolioColumns.DAILY_ROR.value: daily_rors,
+            PortfolioColumns.FINAL_CUM_ROR.value: final_cum_rors if final_cum_rors is not None else 0.0,
+            PortfolioColumns.PERF_RESET.value: resets if resets is not None else False,
+        }
+    )
+
+
+def test_rolling_returns_match_compounding_each_window():
+    """Every window equals the compounded daily returns of the days it covers."""
+    rng = np.random.default_rng(5)
+    perf_dates = pd.bdate_range("2021-01-01", "2024-06-28")
+    daily_rors = rng.normal(0.02, 1, len(perf_dates))
+    daily_rors[[40, 300]] = [-100.0, -130.0]
+    daily = _daily_results(perf_dates, daily_rors)
+
+    rolling = generate_rolling_returns(
+        daily,
+        [1, 12],
+        Frequency.MONTHLY,
+        Annualization(enabled=False),
+        date(2021, 1, 1),
+        date(2024, 6, 30),
+        date(2021, 1, 1),
+    )
+
+    assert list(rolling) == ["1M", "12M"]
+    assert len(rolling["1M"]) == 42
+    assert (rolling["1M"][0]["window_start"], rolling["1M"][0]["window_end"]) == (date(2021, 1, 1), date(2021, 1, 31))
+    assert (rolling["12M"][0]["window_start"], rolling["12M"][0]["window_end"]) == (
+        date(2021, 1, 1),
+        date(2021, 12, 31),
+    )
+    assert rolling["1M"][-1]["window_end"] == date(2024, 6, 30)
+    days = pd.to_datetime(daily[PortfolioColumns.PERF_DATE.value])
+    for item in rolling["1M"] + rolling["12M"]:
+        in_window = (days >= pd.Timestamp(item["window_start"])) & (days <= pd.Timestamp(item["window_end"]))
+        expected = ((1 + daily.loc[in_window, PortfolioColumns.DAILY_ROR.value] / 100).prod() - 1) * 100
+        assert item["return_pct"] == pytest.approx(expected, abs=1e-6)
+
+
+def test_rolling_windows_cover_whole_months_at_month_ends_and_skip_incomplete_history():
+    daily = _daily_results(["2025-01-31", "2025-02-28", "2025-03-30", "2025-03-31"], [1.0, 2.0, 0.5, 3.0])
+
+    rolling = generate_rolling_returns(
+        daily,
+        [1, 2],
+        Frequency.DAILY,
+        Annualization(enabled=False),
+        date(2025, 2, 1),
+        date(2025, 3, 31),
+        date(2025, 1, 31),
+    )
+
+    assert [(item["window_start"], item["window_end"]) for item in rolling["1M"]] == [
+        (date(2025, 2, 1), date(2025, 2, 28)),
+        (date(2025, 3, 1), date(2025, 3, 30)),
+        (date(2025, 3, 1), date(2025, 3, 31)),
+    ]
+    assert rolling["1M"][0]["return_pct"] == pytest.approx(2.0)
+    assert rolling["2M"] == [
+        {"window_start": date(2025, 1, 31), "window_end": date(2025, 3, 30), "return_pct": pytest.approx(3.5351)},
+        {"window_start": date(2025, 2, 1), "window_end": date(2025, 3, 31), "return_pct": pytest.approx(5.5853)},
+    ]
+
+
+def test_rolling_windows_with_resets_use_cumulative_returns_and_annualize():
+    daily = _daily_results(
+        ["2024-12-31", "2025-01-31", "2025-02-28"],
+        [10.0, 50.0, 10.0],
+        final_cum_rors=[10.0, 5.0, 15.5],
+        resets=[False, True, False],
+    )
+
+    rolling = generate_rolling_returns(
+        daily,
+        [2],
+        Frequency.MONTHLY,
+        Annualization(enabled=True, basis="ACT/365"),
+        date(2025, 2, 1),
+        date(2025, 2, 28),
+        date(2024, 12, 31),
+    )
+
+    (window,) = rolling["2M"]
+    assert window["return_pct"] == pytest.approx(5.0)
+    expected_annualized = (1.05 ** (365 / 29) - 1) * 100
+    assert window["annualized_return_pct"] == pytest.approx(expected_annualized, abs=1e-6)
+
+
+def test_rolling_windows_ending_weekly_without_reset_flags():
+    """Weekly window ends fall on Fridays, and results without reset flags compound every day."""
+    perf_dates = pd.bdate_range("2025-01-01", "2025-02-14")
+    daily = _daily_results(perf_dates, 0.1).drop(columns=[PortfolioColumns.PERF_RESET.value])
+
+    rolling = generate_rolling_returns(
+        daily,
+        [1],
+        Frequency.WEEKLY,
+        Annualization(enabled=False),
+        date(2025, 2, 3),
+        date(2025, 2, 14),
+        date(2025, 1, 1),
+    )
+
+    assert [(item["window_start"], item["window_end"]) for item in rolling["1M"]] == [
+        (date(2025, 1, 8), date(2025, 2, 7)),
+        (date(2025, 1, 15), date(2025, 2, 14)),
+    ]
+    days_in_window = len(pd.bdate_range("2025-01-08", "2025-02-07"))
+    assert rolling["1M"][0]["return_pct"] == pytest.approx((1.001**days_in_window - 1) * 100)
+
+
+def test_rolling_returns_empty_without_days_or_windows():
+    daily = _daily_results(["2025-01-31"], [1.0])
+    args = (Frequency.MONTHLY, Annualization(enabled=False), date(2025, 1, 1), date(2025, 1, 31), date(2025, 1, 1))
+
+    assert generate_rolling_returns(daily.iloc[:0], [1], *args) == {}
+    assert generate_rolling_returns(daily, [], *args) == {}
@@ -206,3 +206,45 @@ def test_daily_ror_fx_decomposition_with_hedging():
 
     # Day 2 was not hedged. fx_ror should be the original unhedged value.
     assert ror_df["fx_ror"].iloc[1] == pytest.approx(-0.92592, abs=1e-5)
+
+
+def test_daily_ror_fx_decomposition_with_hedging_in_decimal_mode():
+    """Hedge ratios dampen the FX return of Decimal amounts the same way."""
+    df = pd.DataFrame(
+        {
+            PortfolioColumns.PERF_DATE: pd.to_datetime(["2025-01-01", "2025-01-02"]),
+            PortfolioColumns.BEGIN_MV: [Decimal("100"), Decimal("102")],
+            PortfolioColumns.BOD_CF: [Decimal("0"), Decimal("0")],
+            PortfolioColumns.EOD_CF: [Decimal("0"), Decimal("0")],
+            PortfolioColumns.MGMT_FEES: [Decimal("0"), Decimal("0")],
+            PortfolioColumns.END_MV: [Decimal("102"), Decimal("103.02")],
+            PortfolioColumns.EFFECTIVE_PERIOD_START_DATE: pd.to_datetime(["2025-01-01", "2025-01-01"]),
+        }
+    )
+    config = EngineConfig(
+        performance_start_date=date(2025, 1, 1),
+        report_end_date=date(2025, 1, 2),
+        metric_basis="GROSS",
+        period_type="YTD",
+        precision_mode="DECIMAL_STRICT",
+        currency_mode="BOTH",
+        report_ccy="USD",
+        fx=FXRequestBlock.model_validate(
+            {
+                "rates": [
+                    {"date": date(2024, 12, 31), "ccy": "EUR", "rate": 1.05},
+                    {"date": date(2025, 1, 1), "ccy": "EUR", "rate": 1.08},
+                    {"date": date(2025, 1, 2), "ccy": "EUR", "rate": 1.07},
+                ]
+            }
+        ),
+        hedging=HedgingRequestBlock.model_validate(
+            {"mode": "RATIO", "series": [{"date": date(2025, 1, 1), "ccy": "EUR", "hedge_ratio": 0.50}]}
+        ),
+    )
+
+    ror_df = calculate_daily_ror(df, config.metric_basis, config)
+
+    assert isinstance(ror_df["fx_ror"].iloc[0], Decimal)
+    assert float(ror_df["fx_ror"].iloc[0]) == pytest.approx(2.85714 * 0.5, abs=1e-5)
+    assert float(ror_df["fx_ror"].iloc[1]) == pytest.approx(-0.92592, abs=1e-5)
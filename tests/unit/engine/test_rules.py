@@ -12,6 +12,7 @@ from engine.rules import (
     calculate_nctrl4_reset,
     calculate_nip,
     calculate_sign,
+    get_series_starts,
 )
 from engine.schema import PortfolioColumns
 
@@ -216,3 +217,14 @@ def test_calculate_nctrl4_reset_triggered(reset_test_df):
 
 def test_get_decimal_sign_negative_value():
     assert _get_decimal_sign(Decimal("-1")) == Decimal(-1)
+
+
+def test_get_decimal_sign_positive_and_zero_values():
+    assert _get_decimal_sign(Decimal("0.01")) == Decimal(1)
+    assert _get_decimal_sign(Decimal("0")) == Decimal(0)
+
+
+def test_get_series_starts_flags_each_portfolio_block():
+    df = pd.DataFrame({PortfolioColumns.PORTFOLIO_ID.value: ["A", "A", "B", "B", "A"]})
+    assert get_series_starts(df).tolist() == [True, False, True, False, True]
+    assert get_series_starts(pd.DataFrame()).tolist() == []
@@ -0,0 +1,117 @@
+# tests/unit/engine/test_scan.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.scan import forward_fill, resegmented_cumprod, rolling_median, segmented_cumprod
+
+
+@pytest.mark.parametrize("segment_probability", [0.0, 0.01, 0.5, 1.0])
+def test_segmented_cumprod_is_bit_identical_to_groupby_cumprod(segment_probability):
+    """Both scan strategies must reproduce pandas' sequential groupby cumprod exactly."""
+    rng = np.random.default_rng(42)
+    values = 1 + rng.normal(0, 0.05, 2_000)
+    starts = rng.random(2_000) < segment_probability
+
+    expected = pd.Series(values).groupby(np.cumsum(starts | (np.arange(2_000) == 0))).cumprod().to_numpy()
+
+    np.testing.assert_array_equal(segmented_cumprod(values, starts), expected)
+
+
+def test_segmented_cumprod_compounds_columns_independently():
+    """A 2-D input compounds every column over the shared segmentation."""
+    values = np.array([[2.0, 3.0], [2.0, 3.0], [2.0, 3.0], [2.0, 3.0]])
+    starts = np.array([True, False, True, False])
+
+    result = segmented_cumprod(values, starts)
+
+    np.testing.assert_array_equal(result, [[2.0, 3.0], [4.0, 9.0], [2.0, 3.0], [4.0, 9.0]])
+
+
+def test_segmented_cumprod_skips_nan_like_pandas():
+    """NaN inputs yield NaN outputs without breaking the running product."""
+    values = np.array([2.0, np.nan, 3.0])
+
+    result = segmented_cumprod(values, np.zeros(3, dtype=bool))
+
+    np.testing.assert_array_equal(result, [2.0, np.nan, 6.0])
+
+
+def test_segmented_cumprod_empty_input():
+    assert segmented_cumprod(np.array([]), np.array([], dtype=bool)).size == 0
+
+
+def test_forward_fill_matches_pandas_where_ffill():
+    """forward_fill reproduces the where/ffill/fillna chain used for leg returns."""
+    values = np.array([1.0, 2.0, np.nan, 4.0, 5.0])
+    valid = np.array([False, True, True, False, True])
+
+    expected = pd.Series(values).where(valid).ffill().fillna(0.0).to_numpy()
+
+    np.testing.assert_array_equal(forward_fill(values, valid), expected)
+
+
+def test_segmented_cumprod_resumes_from_initial_product():
+    """Splitting a scan and resuming from the carried product is bit-identical to one pass."""
+    rng = np.random.default_rng(3)
+    values = 1 + rng.normal(0, 0.05, 100)
+    starts = np.zeros(100, dtype=bool)
+    starts[[0, 30]] = True
+
+    full = segmented_cumprod(values, starts)
+    resumed = segmented_cumprod(values[50:], starts[50:], initial=full[49])
+
+    np.testing.assert_array_equal(resumed, full[50:])
+
+
+def test_forward_fill_uses_initial_before_first_valid_row():
+    values = np.array([1.0, 2.0, 3.0])
+    valid = np.array([False, True, False])
+
+    np.testing.assert_array_equal(forward_fill(values, valid, initial=7.0), [7.0, 2.0, 2.0])
+
+
+def test_forward_fill_empty_input():
+    assert forward_fill(np.array([]), np.array([], dtype=bool)).size == 0
+
+
+@pytest.mark.parametrize("initial, previous_initial", [(None, None), (1.5, 1.5), (1.5, 0.5), (None, 0.5)])
+def test_resegmented_cumprod_matches_a_fresh_scan(initial, previous_initial):
+    """Reusing an earlier scan with fewer segment starts is bit-identical to scanning again."""
+    rng = np.random.default_rng(3)
+    values = 1 + rng.normal(0, 0.05, (500, 2))
+    previous_starts = rng.random(500) < 0.02
+    starts = previous_starts | (rng.random(500) < 0.05)
+    previous = segmented_cumprod(values, previous_starts, initial=previous_initial)
+
+    result = resegmented_cumprod(values, starts, previous, previous_starts, initial, previous_initial)
+
+    np.testing.assert_array_equal(result, segmented_cumprod(values, starts, initial=initial))
+
+
+def test_resegmented_cumprod_empty_input():
+    empty = np.array([])
+    assert resegmented_cumprod(empty, empty.astype(bool), empty, empty.astype(bool)).size == 0
+
+
+@pytest.mark.parametrize("window", [1, 2, 5, 63, 500])
+def test_rolling_median_is_bit_identical_to_pandas(window):
+    """Odd and even windows, partial leading windows and NaN gaps all match pandas' rolling median."""
+    rng = np.random.default_rng(7)
+    values = rng.standard_t(3, 1_000).round(2)
+    values[rng.random(1_000) < 0.1] = np.nan
+    values[100:120] = np.nan
+
+    expected = pd.Series(values).rolling(window, min_periods=1).median().to_numpy()
+
+    np.testing.assert_array_equal(rolling_median(values, window, chunk_rows=64), expected)
+
+
+def test_rolling_median_handles_empty_input_and_chunks_without_values():
+    """A chunk of rows whose windows hold no value at all stays NaN, like pandas."""
+    values = np.concatenate((np.full(10, np.nan), [1.0, 3.0, 2.0]))
+
+    expected = pd.Series(values).rolling(3, min_periods=1).median().to_numpy()
+
+    np.testing.assert_array_equal(rolling_median(values, 3, chunk_rows=4), expected)
+    assert rolling_median(np.array([]), 3).size == 0
@@ -43,7 +43,47 @@ def test_performance_request_with_empty_frequencies_list_fails(base_twr_payload)
         PerformanceRequest.model_validate(payload)
 
 
+@pytest.mark.parametrize(
+    "months, message",
+    [([], "months list cannot be empty"), ([12, 0], "rolling window lengths must be positive")],
+)
+def test_performance_request_with_invalid_rolling_months_fails(base_twr_payload, months, message):
+    """Tests that rolling windows need at least one window, each a positive number of months."""
+    payload = base_twr_payload.copy()
+    payload["analyses"] = [{"period": "YTD", "frequencies": ["monthly"], "rolling": {"months": months}}]
+    with pytest.raises(ValidationError, match=message):
+        PerformanceRequest.model_validate(payload)
+
+
 def test_performance_request_without_analyses_fails(base_twr_payload):
     """Tests that validation fails if the 'analyses' field is missing."""
     with pytest.raises(ValidationError, match="Field required"):
         PerformanceRequest.model_validate(base_twr_payload)
+
+
+def test_performance_request_accepts_columnar_valuation_points(base_twr_payload):
+    """Valuation points can be sent as parallel arrays; omitted cash flows and fees default to zero."""
+    payload = base_twr_payload.copy()
+    payload["analyses"] = [{"period": "YTD", "frequencies": ["monthly"]}]
+    payload["valuation_points"] = {
+        "perf_date": ["2025-01-01", "2025-01-02"],
+        "begin_mv": [1000.0, 1010.0],
+        "end_mv": [1010.0, 1020.0],
+    }
+
+    request = PerformanceRequest.model_validate(payload)
+
+    assert len(request.valuation_points) == 2
+    assert request.valuation_points.bod_cf is None
+
+
+def test_columnar_valuation_points_must_have_equal_lengths(base_twr_payload):
+    payload = base_twr_payload.copy()
+    payload["analyses"] = [{"period": "YTD", "frequencies": ["monthly"]}]
+    payload["valuation_points"] = {
+        "perf_date": ["2025-01-01", "2025-01-02"],
+        "begin_mv": [1000.0, 1010.0],
+        "end_mv": [1010.0],
+    }
+    with pytest.raises(ValidationError, match="must all have the same length"):
+        PerformanceRequest.model_validate(payload)
@@ -0,0 +1,37 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from common.enums import Frequency
+from main import ORJSONResponseExcludeNull
+
+
+class _Summary(BaseModel):
+    period_return_pct: float
+    annualized_return_pct: float | None = None
+    as_of: date = date(2025, 1, 31)
+
+
+def _render(content) -> bytes:
+    return ORJSONResponseExcludeNull(content).body
+
+
+def test_render_drops_none_values_at_every_depth():
+    content = {"a": None, "b": [None, {"c": None, "d": [1, None]}], "e": {"f": {"g": None}}, "h": [], "i": {}}
+    assert _render(content) == b'{"b":[{"d":[1]}],"e":{"f":{}},"h":[],"i":{}}'
+
+
+def test_render_encodes_non_json_values_like_jsonable_encoder():
+    content = {
+        Frequency.MONTHLY: [_Summary(period_return_pct=1.5)],
+        date(2025, 1, 1): (1, None, Decimal("2.50")),
+        "id": UUID(int=1),
+        "nan": float("nan"),
+        "_sa_state": "dropped",
+    }
+    assert _render(content) == (
+        b'{"monthly":[{"period_return_pct":1.5,"as_of":"2025-01-31"}],"2025-01-01":[1,2.5],'
+        b'"id":"00000000-0000-0000-0000-000000000001","nan":null}'
+    )